@@ -0,0 +1,354 @@
+"""
+성능 측정 모음
+가상 표결 데이터(assembly.synthetic)로 행렬 생성, 통계/지표, W-NOMINATE 반복, 그림 그리기,
+그리고 지연과 오류를 넣은 로컬 스텁 API 에 대한 표결 수집을 크기별로 측정한다.
+
+측정 결과(반복별 시간, 중앙값, tracemalloc 최대 할당량)는 JSON 으로 저장하고, --baseline 으로 이전 결과와
+비교해 기준(--threshold, 기본 25%)보다 느려지거나 메모리가 늘어난 항목이 있으면 종료 코드 1 을 돌려준다.
+시간은 tracemalloc 없이 재고, 최대 메모리는 tracemalloc 을 켠 별도 실행 한 번으로 잰다.
+scale.iterations 는 정해진 횟수(--iterations)의 반복 시간을 크기별로 재고, scale.converge 는 가장 작은 크기에서
+기본 수렴 기준(DEFAULT_MAX_ITER, DEFAULT_TOL)까지 추정해 전체 시간과 수렴까지의 반복 수를 남긴다.
+크기와 관계없이 한 번만 재는 항목(scaled=False)은 가장 작은 크기에서 잰다.
+
+사용 예 (pip install -e . 후 저장소 루트에서):
+    python benchmarks/run_benchmarks.py                                  # 300x3000, 모든 항목
+    python benchmarks/run_benchmarks.py --sizes 300x3000 300x20000 300x100000 --cases matrix stats
+    python benchmarks/run_benchmarks.py --baseline benchmarks/results/baseline.json
+"""
+import argparse
+import contextlib
+import gc
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+import warnings
+from dataclasses import dataclass
+from datetime import datetime
+
+import numpy as np
+
+from assembly import __version__
+from assembly.synthetic import generate
+
+DEFAULT_SIZES = ['300x3000']
+DEFAULT_REPEAT = 3
+DEFAULT_THRESHOLD = 0.25
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results')
+
+
+@dataclass
+class Case:
+    name: str
+    setup: object              # setup(data, workdir, args) -> state
+    run: object                # run(state) -> 추가 지표 dict 또는 None
+    scaled: bool = True        # False 면 크기와 관계없이 가장 작은 크기에서 한 번만 측정 (그림, 수집, 수렴)
+    repeat: int = None         # None 이면 --repeat
+
+
+# ---- 행렬 ----
+
+def _setup_long(data, workdir, args):
+    return {'df': data.to_long()}
+
+
+def _run_build(state):
+    from assembly.analysis.vote_matrix import build_vote_matrix
+    matrix = build_vote_matrix(state['df'])
+    filtered = matrix.filter()
+    return {'bills_after_filter': int(filtered.shape[0]), 'members_after_filter': int(filtered.shape[1])}
+
+
+def _setup_parquet(data, workdir, args):
+    path = os.path.join(workdir, f"voting_data_{data.age}_bench.parquet")
+    if not os.path.exists(path):
+        data.to_long().to_parquet(path, index=False)
+    return {'path': path}
+
+
+def _run_load_parquet(state):
+    from assembly.analysis.vote_matrix import build_vote_matrix, load_votes
+    build_vote_matrix(load_votes(state['path']))
+    return {'file_bytes': os.path.getsize(state['path'])}
+
+
+def _run_streaming(state):
+    from assembly.analysis.streaming_matrix import build_cache
+    with contextlib.redirect_stdout(io.StringIO()):
+        build_cache(state['path'], os.path.join(os.path.dirname(state['path']), 'matrix_cache_bench'))
+    return {'file_bytes': os.path.getsize(state['path'])}
+
+
+# ---- 통계 ----
+
+def _run_vote_statistics(state):
+    from assembly.collection.collection_stats import vote_report, vote_statistics
+    vote_report(vote_statistics(state['df']))
+
+
+def _setup_metrics(data, workdir, args):
+    return {'matrix': data.matrix, 'parties': data.members['POLY_NM'].to_numpy(),
+            'names': data.members['HG_NM'].to_numpy()}
+
+
+def _run_vote_metrics(state):
+    from assembly.analysis.vote_metrics import vote_metrics
+    vote_metrics(state['matrix'], state['parties'], state['names'])
+
+
+# ---- 추정 ----
+
+def _setup_scale(data, workdir, args):
+    from assembly.analysis.wnominate import preview_parameters, sign_matrix
+    signs = sign_matrix(data.matrix.filter().votes)
+    return {'signs': signs, 'init': preview_parameters(signs, dims=2), 'iterations': args.iterations}
+
+
+def _run_scale(state):
+    from assembly.analysis.wnominate import fit
+    start = time.perf_counter()
+    # tol=-inf: 수렴 여부와 관계없이 정해진 횟수만큼 반복. 차원별 시작값 단계를 건너뛰도록 2차원 시작값을 준다
+    _, _, iterations = fit(state['signs'], dims=2, init=state['init'], max_iter=state['iterations'],
+                           tol=float('-inf'))
+    return {'iterations': iterations, 'seconds_per_iteration': (time.perf_counter() - start) / iterations}
+
+
+def _run_converge(state):
+    from assembly.analysis.wnominate import DEFAULT_MAX_ITER, fit
+    start = time.perf_counter()
+    _, loglik, iterations = fit(state['signs'], dims=2)
+    elapsed = time.perf_counter() - start
+    return {'members': int(state['signs'].shape[0]), 'bills': int(state['signs'].shape[1]),
+            'iterations_to_converge': iterations, 'converged': iterations < DEFAULT_MAX_ITER,
+            'loglik': float(loglik), 'seconds_per_iteration': elapsed / iterations}
+
+
+def _run_preview(state):
+    from assembly.analysis.wnominate import fit_statistics, preview_parameters
+    params = preview_parameters(state['signs'], dims=2)
+    return {'classification': fit_statistics(params, state['signs'])['classification']}
+
+
+# ---- 그림 ----
+
+def _setup_plot(data, workdir, args):
+    import pandas as pd
+    rng = np.random.default_rng(0)
+    n = len(data.members)
+    table = pd.DataFrame({
+        'party': data.members['POLY_NM'], 'name': data.members['HG_NM'],
+        'coord1D': data.ideal_points[:, 0], 'coord2D': data.ideal_points[:, 1],
+        'GMP': rng.uniform(0.6, 0.95, n), 'CC': rng.uniform(0.8, 0.99, n),
+    })
+    return {'table': table, 'output_dir': os.path.join(workdir, 'figures'), 'dpi': args.dpi}
+
+
+def _run_plot(state):
+    from assembly.analysis.visualize_wnominate import render_figures
+    results = render_figures(state['table'], state['output_dir'], dpi=state['dpi'], max_workers=1, force=True)
+    return {'figures': len(results)}
+
+
+# ---- 수집 (스텁 API) ----
+
+def _setup_collect(data, workdir, args):
+    import pandas as pd
+    from assembly.collection.response_cache import ResponseCache
+    from assembly.synthetic import fill_cache
+
+    bills = data.bills.iloc[:args.collect_bills]
+    cache = ResponseCache(os.path.join(workdir, 'stub_cache'))
+    fill_cache(cache, data, bills['BILL_ID'])
+    return {'cache': cache, 'bills': pd.DataFrame({'BILL_ID': bills['BILL_ID'], 'BILL_NM': bills['BILL_NAME']}),
+            'workdir': workdir, 'latency': args.latency, 'error_rate': args.error_rate,
+            'workers': args.collect_workers, 'run': 0}
+
+
+def _run_collect(state):
+    from assembly.collection.assembly_api import AssemblyApiClient
+    from assembly.collection.get_voting_data import collect_voting_data_for_bills
+    from assembly.collection.stub_server import PATH_PREFIX, serve
+
+    server = serve(state['cache'], port=0, latency=state['latency'], error_rate=state['error_rate'], seed=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    state['run'] += 1
+    journal = os.path.join(state['workdir'], f"journal_{state['run']}", "voting_collection_journal.jsonl")
+    os.makedirs(os.path.dirname(journal), exist_ok=True)
+    output = os.path.join(os.path.dirname(journal), 'voting_data.parquet')
+    try:
+        client = AssemblyApiClient('bench', base_url=f"http://127.0.0.1:{server.server_port}{PATH_PREFIX}",
+                                   backoff_base=0.01, backoff_max=0.1, max_retries=8)
+        start = time.perf_counter()
+        # 법안마다 찍는 진행 메시지는 측정에서 뺀다
+        with contextlib.redirect_stdout(io.StringIO()):
+            rows = collect_voting_data_for_bills(client, state['bills'], output, max_workers=state['workers'],
+                                                 journal_path=journal)
+        elapsed = time.perf_counter() - start
+        client.close()
+    finally:
+        server.shutdown()
+        server.server_close()
+    return {'rows': rows or 0, 'bills': len(state['bills']), 'bills_per_second': len(state['bills']) / elapsed}
+
+
+CASES = [
+    Case('matrix.build', _setup_long, _run_build),
+    Case('matrix.load_parquet', _setup_parquet, _run_load_parquet),
+    Case('matrix.streaming', _setup_parquet, _run_streaming),
+    Case('stats.vote_statistics', _setup_long, _run_vote_statistics),
+    Case('stats.vote_metrics', _setup_metrics, _run_vote_metrics),
+    Case('scale.iterations', _setup_scale, _run_scale, repeat=1),
+    Case('scale.converge', _setup_scale, _run_converge, scaled=False, repeat=1),
+    Case('scale.preview', _setup_scale, _run_preview),
+    Case('plot.render', _setup_plot, _run_plot, scaled=False),
+    Case('collect.votes', _setup_collect, _run_collect, scaled=False),
+]
+
+
+def parse_size(text):
+    members, bills = text.lower().split('x')
+    return int(members), int(bills)
+
+
+def measure(case, state, repeat):
+    """(반복별 시간, 마지막 실행의 추가 지표, tracemalloc 최대 할당 바이트)."""
+    seconds, extra = [], None
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        extra = case.run(state)
+        seconds.append(time.perf_counter() - start)
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        case.run(state)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return seconds, extra or {}, peak
+
+
+def environment():
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        commit = None
+    return {
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'git_commit': commit,
+        'assembly': __version__,
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+    }
+
+
+def run_benchmarks(args):
+    selected = [case for case in CASES if not args.cases or any(case.name.startswith(p) for p in args.cases)]
+    results = []
+    done_unscaled = set()
+    with tempfile.TemporaryDirectory(prefix='assembly_bench_') as root:
+        # scaled=False 항목이 가장 작은 크기에서 측정되도록 작은 크기부터
+        for size in sorted(args.sizes, key=lambda text: np.prod(parse_size(text))):
+            n_members, n_bills = parse_size(size)
+            print(f"\n[{size}] 가상 데이터 생성 중...")
+            start = time.perf_counter()
+            data = generate(n_members=n_members, n_bills=n_bills, seed=args.seed)
+            print(f"  생성 {time.perf_counter() - start:.2f}초")
+            workdir = os.path.join(root, size)
+            os.makedirs(workdir, exist_ok=True)
+
+            for case in selected:
+                if not case.scaled and case.name in done_unscaled:
+                    continue
+                state = case.setup(data, workdir, args)
+                seconds, extra, peak = measure(case, state, case.repeat or args.repeat)
+                done_unscaled.add(case.name)
+                result = {
+                    'case': case.name,
+                    'size': size if case.scaled else 'fixed',
+                    'members': n_members,
+                    'bills': n_bills if case.scaled else None,
+                    'seconds': seconds,
+                    'median': statistics.median(seconds),
+                    'min': min(seconds),
+                    'peak_bytes': peak,
+                    'extra': extra,
+                }
+                results.append(result)
+                print(f"  {case.name:24s} 중앙값 {result['median']:8.3f}초  최소 {result['min']:8.3f}초  "
+                      f"최대 메모리 {peak / 1024 ** 2:8.1f} MB")
+                del state
+    return {'environment': environment(), 'results': results}
+
+
+def compare(report, baseline, threshold=DEFAULT_THRESHOLD):
+    """baseline 보다 시간(중앙값)이나 최대 메모리가 threshold 넘게 늘어난 항목 목록."""
+    previous = {(r['case'], r['size']): r for r in baseline['results']}
+    regressions = []
+    print(f"\n기준 결과와 비교 (기준: {baseline['environment'].get('git_commit')}, 허용 {threshold:.0%})")
+    for result in report['results']:
+        old = previous.get((result['case'], result['size']))
+        if old is None:
+            continue
+        time_ratio = result['median'] / max(old['median'], 1e-9)
+        memory_ratio = result['peak_bytes'] / max(old['peak_bytes'], 1)
+        flagged = time_ratio > 1 + threshold or memory_ratio > 1 + threshold
+        if flagged:
+            regressions.append({'case': result['case'], 'size': result['size'],
+                                'time_ratio': time_ratio, 'memory_ratio': memory_ratio})
+        print(f"  {'!!' if flagged else '  '} {result['case']:24s} {result['size']:>10s}  "
+              f"시간 x{time_ratio:5.2f}  메모리 x{memory_ratio:5.2f}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="가상 표결 데이터로 수집/분석 단계 성능 측정")
+    parser.add_argument('--sizes', nargs='+', default=DEFAULT_SIZES, metavar='MEMBERSxBILLS',
+                        help="데이터 크기 (예: 300x3000 300x100000)")
+    parser.add_argument('--cases', nargs='+', default=None,
+                        help="측정할 항목 (이름 앞부분: matrix, stats, scale, plot, collect)")
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--iterations', type=int, default=2, help="scale.iterations 의 W-NOMINATE 반복 수")
+    parser.add_argument('--dpi', type=int, default=100)
+    parser.add_argument('--collect-bills', type=int, default=200, help="스텁 API 에서 수집할 법안 수")
+    parser.add_argument('--collect-workers', type=int, default=8)
+    parser.add_argument('--latency', type=float, default=0.02, help="스텁 API 평균 응답 지연 (초)")
+    parser.add_argument('--error-rate', type=float, default=0.05, help="스텁 API 일시 오류 비율")
+    parser.add_argument('--output', default=None, help="결과 JSON (기본: benchmarks/results/<시각>.json)")
+    parser.add_argument('--baseline', default=None, help="비교할 이전 결과 JSON")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD)
+    args = parser.parse_args(argv)
+
+    # 한글 폰트가 없는 환경에서 그림마다 쏟아지는 글리프 경고는 측정과 관계없다
+    warnings.filterwarnings('ignore', message='Glyph .* missing from font')
+    report = run_benchmarks(args)
+    output = args.output or os.path.join(RESULTS_DIR, f"{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"\n결과가 '{output}'에 저장되었습니다.")
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            regressions = compare(report, json.load(f), args.threshold)
+        if regressions:
+            print(f"성능 저하 {len(regressions)}건")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
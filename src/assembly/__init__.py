@@ -0,0 +1,39 @@
+"""
+21대 국회 표결 데이터 수집 및 W-NOMINATE 분석 도구
+
+    assembly.collection  국회 Open API 수집기, 로컬 저장소
+    assembly.analysis    투표 행렬, W-NOMINATE 추정, 시각화
+
+주요 이름은 처음 쓸 때 해당 모듈을 불러온다 (import assembly 만으로 numpy/pandas 를 읽지 않는다).
+"""
+import importlib
+
+__version__ = "0.2.0"
+
+_LAZY_NAMES = {
+    'Config': '.config',
+    'AssemblyApiClient': '.collection.assembly_api',
+    'ResponseCache': '.collection.response_cache',
+    'TokenBucket': '.collection.rate_limiter',
+    'CollectionJournal': '.collection.collection_journal',
+    'BillStore': '.collection.bill_store',
+    'VoteMatrix': '.analysis.vote_matrix',
+    'MemberRegistry': '.analysis.member_registry',
+    'WNominateResult': '.analysis.wnominate',
+    'wnominate': '.analysis.wnominate',
+    'bootstrap': '.analysis.wnominate_bootstrap',
+}
+
+__all__ = ['__version__', *_LAZY_NAMES]
+
+
+def __getattr__(name):
+    if name not in _LAZY_NAMES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_LAZY_NAMES[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_NAMES))
@@ -0,0 +1,4 @@
+"""
+표결 분석
+투표 행렬 준비, W-NOMINATE 추정과 부트스트랩 표준오차, 결과 시각화
+"""
@@ -0,0 +1,146 @@
+"""
+표결 행렬 바이너리 캐시
+vote_matrix.py로 만든 행렬을 .npy 파일과 인덱스 파일(법안 ID, 의원 ID/정당/이름)로 저장해 두고,
+메모리 맵으로 복사 없이 바로 연다. 원본 표결 데이터의 해시가 바뀌면 자동으로 다시 만든다.
+
+캐시 디렉토리 구성:
+    votes.npy     (법안 수, 의원 수) int8
+    bills.npy     법안 ID (유니코드 문자열 배열)
+    members.npy   의원 정보 구조체 배열 (MEMBER_NO, POLY_NM, HG_NM), votes 열 순서와 같음
+    meta.json     원본 파일 경로/크기/수정 시각/해시, 행렬 크기
+"""
+import hashlib
+import json
+import os
+import shutil
+import time
+
+import numpy as np
+
+from .member_registry import MemberRegistry
+from .vote_matrix import VoteMatrix, build_vote_matrix, load_votes
+
+CACHE_VERSION = 1
+
+
+def file_hash(path, chunk_size=1024 * 1024):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _source_stat(path):
+    stat = os.stat(path)
+    return {'size': stat.st_size, 'mtime': stat.st_mtime}
+
+
+def read_meta(cache_dir):
+    try:
+        with open(os.path.join(cache_dir, 'meta.json'), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+
+def is_valid(cache_dir, source_path):
+    """캐시가 source_path 의 현재 내용으로 만들어졌는지 확인한다.
+
+    크기와 수정 시각이 같으면 해시 계산 없이 유효로 보고, 다르면 해시를 비교한다.
+    """
+    meta = read_meta(cache_dir)
+    if meta is None or meta.get('version') != CACHE_VERSION:
+        return False
+    stat = _source_stat(source_path)
+    if stat == meta['source_stat']:
+        return True
+    if file_hash(source_path) != meta['source_hash']:
+        return False
+    # 내용은 같고 수정 시각만 바뀐 경우: 다음부터 해시 계산을 건너뛰도록 갱신
+    meta['source_stat'] = stat
+    _write_json(os.path.join(cache_dir, 'meta.json'), meta)
+    return True
+
+
+def _write_json(path, data):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
+
+
+def member_table(df, member_ids, registry=None):
+    """member_ids 순서에 맞춘 (MEMBER_NO, POLY_NM, HG_NM) 구조체 배열. 정당은 의원의 마지막 소속 정당.
+
+    registry 를 주면 df 대신 그것으로 연결한다.
+    """
+    member_ids = np.asarray(member_ids, dtype=str)
+    resolved = (registry or MemberRegistry.from_votes(df)).resolve(member_ids)
+    parties = np.asarray(resolved['POLY_NM'], dtype=str)
+    names = np.asarray(resolved['HG_NM'], dtype=str)
+    dtype = [('MEMBER_NO', member_ids.dtype), ('POLY_NM', parties.dtype), ('HG_NM', names.dtype)]
+    members = np.empty(len(member_ids), dtype=dtype)  # 메모리 맵이 가능하도록 고정 길이 문자열만 사용
+    members['MEMBER_NO'] = member_ids
+    members['POLY_NM'] = parties
+    members['HG_NM'] = names
+    return members
+
+
+def staging_dir(cache_dir):
+    """캐시를 새로 쓸 임시 디렉토리. commit 으로 cache_dir 과 바꾼다."""
+    tmp_dir = f"{cache_dir}.tmp-{os.getpid()}"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+    return tmp_dir
+
+
+def save(cache_dir, matrix, members, source_path):
+    tmp_dir = staging_dir(cache_dir)
+    np.save(os.path.join(tmp_dir, 'votes.npy'), np.ascontiguousarray(matrix.votes, dtype=np.int8))
+    commit(tmp_dir, cache_dir, matrix.bill_ids, members, matrix.shape, source_path)
+
+
+def commit(tmp_dir, cache_dir, bill_ids, members, shape, source_path):
+    """votes.npy 가 들어 있는 tmp_dir 에 인덱스/메타 파일을 쓰고 cache_dir 과 바꾼다."""
+    np.save(os.path.join(tmp_dir, 'bills.npy'), np.asarray(bill_ids, dtype=str))
+    np.save(os.path.join(tmp_dir, 'members.npy'), members)
+    _write_json(os.path.join(tmp_dir, 'meta.json'), {
+        'version': CACHE_VERSION,
+        'source_path': os.path.abspath(source_path),
+        'source_stat': _source_stat(source_path),
+        'source_hash': file_hash(source_path),
+        'shape': list(shape),
+        'created': time.strftime('%Y-%m-%d %H:%M:%S'),
+    })
+
+    shutil.rmtree(cache_dir, ignore_errors=True)
+    os.makedirs(os.path.dirname(os.path.abspath(cache_dir)), exist_ok=True)
+    os.replace(tmp_dir, cache_dir)
+
+
+def load(cache_dir, mmap_mode='r'):
+    """(VoteMatrix, members) 를 반환한다. 기본값은 읽기 전용 메모리 맵이라 여는 비용이 거의 없다."""
+    votes = np.load(os.path.join(cache_dir, 'votes.npy'), mmap_mode=mmap_mode)
+    bill_ids = np.load(os.path.join(cache_dir, 'bills.npy'), mmap_mode=mmap_mode)
+    members = np.load(os.path.join(cache_dir, 'members.npy'), mmap_mode=mmap_mode)
+    return VoteMatrix(votes, bill_ids, members['MEMBER_NO']), members
+
+
+def load_or_build(source_path, cache_dir, mmap_mode='r', streaming=None):
+    """캐시가 유효하면 열고, 아니면 원본 표결 데이터로 행렬을 새로 만들어 저장한 뒤 연다.
+
+    streaming 이 None 이면 원본 파일이 STREAMING_MIN_BYTES 이상일 때 streaming_matrix 로 나눠 읽어 만든다.
+    """
+    if is_valid(cache_dir, source_path):
+        return load(cache_dir, mmap_mode)
+
+    print(f"'{source_path}' 가 바뀌어 행렬 캐시를 다시 만듭니다: {cache_dir}")
+    from .streaming_matrix import build_cache, use_streaming
+    if use_streaming(source_path, streaming):
+        build_cache(source_path, cache_dir)
+        return load(cache_dir, mmap_mode)
+    df = load_votes(source_path)
+    matrix = build_vote_matrix(df)
+    save(cache_dir, matrix, member_table(df, matrix.member_ids), source_path)
+    return load(cache_dir, mmap_mode)
@@ -0,0 +1,228 @@
+"""
+의원 레지스트리
+MEMBER_NO 를 한 번만 정규화해 두고 ID/이름/정당별 해시 인덱스로 의원 정보를 찾는다.
+표결 행렬 열(의원 ID) 전체를 한 번의 조인으로 의원 정보에 연결하고, 연결되지 않은 ID를 보고한다.
+
+당적 변경이 있는 의원은 표결일(VOTE_DATE) 기준으로 정당 소속 구간(시작일~종료일)을 기록한다.
+의원의 대표 정당은 마지막 표결 시점의 정당이므로 입력 행 순서와 관계없이 같은 결과가 나온다.
+
+MEMBER_NO 는 대수마다 새로 매겨지므로, 여러 대수에 걸친 의원은 link_members 로 한 사람(PERSON_ID)으로
+묶는다. 국회의원 코드(MONA_CD)가 있으면 그것을, 없으면 이름(한글+한자)을 쓴다.
+"""
+import re
+
+import numpy as np
+import pandas as pd
+
+MEMBER_COLUMNS = ['MEMBER_NO', 'POLY_NM', 'HG_NM']
+HISTORY_COLUMNS = ['MEMBER_NO', 'HG_NM', 'POLY_NM', 'START_DATE', 'END_DATE', 'VOTES']
+# 대수 간 연결에 쓰는 열 (표결 데이터에 있을 때만)
+IDENTITY_COLUMNS = ['MONA_CD', 'HJ_NM']
+LINK_COLUMNS = ['PERSON_ID', 'AGE', 'MEMBER_NO', 'HG_NM', 'POLY_NM', 'LINK', 'TERMS']
+
+# R 의 read.csv 가 붙이는 'X' 접두어, 숫자로 읽혔을 때의 '.0' 접미어
+_ID_PREFIX = re.compile(r'^X')
+_FLOAT_SUFFIX = re.compile(r'\.0+$')
+
+# run_wnominate.R 의 마지막 대체 매칭과 같은 접두어 길이
+PREFIX_LENGTH = 13
+
+
+def normalize_member_no(values):
+    """MEMBER_NO 를 공백/접두어/소수점 없는 문자열로 맞춘다. 지수 표기(2.1e+12)도 정수로 바꾼다."""
+    ids = pd.Series(values, dtype=object).astype(str).str.strip()
+    ids = ids.str.replace(_ID_PREFIX, '', regex=True).str.replace(_FLOAT_SUFFIX, '', regex=True)
+    exponent = ids.str.contains(r'[eE][+-]?\d+$', regex=True)
+    if exponent.any():
+        ids[exponent] = pd.to_numeric(ids[exponent]).astype('int64').astype(str)
+    return ids.to_numpy(dtype=str)
+
+
+def parse_vote_date(values):
+    """VOTE_DATE ('20200616 153002', '2020-06-16' 등)에서 날짜만 읽는다."""
+    digits = pd.Series(values, dtype=object).astype(str).str.replace(r'\D', '', regex=True).str[:8]
+    return pd.to_datetime(digits, format='%Y%m%d', errors='coerce')
+
+
+def party_history(df):
+    """의원별 정당 소속 구간. 날짜 순으로 정당이 바뀔 때마다 새 구간을 연다.
+
+    VOTE_DATE 가 없으면 정당 순으로 정렬되므로 (의원, 정당) 조합마다 날짜 없는 구간 하나가 된다.
+    VOTES 열이 있으면 미리 묶어 둔 행으로 보고 행마다 그 수만큼 표결한 것으로 센다 (streaming_matrix).
+    """
+    data = pd.DataFrame({
+        'MEMBER_NO': normalize_member_no(df['MEMBER_NO']),
+        'HG_NM': df['HG_NM'].fillna('Unknown').to_numpy(),
+        'POLY_NM': df['POLY_NM'].fillna('Unknown').to_numpy(),
+        'DATE': parse_vote_date(df['VOTE_DATE']) if 'VOTE_DATE' in df.columns else pd.NaT,
+        'WEIGHT': df['VOTES'].to_numpy(dtype=np.int64) if 'VOTES' in df.columns else 1,
+    })
+    data = data.sort_values(['MEMBER_NO', 'DATE', 'POLY_NM'], kind='stable')
+
+    member = data['MEMBER_NO'].to_numpy()
+    party = data['POLY_NM'].to_numpy()
+    # 의원이 바뀌거나 정당이 바뀌는 행에서 새 구간 시작
+    new_run = np.ones(len(data), dtype=bool)
+    new_run[1:] = (member[1:] != member[:-1]) | (party[1:] != party[:-1])
+    data['RUN'] = np.cumsum(new_run)
+
+    history = data.groupby('RUN', sort=True).agg(
+        MEMBER_NO=('MEMBER_NO', 'first'), HG_NM=('HG_NM', 'last'), POLY_NM=('POLY_NM', 'first'),
+        START_DATE=('DATE', 'min'), END_DATE=('DATE', 'max'), VOTES=('WEIGHT', 'sum'))
+    return history[HISTORY_COLUMNS].reset_index(drop=True)
+
+
+class MemberRegistry:
+    def __init__(self, history):
+        self.history = history.reset_index(drop=True)
+        # 의원별 대표 정보: 가장 늦은 구간(날짜가 없으면 표결 수가 가장 많은 구간)
+        latest = self.history.sort_values(['MEMBER_NO', 'END_DATE', 'VOTES'], kind='stable', na_position='first')
+        self.members = latest.groupby('MEMBER_NO', sort=True).tail(1)[MEMBER_COLUMNS].reset_index(drop=True)
+
+        self._id_index = pd.Index(self.members['MEMBER_NO'])
+        self._prefix_index = pd.Index(self.members['MEMBER_NO'].str[:PREFIX_LENGTH])
+        self._name_index = self.members.groupby('HG_NM').indices
+        self._party_index = self.members.groupby('POLY_NM').indices
+        self._history_index = self.history.groupby('MEMBER_NO').indices
+
+    @classmethod
+    def from_votes(cls, df):
+        """긴 형식 표결 데이터(MEMBER_NO, POLY_NM, HG_NM, 선택적으로 VOTE_DATE)로 만든다."""
+        return cls(party_history(df))
+
+    @classmethod
+    def from_csv(cls, path):
+        """member_party_history.csv 또는 member_no_party.csv 를 읽는다."""
+        df = pd.read_csv(path, dtype=str, encoding='utf-8')
+        if 'START_DATE' not in df.columns:
+            return cls.from_votes(df)
+        df['MEMBER_NO'] = normalize_member_no(df['MEMBER_NO'])
+        for column in ('START_DATE', 'END_DATE'):
+            df[column] = pd.to_datetime(df[column], errors='coerce')
+        df['VOTES'] = pd.to_numeric(df['VOTES']).astype('int64')
+        return cls(df[HISTORY_COLUMNS])
+
+    def __len__(self):
+        return len(self.members)
+
+    def get(self, member_no):
+        """MEMBER_NO 하나의 대표 정보 (dict). 없으면 None."""
+        position = self._id_index.get_indexer(normalize_member_no([member_no]))[0]
+        return None if position < 0 else self.members.iloc[position].to_dict()
+
+    def by_name(self, name):
+        return self.members.iloc[self._name_index.get(name, [])]
+
+    def by_party(self, party):
+        return self.members.iloc[self._party_index.get(party, [])]
+
+    def memberships(self, member_no):
+        """의원의 정당 소속 구간들 (시작일 순)."""
+        member_no = normalize_member_no([member_no])[0]
+        return self.history.iloc[self._history_index.get(member_no, [])]
+
+    def party_on(self, member_no, date):
+        """date 시점의 소속 정당 (첫 구간 이전이면 첫 구간의 정당). 기록이 없으면 None."""
+        spans = self.memberships(member_no)
+        if spans.empty:
+            return None
+        date = pd.Timestamp(date)
+        started = spans[spans['START_DATE'].isna() | (spans['START_DATE'] <= date)]
+        return (started if not started.empty else spans).iloc[-1]['POLY_NM']
+
+    def positions(self, member_ids):
+        """member_ids 각각의 members 행 번호 (없으면 -1). 정확히 일치하지 않으면 앞 13자리로 다시 찾는다."""
+        ids = normalize_member_no(member_ids)
+        positions = self._id_index.get_indexer(ids)
+        missing = positions < 0
+        if missing.any() and self._prefix_index.is_unique:
+            positions[missing] = self._prefix_index.get_indexer(pd.Index(ids[missing]).str[:PREFIX_LENGTH])
+        return positions
+
+    def resolve(self, member_ids):
+        """member_ids 순서의 (MEMBER_NO, POLY_NM, HG_NM, MATCHED) 표. 연결되지 않은 의원은 'Unknown'."""
+        positions = self.positions(member_ids)
+        matched = positions >= 0
+        table = self.members.iloc[np.where(matched, positions, 0)].reset_index(drop=True)
+        table.loc[~matched, ['POLY_NM', 'HG_NM']] = 'Unknown'
+        table['MEMBER_NO'] = np.asarray(member_ids, dtype=str)
+        table['MATCHED'] = matched
+        return table
+
+    def unmatched(self, member_ids):
+        member_ids = np.asarray(member_ids, dtype=str)
+        return member_ids[self.positions(member_ids) < 0]
+
+    def report(self, member_ids):
+        """연결 결과 요약 문자열 (run_wnominate.R 의 매칭 결과 요약과 같은 형식)."""
+        missing = self.unmatched(member_ids)
+        total = len(member_ids)
+        matched = total - len(missing)
+        lines = [f"매칭 결과 요약: 총 {total} 명 중 {matched} 명 매칭 성공 ({matched / max(total, 1) * 100:.2f} %)"]
+        if len(missing):
+            lines.append(f"매칭 실패 {len(missing)}명: {', '.join(missing[:20])}" + (" ..." if len(missing) > 20 else ""))
+        switched = self.history['MEMBER_NO'].value_counts()
+        switched = switched[switched > 1]
+        if len(switched):
+            lines.append(f"당적 변경 기록이 있는 의원: {len(switched)}명")
+        return "\n".join(lines)
+
+    def save(self, members_path, history_path=None):
+        """대표 정보(member_no_party.csv 형식)와 정당 소속 구간을 저장한다."""
+        self.members.to_csv(members_path, index=False, encoding='utf-8')
+        if history_path is not None:
+            history = self.history.copy()
+            for column in ('START_DATE', 'END_DATE'):
+                history[column] = history[column].dt.strftime('%Y-%m-%d')
+            history.to_csv(history_path, index=False, encoding='utf-8')
+
+
+def member_identities(df):
+    """대수 하나의 의원표 (MEMBER_COLUMNS + MONA_CD, HJ_NM). 없는 열은 결측으로 둔다."""
+    members = MemberRegistry.from_votes(df).members.copy()
+    ids = normalize_member_no(df['MEMBER_NO'])
+    for column in IDENTITY_COLUMNS:
+        if column in df.columns:
+            values = pd.Series(df[column].to_numpy(), index=ids).replace('', np.nan)
+            members[column] = members['MEMBER_NO'].map(values.groupby(level=0).first())
+        else:
+            members[column] = np.nan
+    return members
+
+
+def link_members(tables):
+    """{대수: member_identities 표} 를 사람 단위로 묶는다 (LINK_COLUMNS).
+
+    1) MONA_CD 가 같으면 같은 사람. 2) MONA_CD 가 없는 행은 이름 키(HG_NM + HJ_NM)로 찾되,
+    그 이름 키가 MONA_CD 하나에만 대응하면 그 사람에, MONA_CD 가 없는 행끼리는 이름 키로 묶는다.
+    같은 대수 안에서 이름 키가 겹치는 동명이인은 묶지 않는다 (LINK='NONE').
+    """
+    frames = []
+    for age, table in tables.items():
+        frame = table.reindex(columns=MEMBER_COLUMNS + IDENTITY_COLUMNS).copy()
+        frame['AGE'] = str(age)
+        frames.append(frame)
+    data = pd.concat(frames, ignore_index=True)
+
+    name_key = data['HG_NM'].fillna('') + '|' + data['HJ_NM'].fillna('')
+    ambiguous = name_key.groupby([data['AGE'], name_key]).transform('size') > 1
+    mona = data['MONA_CD'].astype(object).where(data['MONA_CD'].notna(), None)
+
+    # 이름 키 → MONA_CD (하나로 정해질 때만)
+    named = pd.DataFrame({'key': name_key, 'mona': mona})[mona.notna() & ~ambiguous]
+    mona_per_key = named.drop_duplicates().groupby('key')['mona']
+    key_to_mona = mona_per_key.first()[mona_per_key.nunique() == 1]
+
+    inferred = name_key.map(key_to_mona)
+    person = np.where(mona.notna(), 'MONA:' + mona.astype(str),
+                      np.where(inferred.notna(), 'MONA:' + inferred.astype(str), 'NAME:' + name_key))
+    link = np.where(mona.notna(), 'MONA_CD', 'NAME')
+    # 동명이인은 대수/MEMBER_NO 로 따로 둔다
+    unlinked = ambiguous.to_numpy() & mona.isna().to_numpy()
+    person = np.where(unlinked, 'TERM:' + data['AGE'] + ':' + data['MEMBER_NO'], person)
+    link = np.where(unlinked, 'NONE', link)
+
+    data['PERSON_ID'] = person
+    data['LINK'] = link
+    data['TERMS'] = data.groupby('PERSON_ID')['AGE'].transform('nunique')
+    return data[LINK_COLUMNS].sort_values(['PERSON_ID', 'AGE'], kind='stable').reset_index(drop=True)
@@ -0,0 +1,183 @@
+"""
+표결 행렬 스트리밍 생성
+여러 대수/위원회 표결을 합친 수천만 행 데이터도 일정한 메모리로 법안 × 의원 행렬을 만든다.
+build_vote_matrix 는 긴 형식 데이터 전체를 한 번에 읽지만, 여기서는 배치 단위로 두 번 읽는다.
+
+1. 첫 번째 읽기: 법안/의원 ID 집합과 (의원, 날짜, 정당)별 표결 수만 모은다 (정당 소속 구간용).
+2. 행렬 크기가 정해지면 캐시 디렉토리에 votes.npy 를 메모리 맵으로 미리 만들어 UNSEEN(-1)으로 채운다.
+3. 두 번째 읽기: 배치마다 ID 를 행/열 번호로 바꾸고 (법안, 의원) 키로 중복을 없앤 뒤 행렬에 바로 쓴다.
+   배치 안에서는 np.unique 로, 배치 사이에서는 행렬 자체를 키 집합으로 써서 아직 UNSEEN 인 칸에만 쓴다.
+   build_vote_matrix 처럼 처음 나온 표결이 남고, 키 집합에 따로 메모리를 쓰지 않는다.
+
+메모리는 배치 크기와 ID 수에만 비례하고 입력 행 수와는 관계없다.
+결과는 matrix_cache 와 같은 형식이라 matrix_cache.load 로 그대로 연다.
+"""
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from . import matrix_cache
+from .member_registry import MemberRegistry, party_history
+from .vote_matrix import MISSING, VOTE_COLUMNS, _factorize_sorted, encode_votes
+
+# 한 번에 읽는 행 수
+BATCH_SIZE = 1_000_000
+# 이보다 큰 표결 파일은 load_or_build 가 자동으로 나눠 읽는다
+STREAMING_MIN_BYTES = 256 * 1024 * 1024
+# 메모리 맵 행렬을 채우거나 정리할 때 한 번에 다루는 칸 수
+BLOCK_CELLS = 64 * 1024 * 1024
+
+# 아직 표결이 쓰이지 않은 칸
+UNSEEN = -1
+
+
+def use_streaming(path, streaming=None):
+    """streaming 이 None 이면 파일 크기로 정한다."""
+    if streaming is not None:
+        return streaming
+    return os.path.getsize(path) >= STREAMING_MIN_BYTES
+
+
+def vote_columns(path):
+    """load_votes 와 같은 열 (VOTE_DATE 는 있을 때만)."""
+    if path.endswith('.parquet'):
+        import pyarrow.parquet as pq
+        names = set(pq.read_schema(path).names)
+    else:
+        names = set(pd.read_csv(path, nrows=0, encoding='utf-8-sig').columns)
+    return VOTE_COLUMNS + ['POLY_NM', 'HG_NM'] + (['VOTE_DATE'] if 'VOTE_DATE' in names else [])
+
+
+def iter_batches(path, batch_size=BATCH_SIZE, columns=None):
+    """표결 데이터를 batch_size 행씩 DataFrame 으로 읽는다."""
+    columns = columns or vote_columns(path)
+    if path.endswith('.parquet'):
+        import pyarrow.parquet as pq
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=batch_size, columns=columns):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(path, usecols=columns, dtype=str, encoding='utf-8-sig', chunksize=batch_size)
+
+
+def _factorize(values, func):
+    """(행별 번호, 번호별 값). 값은 고유값(문자열)에만 func 를 적용하고, 결측은 마지막 번호(값 None)가 된다."""
+    codes, uniques = pd.factorize(values)
+    labels = np.append(func(np.asarray(uniques).astype(str)), None)
+    return np.where(codes < 0, len(labels) - 1, codes), labels
+
+
+def _day_digits(uniques):
+    """VOTE_DATE 의 날짜 숫자 8자리 (parse_vote_date 가 읽는 부분만 남긴다)."""
+    return pd.Series(uniques).str.replace(r'\D', '', regex=True).str[:8].to_numpy(dtype=object)
+
+
+def _positions(values, index):
+    """ID 를 index 의 위치로 바꾼다. 없는 ID 와 결측은 -1."""
+    codes, positions = _factorize(values, index.get_indexer)
+    positions[-1] = -1
+    return positions.astype(np.int64)[codes]
+
+
+def history_counts(batch):
+    """배치를 (의원, 날짜, 정당)별 표결 수와 마지막 이름으로 줄인다.
+
+    문자열 대신 배치 안 정수 번호를 하나의 키로 묶어 세므로 행 수만큼의 문자열 비교가 없다.
+    """
+    columns = [c for c in ('MEMBER_NO', 'VOTE_DATE', 'POLY_NM') if c in batch.columns]
+    key = np.zeros(len(batch), dtype=np.int64)
+    factors = {}
+    for column in columns:
+        codes, labels = _factorize(batch[column], _day_digits if column == 'VOTE_DATE' else lambda u: u)
+        key = key * len(labels) + codes
+        factors[column] = (codes, labels)
+
+    _, counts = np.unique(key, return_counts=True)
+    # 키마다 마지막 행: 뒤집은 배열에서 처음 나온 행
+    _, first_reversed = np.unique(key[::-1], return_index=True)
+    last = len(key) - 1 - first_reversed
+
+    part = pd.DataFrame({column: labels[codes[last]] for column, (codes, labels) in factors.items()})
+    part['HG_NM'] = batch['HG_NM'].to_numpy(dtype=object)[last]
+    part['VOTES'] = counts
+    return part
+
+
+def _merge_history(parts):
+    """배치별로 줄인 표들을 합친다. 이름은 뒤 배치의 것을 쓴다."""
+    part = pd.concat([p for p in parts if p is not None], ignore_index=True)
+    keys = [c for c in ('MEMBER_NO', 'VOTE_DATE', 'POLY_NM') if c in part.columns]
+    return part.groupby(keys, sort=False, dropna=False).agg(
+        HG_NM=('HG_NM', 'last'), VOTES=('VOTES', 'sum')).reset_index()
+
+
+def scan(path, batch_size=BATCH_SIZE):
+    """첫 번째 읽기: (정렬된 법안 ID, 정렬된 의원 ID, 줄인 표결 이력 표, 행 수)."""
+    bills, members = set(), set()
+    history, pending = None, []
+    rows = 0
+    for batch in iter_batches(path, batch_size):
+        rows += len(batch)
+        bills.update(np.asarray(pd.unique(batch['BILL_NO'].dropna())).astype(str).tolist())
+        members.update(np.asarray(pd.unique(batch['MEMBER_NO'].dropna())).astype(str).tolist())
+        pending.append(history_counts(batch))
+        # 모아 둔 표가 합친 표보다 커질 때만 합친다 (배치마다 합치면 합치는 비용이 배치 수의 제곱으로 는다)
+        if sum(map(len, pending)) >= (0 if history is None else len(history)):
+            history, pending = _merge_history([history] + pending), []
+    history = _merge_history([history] + pending)
+
+    bill_ids = _factorize_sorted(np.array(sorted(bills), dtype=object))[1]
+    member_ids = _factorize_sorted(np.array(sorted(members), dtype=object))[1]
+    return bill_ids, member_ids, history, rows
+
+
+def _row_blocks(shape):
+    step = max(1, BLOCK_CELLS // max(shape[1], 1))
+    return [slice(start, min(start + step, shape[0])) for start in range(0, shape[0], step)]
+
+
+def scatter(path, votes, bill_ids, member_ids, batch_size=BATCH_SIZE):
+    """두 번째 읽기: 배치마다 중복을 없애고 UNSEEN 인 칸에만 표결 코드를 쓴다. 쓴 칸 수를 반환한다."""
+    bill_index, member_index = pd.Index(bill_ids), pd.Index(member_ids)
+    n_members = len(member_ids)
+    cells = votes.reshape(-1)
+    written = 0
+    for batch in iter_batches(path, batch_size):
+        rows = _positions(batch['BILL_NO'], bill_index)
+        cols = _positions(batch['MEMBER_NO'], member_index)
+        codes = encode_votes(batch)
+        valid = (rows >= 0) & (cols >= 0)
+
+        # (법안, 의원) 쌍을 하나의 정수 키로 묶어 배치 안 중복 제거 (처음 나온 행)
+        keys, first = np.unique(rows[valid] * n_members + cols[valid], return_index=True)
+        fresh = cells[keys] == UNSEEN
+        cells[keys[fresh]] = codes[valid][first[fresh]]
+        written += int(fresh.sum())
+    return written
+
+
+def build_cache(source_path, cache_dir, batch_size=None):
+    """source_path 를 나눠 읽어 cache_dir 에 matrix_cache 형식의 행렬 캐시를 만들고 MemberRegistry 를 반환한다."""
+    batch_size = batch_size or BATCH_SIZE
+    start = time.perf_counter()
+    bill_ids, member_ids, history, rows = scan(source_path, batch_size)
+    registry = MemberRegistry(party_history(history))
+    shape = (len(bill_ids), len(member_ids))
+
+    tmp_dir = matrix_cache.staging_dir(cache_dir)
+    votes = np.lib.format.open_memmap(os.path.join(tmp_dir, 'votes.npy'), mode='w+', dtype=np.int8, shape=shape)
+    for block in _row_blocks(shape):
+        votes[block] = UNSEEN
+    written = scatter(source_path, votes, bill_ids, member_ids, batch_size)
+    for block in _row_blocks(shape):
+        cells = votes[block]
+        cells[cells == UNSEEN] = MISSING
+    votes.flush()
+    del votes
+
+    matrix_cache.commit(tmp_dir, cache_dir, bill_ids, matrix_cache.member_table(None, member_ids, registry),
+                        shape, source_path)
+    print(f"표결 데이터 {rows}행을 {batch_size}행씩 읽어 {shape[0]} x {shape[1]} 행렬 생성 "
+          f"(중복 {rows - written}행 제외, {time.perf_counter() - start:.2f}초): {cache_dir}")
+    return registry
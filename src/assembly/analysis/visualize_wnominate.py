@@ -0,0 +1,288 @@
+"""
+W-NOMINATE 결과 시각화
+국회의원들의 W-NOMINATE 결과를 그림으로 저장하는 모듈 겸 스크립트
+
+정당별 데이터는 한 번만 나눠 두고, 그림마다 별도 작업 프로세스(Agg 백엔드)에서 그린다.
+그림에 들어가는 데이터와 설정의 해시를 출력 폴더의 .figure_hashes.json 에 기록해 두고,
+바뀌지 않은 그림은 다시 그리지 않는다.
+
+사용 예:
+    assembly plot
+    assembly plot --parties 더불어민주당 국민의힘 --suffix 2parties --workers 3
+"""
+import argparse
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import matplotlib
+matplotlib.use('Agg')  # 화면 없이 파일로만 그린다 (작업 프로세스에서도 안전)
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+from matplotlib import font_manager
+
+from ..config import Config
+
+# 주요 정당 목록과 색상
+DEFAULT_PARTIES = ['더불어민주당', '국민의힘', '정의당']
+PARTY_COLORS = {
+    '더불어민주당': 'blue',
+    '국민의힘': 'red',
+    '정의당': 'yellow',
+}
+
+# 운영체제별 한글 폰트 후보 (앞에서부터 설치된 것을 쓴다)
+KOREAN_FONTS = ['Malgun Gothic', 'AppleGothic', 'NanumGothic', 'Noto Sans CJK KR', 'Noto Sans KR', 'UnDotum']
+WINDOWS_FONT_PATH = "C:/Windows/Fonts/malgun.ttf"
+
+PLOT_COLUMNS = ['party', 'name', 'coord1D', 'coord2D', 'GMP', 'CC']
+LABELS_PER_PARTY = 5
+HASH_FILE = '.figure_hashes.json'
+# 그리는 코드가 바뀌면 올려서 기존 해시를 무효화한다
+RENDER_VERSION = 1
+
+
+def setup_korean_font():
+    """설치된 한글 폰트를 찾아 기본 글꼴로 지정한다. 찾으면 폰트 이름, 못 찾으면 None."""
+    installed = {font.name for font in font_manager.fontManager.ttflist}
+    name = next((font for font in KOREAN_FONTS if font in installed), None)
+    if name is None and os.path.exists(WINDOWS_FONT_PATH):
+        font_manager.fontManager.addfont(WINDOWS_FONT_PATH)
+        name = font_manager.FontProperties(fname=WINDOWS_FONT_PATH).get_name()
+    if name is not None:
+        plt.rcParams['font.family'] = name
+    plt.rcParams['axes.unicode_minus'] = False  # 마이너스 기호 깨짐 방지
+    return name
+
+
+def party_colors(parties):
+    """정당별 색상. PARTY_COLORS 에 없는 정당은 tab10 색을 차례로 쓴다."""
+    palette = plt.get_cmap('tab10').colors
+    extra = iter(palette)
+    return {party: PARTY_COLORS.get(party) or next(extra) for party in parties}
+
+
+def group_by_party(df, parties=DEFAULT_PARTIES):
+    """데이터에 있는 정당만, parties 순서대로 {정당: 의원 DataFrame}. 한 번의 groupby 로 나눈다."""
+    groups = {party: frame[PLOT_COLUMNS].reset_index(drop=True)
+              for party, frame in df[df['party'].isin(parties)].groupby('party', sort=False)}
+    return {party: groups[party] for party in parties if party in groups}
+
+
+def plot_distribution(groups, colors, path, dpi, title):
+    """1차원 vs 2차원 산점도. 정당별 CC 상위 의원 이름을 표시한다."""
+    fig, ax = plt.subplots(figsize=(12, 8))
+    for party, data in groups.items():
+        ax.scatter(data['coord1D'], data['coord2D'], c=colors[party], alpha=0.7, label=party, s=50)
+
+    ax.legend(loc='best', fontsize=12)
+    ax.axhline(y=0, color='k', linestyle='-', alpha=0.3)
+    ax.axvline(x=0, color='k', linestyle='-', alpha=0.3)
+    ax.set_title(title, fontsize=16)
+    ax.set_xlabel('1차원 좌표 (진보-보수)', fontsize=14)
+    ax.set_ylabel('2차원 좌표', fontsize=14)
+    ax.grid(True, alpha=0.3)
+
+    for data in groups.values():
+        for mp in data.nlargest(LABELS_PER_PARTY, 'CC').itertuples(index=False):
+            ax.annotate(mp.name, (mp.coord1D, mp.coord2D), xytext=(5, 5), textcoords='offset points',
+                        fontsize=9, alpha=0.8)
+
+    fig.tight_layout()
+    fig.savefig(path, dpi=dpi)
+    plt.close(fig)
+
+
+def plot_boxplot(groups, colors, path, dpi, title):
+    """정당별 1차원 좌표 분포 박스플롯."""
+    fig, ax = plt.subplots(figsize=(12, 6))
+    names = list(groups)
+    boxes = ax.boxplot([groups[party]['coord1D'].dropna().to_numpy() for party in names], vert=False,
+                       patch_artist=True, medianprops=dict(color='black', linewidth=2))
+    for party, box in zip(names, boxes['boxes']):
+        box.set(facecolor=colors[party], alpha=0.6)
+        box.set(edgecolor=colors[party], linewidth=2)
+
+    ax.set_yticks(range(1, len(names) + 1), names)
+    ax.set_xlabel('1차원 좌표 (진보-보수)', fontsize=14)
+    ax.set_title(title, fontsize=16)
+    ax.grid(True, alpha=0.3)
+    ax.axvline(x=0, color='k', linestyle='--', alpha=0.5)
+    fig.tight_layout()
+    fig.savefig(path, dpi=dpi)
+    plt.close(fig)
+
+
+def plot_performance(groups, colors, path, dpi, title):
+    """정당별 GMP, CC 평균 막대 그래프."""
+    names = list(groups)
+    gmp = [groups[party]['GMP'].mean() for party in names]
+    cc = [groups[party]['CC'].mean() for party in names]
+    x = np.arange(len(names))
+    width = 0.35
+
+    fig, ax = plt.subplots(figsize=(10, 6))
+    bars = [ax.bar(x - width / 2, gmp, width, label='GMP 평균', color='skyblue'),
+            ax.bar(x + width / 2, cc, width, label='CC 평균', color='lightgreen')]
+    ax.set_xticks(x)
+    ax.set_xticklabels(names)
+    ax.set_ylabel('평균 점수', fontsize=14)
+    ax.set_title(title, fontsize=16)
+    ax.legend()
+
+    # 막대 위에 값 표시
+    for rects in bars:
+        for rect in rects:
+            height = rect.get_height()
+            ax.annotate(f'{height:.3f}', xy=(rect.get_x() + rect.get_width() / 2, height), xytext=(0, 3),
+                        textcoords="offset points", ha='center', va='bottom')
+
+    fig.tight_layout()
+    fig.savefig(path, dpi=dpi)
+    plt.close(fig)
+
+
+# 그림 이름 -> (그리는 함수, 파일 이름 형식, 제목 형식)
+FIGURES = {
+    'distribution': (plot_distribution, 'wnominate_distribution_{suffix}.png',
+                     '{title_prefix} W-NOMINATE 의원 분포 (주요 {n}개 정당)'),
+    'boxplot': (plot_boxplot, 'wnominate_party_boxplot_{suffix}.png', '정당별 의원 이념 분포 (1차원)'),
+    'performance': (plot_performance, 'wnominate_party_performance_{suffix}.png', '정당별 평균 GMP 및 CC 점수 비교'),
+}
+
+
+def figure_hash(name, groups, colors, dpi, title):
+    """그림에 들어가는 데이터(정당별 행)와 설정으로 만든 해시."""
+    digest = hashlib.sha256()
+    digest.update(json.dumps({'figure': name, 'version': RENDER_VERSION, 'dpi': dpi, 'title': title,
+                              'colors': {party: str(colors[party]) for party in groups}},
+                             ensure_ascii=False, sort_keys=True).encode('utf-8'))
+    for party, data in groups.items():
+        digest.update(party.encode('utf-8'))
+        digest.update(pd.util.hash_pandas_object(data, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def _load_hashes(output_dir):
+    try:
+        with open(os.path.join(output_dir, HASH_FILE), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def _save_hashes(output_dir, hashes):
+    path = os.path.join(output_dir, HASH_FILE)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(hashes, f, ensure_ascii=False, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def _render(job):
+    """작업 프로세스에서 그림 하나를 그린다."""
+    name, groups, colors, path, dpi, title = job
+    setup_korean_font()
+    FIGURES[name][0](groups, colors, path, dpi, title)
+    return path
+
+
+def render_figures(df, output_dir, parties=DEFAULT_PARTIES, suffix='3parties', figures=None, dpi=300,
+                   max_workers=None, force=False, title_prefix='21대 국회'):
+    """figures(기본: 전부)를 그린다. 반환값은 {그림 이름: (경로, 새로 그렸는지)}."""
+    os.makedirs(output_dir, exist_ok=True)
+    groups = group_by_party(df, parties)
+    colors = party_colors(groups)
+    hashes = _load_hashes(output_dir)
+
+    jobs, results = [], {}
+    for name in figures or FIGURES:
+        _, file_format, title_format = FIGURES[name]
+        path = os.path.join(output_dir, file_format.format(suffix=suffix))
+        title = title_format.format(title_prefix=title_prefix, n=len(groups))
+        key = figure_hash(name, groups, colors, dpi, title)
+        if not force and os.path.exists(path) and hashes.get(os.path.basename(path)) == key:
+            results[name] = (path, False)
+            continue
+        jobs.append((name, (name, groups, colors, path, dpi, title), key))
+
+    if jobs:
+        max_workers = min(max_workers or os.cpu_count() or 1, len(jobs))
+        if max_workers > 1:
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                paths = list(executor.map(_render, [job for _, job, _ in jobs]))
+        else:
+            paths = [_render(job) for _, job, _ in jobs]
+        for (name, _, key), path in zip(jobs, paths):
+            hashes[os.path.basename(path)] = key
+            results[name] = (path, True)
+        _save_hashes(output_dir, hashes)
+    return results
+
+
+def print_summary(df, parties=DEFAULT_PARTIES):
+    selected = df[df['party'].isin(parties)]
+    print(f"총 의원 수: {len(df)}")
+    print(f"선택된 정당({', '.join(parties)}) 의원 수: {len(selected)}")
+    print("정당 분포:")
+    for party, count in df['party'].value_counts().items():
+        print(f"  - {party}: {count}명")
+
+    print("\n선택된 정당 기본 통계:")
+    print(f"  - 1차원 좌표 평균: {selected['coord1D'].mean():.4f}")
+    print(f"  - 1차원 좌표 표준편차: {selected['coord1D'].std():.4f}")
+    print(f"  - 2차원 좌표 평균: {selected['coord2D'].mean():.4f}")
+    print(f"  - 2차원 좌표 표준편차: {selected['coord2D'].std():.4f}")
+
+
+def run(config=None, input_file=None, output_dir=None, parties=DEFAULT_PARTIES, suffix='3parties', figures=None,
+        dpi=300, max_workers=None, force=False):
+    """W-NOMINATE 결과를 읽어 요약을 출력하고 그림을 그린다 (기본 입출력 폴더: config.analysis_dir).
+
+    input_file 이 없으면 R 결과(wnominate_results.csv)를, 그것이 없으면 Python 추정 결과(wnominate_results_py.csv)를
+    쓴다. Python 추정 결과는 아직 R 결과의 2차원 좌표를 그대로 재현하지 못하므로 기본값으로 쓰지 않는다.
+    """
+    config = config or Config.from_env()
+    if input_file is None:
+        input_file = config.analysis_path("wnominate_results.csv")
+        if not os.path.exists(input_file):
+            input_file = config.analysis_path("wnominate_results_py.csv")
+            print(f"R 결과가 없어 Python 추정 결과('{input_file}')를 그립니다.")
+    output_dir = output_dir or config.analysis_dir
+
+    if setup_korean_font() is None:
+        print(f"한글 폰트를 찾지 못했습니다 ({', '.join(KOREAN_FONTS)} 중 하나를 설치하세요). 한글이 깨질 수 있습니다.")
+
+    print("W-NOMINATE 결과 데이터 로드 중...")
+    df = pd.read_csv(input_file)
+    print_summary(df, parties)
+
+    results = render_figures(df, output_dir, parties=parties, suffix=suffix, figures=figures,
+                             dpi=dpi, max_workers=max_workers, force=force, title_prefix=f"{config.age}대 국회")
+    print()
+    for name, (path, rendered) in results.items():
+        print(f"{name}: '{path}' {'저장' if rendered else '변경 없음 (건너뜀)'}")
+    print(f"\n분석 완료. 모든 그래프가 {output_dir}/ 폴더에 저장되었습니다.")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="W-NOMINATE 결과 시각화")
+    parser.add_argument('--input', help="W-NOMINATE 결과 CSV (기본: analysis_dir/wnominate_results.csv, "
+                                            "없으면 wnominate_results_py.csv)")
+    parser.add_argument('--output-dir', help="그림 저장 폴더 (기본: analysis_dir)")
+    parser.add_argument('--parties', nargs='+', default=DEFAULT_PARTIES)
+    parser.add_argument('--suffix', default='3parties', help="출력 파일 이름 뒤에 붙는 이름")
+    parser.add_argument('--figures', nargs='+', choices=list(FIGURES), help="그릴 그림 (기본: 전부)")
+    parser.add_argument('--dpi', type=int, default=300)
+    parser.add_argument('--workers', type=int, default=None, help="그림을 그릴 프로세스 수")
+    parser.add_argument('--force', action='store_true', help="바뀌지 않은 그림도 다시 그린다")
+    args = parser.parse_args()
+    run(Config.from_env(), input_file=args.input, output_dir=args.output_dir, parties=args.parties,
+        suffix=args.suffix, figures=args.figures, dpi=args.dpi, max_workers=args.workers, force=args.force)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,198 @@
+"""
+표결 행렬 생성
+수집한 표결 데이터(긴 형식)를 법안 × 의원 int8 행렬로 바꾼다. prepare_wnominate_data.R의
+unique() + dcast 단계를 대체하며, W-NOMINATE의 lop/minvotes 필터도 벡터 연산으로 적용한다.
+"""
+import os
+import time
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from ..config import Config
+from .member_registry import MemberRegistry
+
+# prepare_wnominate_data.R 과 같은 표결 코드
+MISSING, YEA, NAY, ABSTAIN, NOT_IN_LEGIS = 0, 1, 2, 3, 4
+VOTE_CODES = {'찬성': YEA, '반대': NAY, '기권': ABSTAIN, '불참': NOT_IN_LEGIS}
+
+# run_wnominate.R 의 rollcall() 설정: 찬성=yea, 반대/기권=nay, 불참=notInLegis, 0=missing
+YEA_CODES = (YEA,)
+NAY_CODES = (NAY, ABSTAIN)
+
+# wnominate() 기본값
+DEFAULT_LOP = 0.025
+DEFAULT_MINVOTES = 20
+
+VOTE_COLUMNS = ['BILL_NO', 'MEMBER_NO', 'RESULT_VOTE_MOD']
+
+# to_csv 가 한 번에 DataFrame 으로 바꾸는 법안(행) 수
+CSV_CHUNK_ROWS = 10000
+
+
+@dataclass
+class VoteMatrix:
+    votes: np.ndarray        # (법안 수, 의원 수) int8, vote_table_num.csv 와 같은 방향
+    bill_ids: np.ndarray     # 행 번호 -> BILL_NO
+    member_ids: np.ndarray   # 열 번호 -> MEMBER_NO
+
+    @property
+    def shape(self):
+        return self.votes.shape
+
+    def bill_index(self):
+        return {bill_id: i for i, bill_id in enumerate(self.bill_ids)}
+
+    def member_index(self):
+        return {member_id: j for j, member_id in enumerate(self.member_ids)}
+
+    def subset(self, bill_mask=None, member_mask=None):
+        bill_mask = slice(None) if bill_mask is None else bill_mask
+        member_mask = slice(None) if member_mask is None else member_mask
+        return VoteMatrix(self.votes[bill_mask][:, member_mask],
+                          self.bill_ids[bill_mask], self.member_ids[member_mask])
+
+    def filter(self, lop=DEFAULT_LOP, minvotes=DEFAULT_MINVOTES):
+        """wnominate()와 같은 순서로 걸러낸다: 소수 측 비율이 lop 이하인 표결을 먼저 빼고,
+        남은 표결에서 찬성/반대 표가 minvotes 미만인 의원을 뺀다."""
+        yea, nay = binary_masks(self.votes)
+        yea_count = yea.sum(axis=1)
+        nay_count = nay.sum(axis=1)
+        voted = yea_count + nay_count
+        minority = np.minimum(yea_count, nay_count) / np.maximum(voted, 1)
+        bill_mask = (voted > 0) & (minority > lop)
+
+        member_votes = (yea[bill_mask] | nay[bill_mask]).sum(axis=0)
+        member_mask = member_votes >= minvotes
+        return self.subset(bill_mask, member_mask)
+
+    def to_csv(self, path, chunk_rows=CSV_CHUNK_ROWS):
+        """prepare_wnominate_data.R 가 만들던 vote_table_num.csv 형식으로 저장한다.
+        메모리 맵 행렬도 전체를 올리지 않도록 chunk_rows 행씩 나눠 쓴다."""
+        with open(path, 'w', encoding='utf-8', newline='') as f:
+            for start in range(0, max(len(self.bill_ids), 1), chunk_rows):
+                rows = slice(start, start + chunk_rows)
+                df = pd.DataFrame(self.votes[rows], columns=self.member_ids)
+                df.insert(0, 'BILL_NO', self.bill_ids[rows])
+                df.to_csv(f, index=False, header=start == 0)
+
+    @classmethod
+    def from_csv(cls, path):
+        """vote_table_num.csv (BILL_NO 열 + 의원별 열) 를 읽는다."""
+        df = pd.read_csv(path, dtype={'BILL_NO': str})
+        member_ids = np.array([str(c) for c in df.columns[1:]])
+        return cls(df.iloc[:, 1:].to_numpy(dtype=np.int8), df['BILL_NO'].to_numpy(dtype=str), member_ids)
+
+
+def binary_masks(votes):
+    """(찬성 여부, 반대 여부) bool 행렬. 결측과 불참은 둘 다 False."""
+    return np.isin(votes, YEA_CODES), np.isin(votes, NAY_CODES)
+
+
+def _factorize_sorted(values):
+    """값마다 정수 번호를 매긴다. dcast 처럼 ID 오름차순(모두 숫자면 숫자 기준)으로 번호를 준다.
+
+    결측값의 번호는 -1 이다.
+    """
+    codes, uniques = pd.factorize(values)
+    uniques = np.asarray(uniques).astype(str)
+    numeric = pd.to_numeric(pd.Series(uniques), errors='coerce')
+    if numeric.notna().all():
+        order = np.argsort(numeric.to_numpy(), kind='stable')
+    else:
+        order = np.argsort(uniques, kind='stable')
+    rank = np.empty(len(order), dtype=np.int64)
+    rank[order] = np.arange(len(order))
+    return np.where(codes < 0, -1, rank[codes]), uniques[order]
+
+
+def encode_votes(df):
+    """VOTE_CODE 열(columnar_store 출력)이 있으면 그대로, 없으면 RESULT_VOTE_MOD 를 코드로 바꾼다."""
+    if 'VOTE_CODE' in df.columns:
+        return df['VOTE_CODE'].to_numpy(dtype=np.int8)
+    codes, uniques = pd.factorize(df['RESULT_VOTE_MOD'])
+    lookup = np.array([VOTE_CODES.get(u, MISSING) for u in uniques] + [MISSING], dtype=np.int8)
+    return lookup[codes]  # factorize 의 결측(-1)은 lookup 마지막 값(MISSING)이 된다
+
+
+def build_vote_matrix(df):
+    """긴 형식 표결 데이터프레임(BILL_NO, MEMBER_NO, RESULT_VOTE_MOD 또는 VOTE_CODE)으로 행렬을 만든다.
+
+    같은 (법안, 의원) 쌍이 여러 번 나오면 처음 나온 표결을 쓴다. BILL_NO 나 MEMBER_NO 가 없는 행은 버린다.
+    """
+    bill_pos, bill_ids = _factorize_sorted(df['BILL_NO'])
+    member_pos, member_ids = _factorize_sorted(df['MEMBER_NO'])
+    codes = encode_votes(df)
+
+    valid = (bill_pos >= 0) & (member_pos >= 0)
+    if not valid.all():
+        bill_pos, member_pos, codes = bill_pos[valid], member_pos[valid], codes[valid]
+
+    # (법안, 의원) 쌍을 하나의 정수 키로 묶어 중복 제거
+    keys = bill_pos * len(member_ids) + member_pos
+    _, first = np.unique(keys, return_index=True)
+
+    votes = np.zeros((len(bill_ids), len(member_ids)), dtype=np.int8)
+    votes[bill_pos[first], member_pos[first]] = codes[first]
+    return VoteMatrix(votes, bill_ids, member_ids)
+
+
+def member_info(df):
+    """의원 정보 표 (prepare_wnominate_data.R 의 member_no_party.csv 와 같은 열, 의원당 한 행)."""
+    return MemberRegistry.from_votes(df).members
+
+
+def load_votes(path, columns=None):
+    """표결 데이터를 읽는다. columns 를 주지 않으면 행렬과 의원 레지스트리에 필요한 열만 읽는다
+    (VOTE_DATE 는 있을 때만)."""
+    wanted = columns or VOTE_COLUMNS + ['POLY_NM', 'HG_NM', 'VOTE_DATE']
+    optional = set() if columns else {'VOTE_DATE'}
+    if path.endswith('.parquet'):
+        import pyarrow.parquet as pq
+        names = set(pq.read_schema(path).names)
+        df = pd.read_parquet(path, columns=[c for c in wanted if c in names or c not in optional])
+    else:
+        df = pd.read_csv(path, usecols=lambda c: c in wanted, dtype=str, encoding='utf-8-sig')
+    return df
+
+
+def main(config=None, voting_file=None, streaming=None, batch_size=None):
+    # voting_file: 없으면 data_dir 의 가장 최근 표결 수집 결과
+    # streaming: True 면 나눠 읽어 행렬 캐시에 바로 쓴다 (streaming_matrix.py). None 이면 파일 크기로 정한다.
+    config = config or Config.from_env()
+    voting_file = voting_file or config.latest_votes()
+    if voting_file is None:
+        print(f"'{config.data_dir}' 폴더에 {config.age}대 표결 데이터가 없습니다. 먼저 표결 정보를 수집하세요.")
+        return None
+    output_dir = config.analysis_dir
+    os.makedirs(output_dir, exist_ok=True)
+
+    print("투표 데이터 처리 시작...")
+    start = time.perf_counter()
+    from .streaming_matrix import build_cache, use_streaming
+    if use_streaming(voting_file, streaming):
+        from .matrix_cache import load
+        registry = build_cache(voting_file, config.matrix_cache_dir, batch_size)
+        matrix, _ = load(config.matrix_cache_dir)
+    else:
+        df = load_votes(voting_file)
+        print(f"총 투표 데이터 수: {len(df)}")
+
+        matrix = build_vote_matrix(df)
+        print(f"투표 테이블 크기: {matrix.shape[0]} x {matrix.shape[1]}")
+
+        filtered = matrix.filter()
+        print(f"lop/minvotes 필터 후: 법안 {filtered.shape[0]}개, 의원 {filtered.shape[1]}명")
+        registry = MemberRegistry.from_votes(df)
+
+    matrix.to_csv(os.path.join(output_dir, "vote_table_num.csv"))
+    registry.save(os.path.join(output_dir, "member_no_party.csv"),
+                  os.path.join(output_dir, "member_party_history.csv"))
+    print(registry.report(matrix.member_ids))
+    print(f"행렬 준비 완료 ({time.perf_counter() - start:.2f}초). 파일이 {output_dir}/ 폴더에 저장되었습니다.")
+    return matrix
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,216 @@
+"""
+표결 일치도/결속력 지표
+투표 행렬 하나로 의원 간 일치도 행렬, 법안별 정당 Rice 결속 지수, 의원별 정당 일치율(party unity),
+당론 이탈 목록을 한 번에 계산한다. 모든 계산은 의원/법안 반복문 없이 행렬 연산으로 한다.
+
+- 찬성/반대 여부는 의원 x 법안 비트 마스크(np.packbits)로 묶어 두고(bool 대비 1/8 크기),
+  의원 블록 단위로 풀어 float32 행렬 곱으로 같은 표 수와 함께 표결한 수를 센다.
+  여러 대수를 합친 큰 행렬도 블록 크기만큼만 메모리를 쓴다.
+- 정당별 찬성/반대 수는 (법안, 정당) 키의 bincount 한 번으로 센다.
+- 찬성/반대 구분은 run_wnominate.R 과 같다 (기권은 반대, 불참/결측은 표결하지 않은 것으로 본다).
+- 의원의 정당은 대표 정당(마지막 표결 시점의 정당)을 쓴다.
+
+결과는 시각화 코드에서 바로 읽을 수 있게 Parquet 로 저장한다.
+    vote_agreement.parquet        MEMBER_NO + 의원별 열 (일치율, 함께 표결한 적이 없으면 NaN)
+    vote_party_cohesion.parquet   BILL_NO, POLY_NM, YEA, NAY, RICE
+    vote_party_unity.parquet      MEMBER_NO, POLY_NM, HG_NM, PARTY_VOTES, WITH_PARTY, UNITY
+    vote_defections.parquet       BILL_NO, MEMBER_NO, POLY_NM, HG_NM, VOTE, PARTY_MAJORITY, PARTY_SHARE
+"""
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from .vote_matrix import binary_masks
+
+# 의원 블록 크기 (블록 x 법안 수 float32 두 개만 풀어 쓴다)
+BLOCK_SIZE = 1024
+
+YEA_LABEL = '찬성'
+NAY_LABEL = '반대'
+
+
+def pack_masks(votes):
+    """법안 x 의원 표결 코드 행렬 -> (찬성, 반대) 의원 x 법안 비트 마스크 (uint8, 법안 축으로 packbits)."""
+    yea, nay = binary_masks(np.asarray(votes))
+    return np.packbits(yea.T, axis=1), np.packbits(nay.T, axis=1)
+
+
+def _unpack(packed, rows, n_bills):
+    return np.unpackbits(packed[rows], axis=1, count=n_bills).astype(np.float32)
+
+
+def agreement_counts(yea_bits, nay_bits, n_bills, block_size=BLOCK_SIZE):
+    """(같은 표를 던진 수, 함께 표결한 수) 의원 x 의원 행렬. 의원 블록 쌍마다 풀어서 곱한다."""
+    n = len(yea_bits)
+    same = np.empty((n, n), dtype=np.float32)
+    common = np.empty((n, n), dtype=np.float32)
+    blocks = [slice(start, min(start + block_size, n)) for start in range(0, n, block_size)]
+    for i, rows in enumerate(blocks):
+        yea_r, nay_r = _unpack(yea_bits, rows, n_bills), _unpack(nay_bits, rows, n_bills)
+        for cols in blocks[i:]:
+            if cols == rows:
+                yea_c, nay_c = yea_r, nay_r
+            else:
+                yea_c, nay_c = _unpack(yea_bits, cols, n_bills), _unpack(nay_bits, cols, n_bills)
+            same[rows, cols] = yea_r @ yea_c.T + nay_r @ nay_c.T
+            common[rows, cols] = (yea_r + nay_r) @ (yea_c + nay_c).T
+            # 대칭이므로 아래 삼각 블록은 옮겨 쓴다
+            same[cols, rows] = same[rows, cols].T
+            common[cols, rows] = common[rows, cols].T
+    return same, common
+
+
+def agreement_matrix(votes, block_size=BLOCK_SIZE):
+    """의원 x 의원 일치율 (같은 표 / 함께 표결). 함께 표결한 적이 없으면 NaN."""
+    yea_bits, nay_bits = pack_masks(votes)
+    same, common = agreement_counts(yea_bits, nay_bits, np.asarray(votes).shape[0], block_size)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(common > 0, same / common, np.nan), common
+
+
+def party_counts(votes, party_codes, n_parties):
+    """(찬성 수, 반대 수) 법안 x 정당 행렬. (법안, 정당) 키를 bincount 로 센다."""
+    yea, nay = binary_masks(np.asarray(votes))
+    n_bills = yea.shape[0]
+    keys = np.arange(n_bills)[:, None] * n_parties + party_codes[None, :]
+    size = n_bills * n_parties
+    yea_counts = np.bincount(keys[yea], minlength=size).reshape(n_bills, n_parties)
+    nay_counts = np.bincount(keys[nay], minlength=size).reshape(n_bills, n_parties)
+    return yea_counts, nay_counts
+
+
+def rice_index(yea_counts, nay_counts):
+    """|찬성 - 반대| / (찬성 + 반대). 표결한 의원이 없으면 NaN."""
+    total = yea_counts + nay_counts
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(total > 0, np.abs(yea_counts - nay_counts) / total, np.nan)
+
+
+def vote_metrics(matrix, parties, names=None, block_size=BLOCK_SIZE):
+    """VoteMatrix 와 의원별 정당(member_ids 순서)으로 지표 표들을 만든다.
+
+    반환 dict: agreement (DataFrame, 의원 x 의원), cohesion, unity, defections.
+    정당 투표(party vote)는 가장 큰 두 정당의 다수 의견이 엇갈린 표결이다.
+    """
+    votes = np.asarray(matrix.votes)
+    member_ids = np.asarray(matrix.member_ids, dtype=str)
+    parties = pd.Series(parties, dtype=object).fillna('Unknown').to_numpy()
+    names = np.asarray(names if names is not None else ['Unknown'] * len(member_ids), dtype=object)
+    party_codes, party_names = pd.factorize(parties)
+    n_parties = len(party_names)
+
+    agreement, _ = agreement_matrix(votes, block_size)
+
+    yea_counts, nay_counts = party_counts(votes, party_codes, n_parties)
+    rice = rice_index(yea_counts, nay_counts)
+    voted = (yea_counts + nay_counts) > 0
+    bill_index, party_index = np.nonzero(voted)
+    cohesion = pd.DataFrame({
+        'BILL_NO': np.asarray(matrix.bill_ids, dtype=str)[bill_index],
+        'POLY_NM': np.asarray(party_names, dtype=object)[party_index],
+        'YEA': yea_counts[bill_index, party_index],
+        'NAY': nay_counts[bill_index, party_index],
+        'RICE': rice[bill_index, party_index],
+    })
+
+    # 정당 다수 의견: 1 찬성 / -1 반대 / 0 동수 또는 표결 없음
+    majority = np.sign(yea_counts - nay_counts)
+    sizes = np.bincount(party_codes, minlength=n_parties)
+    largest = np.argsort(sizes, kind='stable')[::-1][:2]
+    if n_parties >= 2:
+        party_vote = (majority[:, largest[0]] * majority[:, largest[1]]) < 0
+    else:
+        party_vote = np.zeros(len(votes), dtype=bool)
+
+    yea, nay = binary_masks(votes)
+    cast = np.where(yea, 1, np.where(nay, -1, 0)).astype(np.int8)      # 법안 x 의원
+    member_majority = majority[:, party_codes]                          # 법안 x 의원: 소속 정당 다수 의견
+    with_party = (cast != 0) & (cast == member_majority)
+    against_party = (cast != 0) & (member_majority != 0) & (cast != member_majority)
+
+    party_votes = ((cast != 0) & (member_majority != 0))[party_vote].sum(axis=0)
+    with_party_votes = with_party[party_vote].sum(axis=0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        unity_score = np.where(party_votes > 0, with_party_votes / party_votes, np.nan)
+    unity = pd.DataFrame({
+        'MEMBER_NO': member_ids, 'POLY_NM': parties, 'HG_NM': names,
+        'PARTY_VOTES': party_votes, 'WITH_PARTY': with_party_votes, 'UNITY': unity_score,
+    })
+
+    bill_index, member_index = np.nonzero(against_party)
+    party_total = (yea_counts + nay_counts)[bill_index, party_codes[member_index]]
+    party_side = np.where(member_majority[bill_index, member_index] > 0,
+                          yea_counts[bill_index, party_codes[member_index]],
+                          nay_counts[bill_index, party_codes[member_index]])
+    defections = pd.DataFrame({
+        'BILL_NO': np.asarray(matrix.bill_ids, dtype=str)[bill_index],
+        'MEMBER_NO': member_ids[member_index],
+        'POLY_NM': parties[member_index],
+        'HG_NM': names[member_index],
+        'VOTE': np.where(cast[bill_index, member_index] > 0, YEA_LABEL, NAY_LABEL),
+        'PARTY_MAJORITY': np.where(member_majority[bill_index, member_index] > 0, YEA_LABEL, NAY_LABEL),
+        'PARTY_SHARE': party_side / np.maximum(party_total, 1),
+    })
+
+    return {
+        'agreement': pd.DataFrame(agreement, index=pd.Index(member_ids, name='MEMBER_NO'), columns=member_ids),
+        'cohesion': cohesion,
+        'unity': unity,
+        'defections': defections,
+    }
+
+
+def save_metrics(metrics, output_dir):
+    """지표 표들을 output_dir 에 Parquet 로 저장하고 경로 dict 를 반환한다."""
+    os.makedirs(output_dir, exist_ok=True)
+    paths = {}
+    for name, file_name in (('agreement', 'vote_agreement.parquet'), ('cohesion', 'vote_party_cohesion.parquet'),
+                            ('unity', 'vote_party_unity.parquet'), ('defections', 'vote_defections.parquet')):
+        path = os.path.join(output_dir, file_name)
+        table = metrics[name].reset_index() if name == 'agreement' else metrics[name]
+        table.to_parquet(path, index=False)
+        paths[name] = path
+    return paths
+
+
+def party_summary(metrics):
+    """정당별 평균 Rice 지수, 평균 정당 일치율, 이탈 표 수."""
+    cohesion = metrics['cohesion'].groupby('POLY_NM')['RICE'].mean()
+    unity = metrics['unity'].groupby('POLY_NM')['UNITY'].mean()
+    defections = metrics['defections'].groupby('POLY_NM').size()
+    members = metrics['unity'].groupby('POLY_NM').size()
+    summary = pd.DataFrame({'MEMBERS': members, 'RICE': cohesion, 'UNITY': unity, 'DEFECTIONS': defections})
+    return summary.fillna({'DEFECTIONS': 0}).astype({'DEFECTIONS': 'int64'}).sort_values('MEMBERS', ascending=False)
+
+
+def run(config=None, output_dir=None):
+    """analysis_dir 의 투표 행렬(행렬 캐시가 있으면 캐시)로 지표를 계산해 저장한다."""
+    from ..config import Config
+    from .member_registry import MemberRegistry
+    from .vote_matrix import VoteMatrix
+
+    config = config or Config.from_env()
+    output_dir = output_dir or config.analysis_dir
+
+    voting_file = config.latest_votes()
+    if voting_file is not None:
+        from .matrix_cache import load_or_build
+        matrix, members = load_or_build(voting_file, config.matrix_cache_dir)
+        parties, names = members['POLY_NM'], members['HG_NM']
+    else:
+        matrix = VoteMatrix.from_csv(config.analysis_path("vote_table_num.csv"))
+        resolved = MemberRegistry.from_csv(config.analysis_path("member_no_party.csv")).resolve(matrix.member_ids)
+        parties, names = resolved['POLY_NM'].to_numpy(), resolved['HG_NM'].to_numpy()
+
+    start = time.perf_counter()
+    metrics = vote_metrics(matrix, parties, names)
+    elapsed = time.perf_counter() - start
+    paths = save_metrics(metrics, output_dir)
+
+    print(f"의원 {matrix.shape[1]}명, 법안 {matrix.shape[0]}건 지표 계산 ({elapsed:.3f}초)")
+    print(party_summary(metrics).head(10).to_string(float_format=lambda v: f"{v:.3f}"))
+    for name, path in paths.items():
+        print(f"- {name}: '{path}'")
+    return metrics
@@ -0,0 +1,721 @@
+"""
+W-NOMINATE 추정 (NumPy 구현)
+run_wnominate.R 의 wnominate(rc, polarity=c(1,1)) 를 R 없이 같은 프로세스에서 실행한다.
+
+모형 (Poole & Rosenthal):
+    U(i, 결과) = beta * exp(-1/2 * sum_k w_k^2 (x_ik - O_jk)^2)
+    P(찬성) = Phi(U(i, 찬성 결과) - U(i, 반대 결과))
+의원 좌표(x, 단위 원 안), 법안별 찬성/반대 결과 좌표, beta와 차원별 가중치 w를
+법안 단계 -> 의원 단계 -> 효용 단계 순으로 번갈아 추정한다. wnominate() 처럼 w_1 은 0.5 로 고정하고
+뒤 차원 가중치는 앞 차원 가중치 이하로 두며, 매 반복 의원 좌표가 단위 원을 채우도록 크기를 맞춘다.
+시작값은 1차원부터 차례로 추정해 앞 차원 모형의 잔차에서 다음 차원을 꺼낸다.
+각 단계는 모든 의원/법안에 대한 로그 우도, 기울기, Fisher 정보를 한 번에 계산해 감쇠 Fisher scoring 으로
+갱신하는 벡터 연산이며, 법안 수가 많으면 열 단위로 나눠 계산한다.
+
+preview() 는 반복 추정 없이 부호 행렬의 절단 SVD(또는 일치율 행렬의 고유분해)로 근사 좌표만 구한다.
+정당/법안 부분집합을 바꿔 보는 대화형 확인에 쓰고, 그 결과를 본 추정의 시작값(init)으로 넘기면 반복이 준다.
+"""
+import argparse
+import os
+import time
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from ..config import Config
+from .member_registry import MemberRegistry, normalize_member_no
+from .vote_matrix import DEFAULT_LOP, DEFAULT_MINVOTES, VoteMatrix, binary_masks
+
+# wnominate() 기본 시작값
+DEFAULT_BETA = 15.0
+DEFAULT_WEIGHT = 0.5
+
+# 결과 파일 이름. R 결과(run_wnominate.R)는 비교 기준으로 남겨 두고 덮어쓰지 않는다.
+RESULTS_CSV = "wnominate_results_py.csv"
+REFERENCE_CSV = "wnominate_results.csv"
+
+# 반복 상한과 수렴 기준 (연속된 두 반복의 좌표 상관계수가 차원마다 1 - DEFAULT_TOL 이상이면 수렴)
+DEFAULT_MAX_ITER = 500
+DEFAULT_TOL = 1e-4
+
+# 한 번에 계산할 (의원 x 법안 x 차원) 셀 수 상한
+MAX_CHUNK_CELLS = 4_000_000
+
+_SQRT2 = np.sqrt(2.0)
+_LOG_HALF = np.log(0.5)
+_LOG_SQRT_2PI = 0.5 * np.log(2.0 * np.pi)
+
+
+def _log_erfc_positive(z):
+    """z >= 0 에서 log(erfc(z)). Numerical Recipes 의 erfcc 근사(상대 오차 < 1.2e-7)를 로그 영역에서 계산한다."""
+    t = 1.0 / (1.0 + 0.5 * z)
+    poly = (-z * z - 1.26551223 + t * (1.00002368 + t * (0.37409196 + t * (0.09678418 + t * (
+        -0.18628806 + t * (0.27886807 + t * (-1.13520398 + t * (1.48851587 + t * (
+            -0.82215223 + t * 0.17087277)))))))))
+    return np.log(t) + poly
+
+
+def log_norm_cdf(v):
+    """log Phi(v). 꼬리 쪽에서도 언더플로 없이 계산한다."""
+    log_tail = _LOG_HALF + _log_erfc_positive(np.abs(v) / _SQRT2)  # log Phi(-|v|)
+    return np.where(v < 0, log_tail, np.log1p(-np.exp(log_tail)))
+
+
+def norm_cdf(v):
+    return np.exp(log_norm_cdf(v))
+
+
+@dataclass
+class Parameters:
+    ideal_points: np.ndarray   # (의원 수, 차원)
+    yea_points: np.ndarray     # (법안 수, 차원)
+    nay_points: np.ndarray     # (법안 수, 차원)
+    beta: float
+    weights: np.ndarray        # (차원,)
+
+    def copy(self):
+        return Parameters(self.ideal_points.copy(), self.yea_points.copy(), self.nay_points.copy(),
+                          float(self.beta), self.weights.copy())
+
+
+def sign_matrix(votes):
+    """법안 x 의원 표결 코드 행렬을 의원 x 법안 부호 행렬(찬성 1, 반대 -1, 그 외 0)로 바꾼다."""
+    yea, nay = binary_masks(np.asarray(votes))
+    return (yea.astype(np.int8) - nay.astype(np.int8)).T.copy()
+
+
+def _cell_terms(params, cols):
+    """법안 열 구간 cols 에 대한 셀별 거리, 효용 항 (차원별 2차원 배열 목록으로 계산)."""
+    x, beta, w2 = params.ideal_points, params.beta, params.weights ** 2
+    yea_pts = params.yea_points[cols]
+    nay_pts = params.nay_points[cols]
+    dims = x.shape[1]
+    dy = [x[:, k, None] - yea_pts[None, :, k] for k in range(dims)]
+    dn = [x[:, k, None] - nay_pts[None, :, k] for k in range(dims)]
+    ey = np.exp(-0.5 * sum(w2[k] * dy[k] * dy[k] for k in range(dims)))
+    en = np.exp(-0.5 * sum(w2[k] * dn[k] * dn[k] for k in range(dims)))
+    u = beta * (ey - en)
+    return dy, dn, ey, en, u
+
+
+def _jacobian(block, params, dy, dn, ey, en, u):
+    """셀별 du/d(모수) 목록. block 은 'legislators', 'bills', 'utility' 중 하나."""
+    beta, w2 = params.beta, params.weights ** 2
+    dims = len(dy)
+    if block == 'legislators':
+        return [beta * w2[k] * (en * dn[k] - ey * dy[k]) for k in range(dims)]
+    if block == 'bills':
+        return ([beta * w2[k] * ey * dy[k] for k in range(dims)]
+                + [-beta * w2[k] * en * dn[k] for k in range(dims)])
+    # utility: log(beta), log(w_k) 에 대한 미분
+    return [u] + [beta * w2[k] * (en * dn[k] * dn[k] - ey * dy[k] * dy[k]) for k in range(dims)]
+
+
+def evaluate(params, signs, block=None):
+    """로그 우도를 계산한다.
+
+    반환값은 dict: leg_ll (의원별), bill_ll (법안별). block 을 주면 그 블록의 그룹별 기울기 grad
+    (그룹 수, 모수 수) 와 Fisher 정보 행렬 fisher (그룹 수, 모수 수, 모수 수) 도 함께 돌려준다.
+    그룹은 의원 블록이면 의원, 법안 블록이면 법안, 효용 블록이면 전체 하나다.
+    """
+    n, m = signs.shape
+    dims = params.ideal_points.shape[1]
+    chunk = max(1, MAX_CHUNK_CELLS // max(1, n * dims))
+
+    out = {'leg_ll': np.zeros(n), 'bill_ll': np.zeros(m)}
+    if block is not None:
+        n_params = dims if block == 'legislators' else (2 * dims if block == 'bills' else dims + 1)
+        n_groups = {'legislators': n, 'bills': m, 'utility': 1}[block]
+        grad = np.zeros((n_groups, n_params))
+        fisher = np.zeros((n_groups, n_params, n_params))
+
+    for start in range(0, m, chunk):
+        cols = slice(start, start + chunk)
+        s = signs[:, cols].astype(np.float64)
+        dy, dn, ey, en, u = _cell_terms(params, cols)
+        observed = s != 0
+        v = s * u
+        log_cdf = log_norm_cdf(v)
+        log_p = log_cdf * observed
+        out['leg_ll'] += log_p.sum(axis=1)
+        out['bill_ll'][cols] = log_p.sum(axis=0)
+        if block is None:
+            continue
+
+        log_pdf = -0.5 * v * v - _LOG_SQRT_2PI
+        # dLL/du = s * phi(v) / Phi(v), 기대 정보량 = phi^2 / (Phi(v) Phi(-v)); 결측 셀은 0
+        g = s * np.exp(log_pdf - log_cdf)
+        info = np.exp(2 * log_pdf - log_cdf - log_norm_cdf(-v)) * observed
+        jac = _jacobian(block, params, dy, dn, ey, en, u)
+
+        if block == 'legislators':
+            rows, reduce = slice(None), (lambda a: a.sum(axis=1))
+        elif block == 'bills':
+            rows, reduce = cols, (lambda a: a.sum(axis=0))
+        else:
+            rows, reduce = slice(None), (lambda a: np.array([a.sum()]))
+        for a in range(n_params):
+            grad[rows, a] += reduce(g * jac[a])
+            weighted = info * jac[a]
+            for b in range(a, n_params):
+                value = reduce(weighted * jac[b])
+                fisher[rows, a, b] += value
+                if b != a:
+                    fisher[rows, b, a] += value
+
+    if block is not None:
+        out['grad'] = grad
+        out['fisher'] = fisher
+    return out
+
+
+def _project_ball(points):
+    norm = np.linalg.norm(points, axis=-1, keepdims=True)
+    return np.where(norm > 1.0, points / np.maximum(norm, 1e-12), points)
+
+
+def _scoring(values, objective, project, damping, n_iter):
+    """그룹(행)마다 독립인 목적 함수를 감쇠 Fisher scoring (Levenberg-Marquardt) 으로 올라간다.
+
+    objective(values) -> (그룹별 로그 우도, 기울기, Fisher 정보). 개선된 그룹은 감쇠를 줄이고,
+    개선되지 않은 그룹은 값을 유지한 채 감쇠를 늘린다.
+    """
+    ll, grad, fisher = objective(values)
+    n_params = values.shape[1]
+    eye = np.eye(n_params)
+    for _ in range(n_iter):
+        diag = np.einsum('gii->gi', fisher)
+        scale = np.maximum(diag.mean(axis=1), 1e-8)[:, None, None]
+        system = fisher + damping[:, None, None] * (diag[:, :, None] * eye + scale * eye)
+        step = np.linalg.solve(system, grad[:, :, None])[:, :, 0]
+        candidate = project(values + step)
+        cand_ll, cand_grad, cand_fisher = objective(candidate)
+        better = cand_ll > ll
+        values = np.where(better[:, None], candidate, values)
+        ll = np.where(better, cand_ll, ll)
+        grad = np.where(better[:, None], cand_grad, grad)
+        fisher = np.where(better[:, None, None], cand_fisher, fisher)
+        damping = np.clip(np.where(better, damping / 3, damping * 4), 1e-6, 1e6)
+    return values, damping
+
+
+def _bill_step(params, signs, damping, n_iter):
+    dims = params.ideal_points.shape[1]
+
+    def unpack(values):
+        return Parameters(params.ideal_points, values[:, :dims], values[:, dims:], params.beta, params.weights)
+
+    def objective(values):
+        out = evaluate(unpack(values), signs, block='bills')
+        return out['bill_ll'], out['grad'], out['fisher']
+
+    def project(values):
+        # 찬성/반대 결과의 중점이 단위 원 밖으로 나가지 않도록 평행 이동
+        yea, nay = values[:, :dims], values[:, dims:]
+        mid = (yea + nay) / 2
+        shift = _project_ball(mid) - mid
+        return np.hstack([yea + shift, nay + shift])
+
+    values, damping = _scoring(np.hstack([params.yea_points, params.nay_points]), objective, project,
+                               damping, n_iter)
+    return unpack(values), damping
+
+
+def _legislator_step(params, signs, damping, n_iter):
+    def unpack(values):
+        return Parameters(values, params.yea_points, params.nay_points, params.beta, params.weights)
+
+    def objective(values):
+        out = evaluate(unpack(values), signs, block='legislators')
+        return out['leg_ll'], out['grad'], out['fisher']
+
+    values, damping = _scoring(params.ideal_points, objective, _project_ball, damping, n_iter)
+    return unpack(values), damping
+
+
+def _utility_step(params, signs, damping, n_iter):
+    # wnominate() 처럼 첫 차원 가중치는 고정한다. 좌표와 가중치를 함께 늘리고 줄이는 방향이
+    # 우도를 바꾸지 않으므로, 고정하지 않으면 좌표가 단위 원 안쪽으로 줄어들며 수렴하지 않는다.
+    # 뒤 차원 가중치는 앞 차원 가중치를 넘지 않게 한다 (w_1 >= w_2 >= ...). 가중치가 크면 단위 원이
+    # 가중 공간에서 넓어지므로, 제약이 없으면 가중치가 부풀어 뒤 차원이 앞 차원보다 무겁게 추정된다.
+    def unpack(values):
+        weights = np.concatenate([params.weights[:1], np.exp(values[0, 1:])])
+        return Parameters(params.ideal_points, params.yea_points, params.nay_points,
+                          float(np.exp(values[0, 0])), weights)
+
+    def objective(values):
+        out = evaluate(unpack(values), signs, block='utility')
+        keep = np.r_[0, 2:out['grad'].shape[1]]  # log(beta), log(w_2..)
+        return np.array([out['leg_ll'].sum()]), out['grad'][:, keep], out['fisher'][:, keep][:, :, keep]
+
+    def project(values):
+        values = values.copy()
+        values[:, 1:] = np.minimum.accumulate(np.minimum(values[:, 1:], np.log(params.weights[0])), axis=1)
+        return values
+
+    start = np.concatenate([[np.log(params.beta)], np.log(params.weights[1:])])[None, :]
+    values, damping = _scoring(start, objective, project, damping, n_iter)
+    return unpack(values), damping
+
+
+def _fill_ball(params):
+    """가장 바깥 의원이 단위 원에 닿도록 의원/법안 좌표 전체를 같은 비율로 늘린다.
+
+    좌표 전체의 크기는 beta 와 맞바꿀 수 있어 우도가 거의 평평하고, 블록별 갱신은 이 방향으로 아주 조금씩만
+    움직인다. wnominate() 결과처럼 의원 좌표가 단위 원을 채우도록 매 반복 크기를 맞춘다. 법안 중점을 이때
+    원 안으로 옮기면 한쪽으로 쏠린 표결의 예측이 반복마다 나빠지므로 옮기지 않는다 (법안 단계에서 맞춤).
+    """
+    radius = np.linalg.norm(params.ideal_points, axis=1).max()
+    if radius <= 0:
+        return params
+    factor = 1.0 / radius
+    return Parameters(_project_ball(params.ideal_points * factor), params.yea_points * factor,
+                      params.nay_points * factor, params.beta, params.weights)
+
+
+def initial_ideal_points(signs, dims):
+    """의원 간 일치율 행렬을 이중 중심화한 뒤 고유벡터로 시작 좌표를 만든다 (최대 반지름 1로 맞춤)."""
+    yea = (signs > 0).astype(np.float64)
+    nay = (signs < 0).astype(np.float64)
+    voted = yea + nay
+    common = voted @ voted.T
+    agree = yea @ yea.T + nay @ nay.T
+    agreement = np.where(common > 0, agree / np.maximum(common, 1), np.nan)
+    agreement = np.where(np.isnan(agreement), np.nanmean(agreement), agreement)
+
+    d2 = (1.0 - agreement) ** 2
+    n = len(d2)
+    center = np.eye(n) - 1.0 / n
+    b = -0.5 * center @ d2 @ center
+    eigvals, eigvecs = np.linalg.eigh(b)
+    order = np.argsort(eigvals)[::-1][:dims]
+    coords = eigvecs[:, order] * np.sqrt(np.maximum(eigvals[order], 0))
+    radius = np.linalg.norm(coords, axis=1).max()
+    return coords / radius if radius > 0 else coords
+
+
+def svd_ideal_points(signs, dims, oversample=10, n_iter=4, seed=0):
+    """법안별로 중심화한 부호 행렬(결측 0)의 절단 SVD 왼쪽 특이벡터로 좌표를 만든다 (최대 반지름 1로 맞춤).
+
+    의원/법안 수가 많아도 빠르도록 무작위 부분공간 반복(randomized SVD)으로 앞쪽 dims 개만 구한다.
+    """
+    observed = signs != 0
+    x = signs.astype(np.float64)
+    x -= (x.sum(axis=0) / np.maximum(observed.sum(axis=0), 1)) * observed
+    rank = min(dims + oversample, *x.shape)
+    q, _ = np.linalg.qr(x @ np.random.default_rng(seed).standard_normal((x.shape[1], rank)))
+    for _ in range(n_iter):
+        q, _ = np.linalg.qr(x @ (x.T @ q))
+    u, singular, _ = np.linalg.svd(q.T @ x, full_matrices=False)
+    coords = (q @ u[:, :dims]) * singular[:dims]
+    radius = np.linalg.norm(coords, axis=1).max()
+    return coords / radius if radius > 0 else coords
+
+
+# preview() 의 좌표 계산 방법
+PREVIEW_METHODS = {'svd': svd_ideal_points, 'eigen': initial_ideal_points}
+
+
+def initial_bill_points(signs, ideal_points):
+    """찬성 의원들과 반대 의원들의 평균 좌표에서 결과 좌표를 시작한다."""
+    yea = (signs > 0).astype(np.float64)
+    nay = (signs < 0).astype(np.float64)
+    yea_pts = (yea.T @ ideal_points) / np.maximum(yea.sum(axis=0), 1)[:, None]
+    nay_pts = (nay.T @ ideal_points) / np.maximum(nay.sum(axis=0), 1)[:, None]
+    return yea_pts, nay_pts
+
+
+def preview_parameters(signs, dims=2, method='svd', bill_iter=3):
+    """PREVIEW_METHODS 의 좌표에서 시작하는 Parameters (기본 beta/가중치).
+
+    의원 좌표는 고정하고 결과 좌표만 찬성/반대 평균에서 bill_iter 번 scoring 해서 예측을 맞춘다.
+    """
+    ideal = PREVIEW_METHODS[method](signs, dims)
+    yea_pts, nay_pts = initial_bill_points(signs, ideal)
+    params = Parameters(ideal, yea_pts, nay_pts, DEFAULT_BETA, np.full(dims, DEFAULT_WEIGHT))
+    if bill_iter:
+        params, _ = _bill_step(params, signs, np.ones(signs.shape[1]), bill_iter)
+    return params
+
+
+def _stability(previous, current):
+    """연속된 두 반복의 좌표 상관계수 중 가장 작은 값. 의원 좌표와 법안 중점의 차원별로 구한다."""
+    lowest = 1.0
+    pairs = [(previous.ideal_points, current.ideal_points),
+             ((previous.yea_points + previous.nay_points) / 2, (current.yea_points + current.nay_points) / 2)]
+    for before, after in pairs:
+        for k in range(before.shape[1]):
+            if np.array_equal(before[:, k], after[:, k]):
+                continue
+            lowest = min(lowest, np.corrcoef(before[:, k], after[:, k])[0, 1])
+    return lowest
+
+
+def add_dimension(params, signs):
+    """추정된 모수에 차원을 하나 더한 시작값.
+
+    현재 모형의 잔차(관측 셀의 찬성 여부 - 찬성 확률, 법안별 중심화)의 첫 주성분을 새 좌표로 쓰고,
+    크기는 마지막 차원 표준편차의 절반으로 맞춘다. 부호 행렬의 선형 근사(SVD, 고유분해)는 첫 차원의
+    휘어짐(x_1^2 꼴)을 두 번째 성분으로 잡는 경우가 많아 그대로 시작하면 둘째 차원이 무너진다.
+    """
+    n, m = signs.shape
+    dims = params.ideal_points.shape[1]
+    chunk = max(1, MAX_CHUNK_CELLS // max(1, n * dims))
+    gram = np.zeros((n, n))
+    for start in range(0, m, chunk):
+        cols = slice(start, start + chunk)
+        s = signs[:, cols]
+        residual = np.where(s != 0, (s > 0) - norm_cdf(utility_difference(params, cols)), 0.0)
+        residual -= residual.mean(axis=0)
+        gram += residual @ residual.T
+    component = np.linalg.eigh(gram)[1][:, -1]
+    component *= 0.5 * params.ideal_points[:, -1].std() / max(component.std(), 1e-12)
+    ideal = _project_ball(np.column_stack([params.ideal_points, component]))
+    yea_pts, nay_pts = initial_bill_points(signs, ideal)
+    return _fill_ball(Parameters(ideal, yea_pts, nay_pts, params.beta,
+                                 np.append(params.weights, params.weights[-1])))
+
+
+def fit(signs, dims=2, init=None, max_iter=DEFAULT_MAX_ITER, tol=DEFAULT_TOL, inner_iter=3, verbose=False):
+    """의원 x 법안 부호 행렬(1 찬성 / -1 반대 / 0 결측)에 대해 모수를 추정한다.
+
+    R 의 wnominate 처럼 모수의 변화로 수렴을 판단한다. 연속된 두 반복에서 의원 좌표와 법안 중점의 상관계수가
+    모든 차원에서 1 - tol 이상이면 멈춘다 (로그 우도의 상대 변화는 좌표가 아직 움직이는 동안에도 작아진다).
+    init 으로 Parameters 를 주면 그 값에서 시작한다(부트스트랩, 구간 재추정 등의 warm start).
+    init 이 없으면 1차원부터 차례로 추정하며, 차원마다 add_dimension 으로 다음 차원의 시작값을 만든다.
+    max_iter 는 이 단계들을 합한 반복 상한이다.
+    반환값은 (Parameters, 로그 우도, 반복 횟수).
+    """
+    iteration = 0
+    if init is not None:
+        params = init.copy()
+    elif dims == 1:
+        ideal = initial_ideal_points(signs, 1)
+        yea_pts, nay_pts = initial_bill_points(signs, ideal)
+        params = _fill_ball(Parameters(ideal, yea_pts, nay_pts, DEFAULT_BETA, np.full(1, DEFAULT_WEIGHT)))
+    else:
+        params, _, iteration = fit(signs, dims - 1, max_iter=max_iter, tol=tol, inner_iter=inner_iter,
+                                   verbose=verbose)
+        params = add_dimension(params, signs)
+        if verbose:
+            print(f"  {dims}차원 추정 시작 ({dims - 1}차원 {iteration}회 반복)")
+
+    n, m = signs.shape
+    leg_damping = np.ones(n)
+    bill_damping = np.ones(m)
+    util_damping = np.ones(1)
+    loglik = evaluate(params, signs)['leg_ll'].sum()
+
+    while iteration < max_iter:
+        iteration += 1
+        previous = params
+        params, bill_damping = _bill_step(params, signs, bill_damping, inner_iter)
+        params, leg_damping = _legislator_step(params, signs, leg_damping, inner_iter)
+        params, util_damping = _utility_step(params, signs, util_damping, inner_iter)
+        params = _fill_ball(params)
+
+        loglik = evaluate(params, signs)['leg_ll'].sum()
+        stability = _stability(previous, params)
+        if verbose:
+            print(f"  반복 {iteration}: 로그 우도 {loglik:.3f}, 좌표 상관계수 {stability:.6f} "
+                  f"(beta={params.beta:.3f}, w={np.round(params.weights, 3)})")
+        if stability >= 1 - tol:
+            break
+    return params, loglik, iteration
+
+
+def apply_polarity(params, polarity):
+    """polarity[k] 번 의원의 k 차원 좌표가 양수가 되도록 축 방향을 맞춘다 (wnominate 의 polarity)."""
+    for k, index in enumerate(polarity[:params.ideal_points.shape[1]]):
+        if params.ideal_points[index, k] < 0:
+            params.ideal_points[:, k] *= -1
+            params.yea_points[:, k] *= -1
+            params.nay_points[:, k] *= -1
+    return params
+
+
+def classification(params, signs):
+    """의원별 (correctYea, wrongYea, wrongNay, correctNay, 로그 우도) 와 법안별 예측 오류 수."""
+    correct_yea = np.zeros(signs.shape[0], dtype=np.int64)
+    wrong_yea = np.zeros_like(correct_yea)
+    wrong_nay = np.zeros_like(correct_yea)
+    correct_nay = np.zeros_like(correct_yea)
+    bill_errors = np.zeros(signs.shape[1], dtype=np.int64)
+    n, dims = params.ideal_points.shape
+    chunk = max(1, MAX_CHUNK_CELLS // max(1, n * dims))
+    for start in range(0, signs.shape[1], chunk):
+        cols = slice(start, start + chunk)
+        s = signs[:, cols]
+        u = utility_difference(params, cols)
+        predicted_yea = u > 0
+        correct_yea += ((s > 0) & predicted_yea).sum(axis=1)
+        wrong_yea += ((s < 0) & predicted_yea).sum(axis=1)      # 찬성으로 예측했으나 실제 반대
+        wrong_nay += ((s > 0) & ~predicted_yea).sum(axis=1)     # 반대로 예측했으나 실제 찬성
+        correct_nay += ((s < 0) & ~predicted_yea).sum(axis=1)
+        bill_errors[cols] = (((s < 0) & predicted_yea) | ((s > 0) & ~predicted_yea)).sum(axis=0)
+    return correct_yea, wrong_yea, wrong_nay, correct_nay, bill_errors
+
+
+def utility_difference(params, cols=slice(None)):
+    return _cell_terms(params, cols)[-1]
+
+
+def fit_statistics(params, signs):
+    """전체 적합도: 분류 정확도, APRE, GMP."""
+    cy, wy, wn, cn, bill_errors = classification(params, signs)
+    total = (signs != 0).sum()
+    minority = np.minimum((signs > 0).sum(axis=0), (signs < 0).sum(axis=0))
+    loglik = evaluate(params, signs)['leg_ll'].sum()
+    return {
+        'classification': float((cy + cn).sum() / total),
+        'APRE': float((minority.sum() - bill_errors.sum()) / max(minority.sum(), 1)),
+        'GMP': float(np.exp(loglik / total)),
+        'loglik': float(loglik),
+    }
+
+
+@dataclass
+class WNominateResult:
+    params: Parameters
+    member_ids: np.ndarray       # 입력 행렬의 모든 의원 (제외된 의원 포함)
+    bill_ids: np.ndarray         # 추정에 사용한 법안
+    legislator_mask: np.ndarray  # member_ids 중 추정에 포함된 의원
+    signs: np.ndarray            # 추정에 사용한 의원 x 법안 부호 행렬
+    loglik: float
+    iterations: int
+    polarity: list = None                # 차원별 기준 의원 (포함된 의원 기준 번호)
+    standard_errors: np.ndarray = None   # 부트스트랩으로 채워짐 (포함된 의원 x 차원)
+    correlations: np.ndarray = None      # 부트스트랩으로 채워짐 (포함된 의원 x 차원 쌍)
+
+    @property
+    def dims(self):
+        return self.params.ideal_points.shape[1]
+
+    def summary(self):
+        return fit_statistics(self.params, self.signs)
+
+    def legislator_table(self, parties=None, names=None):
+        """wnominate_results.csv 와 같은 열의 데이터프레임. 제외된 의원은 NaN 으로 남는다."""
+        n_all = len(self.member_ids)
+        dims = self.dims
+        included = np.flatnonzero(self.legislator_mask)
+
+        def expand(values):
+            full = np.full(n_all, np.nan)
+            full[included] = values
+            return full
+
+        cy, wy, wn, cn, _ = classification(self.params, self.signs)
+        leg_ll = evaluate(self.params, self.signs)['leg_ll']
+        votes = np.maximum((self.signs != 0).sum(axis=1), 1)
+
+        table = pd.DataFrame({
+            'party': parties if parties is not None else ['Unknown'] * n_all,
+            'name': names if names is not None else ['Unknown'] * n_all,
+            'correctYea': expand(cy),
+            'wrongYea': expand(wy),
+            'wrongNay': expand(wn),
+            'correctNay': expand(cn),
+            'GMP': expand(np.exp(leg_ll / votes)),
+            'CC': expand((cy + cn) / votes),
+        })
+        for k in range(dims):
+            table[f'coord{k + 1}D'] = expand(self.params.ideal_points[:, k])
+        for k in range(dims):
+            se = self.standard_errors[:, k] if self.standard_errors is not None else np.zeros(len(included))
+            table[f'se{k + 1}D'] = expand(se)
+        n_pairs = dims * (dims - 1) // 2
+        for p in range(n_pairs):
+            corr = self.correlations[:, p] if self.correlations is not None else np.zeros(len(included))
+            table[f'corr.{p + 1}'] = expand(corr)
+        return table
+
+
+def check_filtered(filtered, matrix, dims, lop, minvotes):
+    """lop/minvotes 필터 뒤에 dims 차원을 추정할 만큼 법안과 의원이 남았는지 확인한다 (아니면 ValueError)."""
+    n_bills, n_members = filtered.shape
+    if n_bills <= dims or n_members <= dims:
+        raise ValueError(f"필터(lop={lop}, minvotes={minvotes}) 후 법안 {n_bills}/{matrix.shape[0]}건, "
+                         f"의원 {n_members}/{matrix.shape[1]}명만 남아 {dims}차원을 추정할 수 없습니다 "
+                         f"(법안과 의원 모두 {dims + 1} 이상 필요).")
+
+
+def _prepare(matrix, lop, minvotes, dims):
+    """(걸러낸 VoteMatrix, 포함된 의원 마스크, 의원 x 법안 부호 행렬)."""
+    filtered = matrix.filter(lop=lop, minvotes=minvotes)
+    check_filtered(filtered, matrix, dims, lop, minvotes)
+    member_pos = {member_id: j for j, member_id in enumerate(matrix.member_ids)}
+    legislator_mask = np.zeros(len(matrix.member_ids), dtype=bool)
+    legislator_mask[[member_pos[member_id] for member_id in filtered.member_ids]] = True
+    return filtered, legislator_mask, sign_matrix(filtered.votes)
+
+
+def _result(matrix, filtered, legislator_mask, signs, params, loglik, iterations, polarity):
+    included = np.flatnonzero(legislator_mask)
+    polarity = polarity if polarity is not None else [0] * params.ideal_points.shape[1]
+    polarity = [int(np.searchsorted(included, p)) if legislator_mask[p] else 0 for p in polarity]
+    params = apply_polarity(params, polarity)
+    return WNominateResult(params, np.asarray(matrix.member_ids), np.asarray(filtered.bill_ids),
+                           legislator_mask, signs, loglik, iterations, polarity)
+
+
+def wnominate(matrix, dims=2, lop=DEFAULT_LOP, minvotes=DEFAULT_MINVOTES, polarity=None, init=None,
+              max_iter=DEFAULT_MAX_ITER, tol=DEFAULT_TOL, verbose=False):
+    """VoteMatrix 에 W-NOMINATE 를 적합한다.
+
+    polarity 는 차원별 기준 의원의 열 번호(입력 행렬 기준)이며, 기본값은 R 의 polarity=c(1,1) 처럼
+    첫 번째 의원이다. 기준 의원이 제외되었으면 포함된 의원 중 첫 번째를 쓴다.
+    init 에는 Parameters 나 같은 lop/minvotes 로 만든 preview() 결과를 줄 수 있다.
+    필터 뒤에 남은 법안이나 의원이 dims 이하이면 ValueError 를 낸다.
+    """
+    filtered, legislator_mask, signs = _prepare(matrix, lop, minvotes, dims)
+    if isinstance(init, WNominateResult):
+        init = init.params
+    params, loglik, iterations = fit(signs, dims=dims, init=init, max_iter=max_iter, tol=tol, verbose=verbose)
+    return _result(matrix, filtered, legislator_mask, signs, params, loglik, iterations, polarity)
+
+
+def preview(matrix, dims=2, lop=DEFAULT_LOP, minvotes=DEFAULT_MINVOTES, polarity=None, method='svd'):
+    """반복 추정 없이 근사 좌표만 구한다 (iterations=0). wnominate() 와 같은 필터/부호/polarity 를 쓴다.
+
+    method: 'svd' (부호 행렬의 절단 SVD) 또는 'eigen' (이중 중심화한 일치율 행렬의 고유분해, fit 의 기본 시작값).
+    """
+    filtered, legislator_mask, signs = _prepare(matrix, lop, minvotes, dims)
+    params = preview_parameters(signs, dims, method)
+    loglik = evaluate(params, signs)['leg_ll'].sum()
+    return _result(matrix, filtered, legislator_mask, signs, params, loglik, 0, polarity)
+
+
+def load_reference(reference_csv, member_ids=None):
+    """비교 기준 결과표를 MEMBER_NO 색인으로 읽는다.
+
+    R 결과(wnominate_results.csv)에는 의원 ID 열이 없다. 행 순서가 투표 행렬의 의원(열) 순서이므로
+    그 순서의 member_ids 를 붙이고, 행 수가 다르면 맞출 수 없으므로 ValueError 를 낸다.
+    """
+    reference = pd.read_csv(reference_csv, dtype={'MEMBER_NO': str})
+    if 'MEMBER_NO' not in reference.columns:
+        if member_ids is None or len(member_ids) != len(reference):
+            raise ValueError(f"'{reference_csv}'에 MEMBER_NO 열이 없고 행 수({len(reference)})가 "
+                             f"의원 수({0 if member_ids is None else len(member_ids)})와 달라 의원을 맞출 수 없습니다.")
+        reference.insert(0, 'MEMBER_NO', member_ids)
+    reference['MEMBER_NO'] = normalize_member_no(reference['MEMBER_NO'])
+    return reference.set_index('MEMBER_NO')
+
+
+def compare_with_reference(table, reference_csv, member_ids=None):
+    """기준 결과(R 의 wnominate_results.csv)와 의원 ID 로 맞춰 좌표 상관계수, CC 차이를 비교한다.
+
+    table 에는 MEMBER_NO 열이 있어야 한다. member_ids 는 load_reference 참고.
+    """
+    reference = load_reference(reference_csv, member_ids)
+    table = table.assign(MEMBER_NO=normalize_member_no(table['MEMBER_NO'])).set_index('MEMBER_NO')
+    joined = table.join(reference, how='inner', rsuffix='_ref')
+    report = {}
+    for column in [c for c in table.columns if c.startswith('coord') and c in reference.columns]:
+        pair = joined[[column, f'{column}_ref']].dropna()
+        report[column] = float(np.corrcoef(pair[column], pair[f'{column}_ref'])[0, 1])
+    pair = joined[['CC', 'CC_ref']].dropna()
+    report['CC_mean_abs_diff'] = float((pair['CC'] - pair['CC_ref']).abs().mean())
+    return report
+
+
+def _load_inputs(config):
+    """(VoteMatrix, member_ids 순서의 의원 정보 표)."""
+    data_dir = config.analysis_dir
+    matrix = VoteMatrix.from_csv(os.path.join(data_dir, "vote_table_num.csv"))
+    registry = MemberRegistry.from_csv(os.path.join(data_dir, "member_no_party.csv"))
+    print(registry.report(matrix.member_ids))
+    return matrix, registry.resolve(matrix.member_ids)
+
+
+def run(config=None, dims=2, bootstrap_trials=0, workers=None, warm_start=None):
+    """analysis_dir 의 vote_table_num.csv / member_no_party.csv 로 추정하고 wnominate_results_py.csv 에 저장한다.
+
+    R 결과(wnominate_results.csv)가 있으면 좌표를 비교해 출력한다.
+
+    warm_start 에 PREVIEW_METHODS 의 이름을 주면 그 근사 좌표에서 추정을 시작한다.
+    """
+    config = config or Config.from_env()
+    output_csv = os.path.join(config.analysis_dir, RESULTS_CSV)
+    reference_csv = os.path.join(config.analysis_dir, REFERENCE_CSV)
+
+    print("데이터 로드 및 준비 중...")
+    matrix, members = _load_inputs(config)
+
+    print("W-NOMINATE 분석 실행 중...")
+    start = time.perf_counter()
+    init = None
+    if warm_start:
+        init = preview(matrix, dims=dims, method=warm_start)
+        print(f"{warm_start} 근사 좌표에서 시작 ({time.perf_counter() - start:.2f}초)")
+    result = wnominate(matrix, dims=dims, init=init, verbose=True)
+    elapsed = time.perf_counter() - start
+
+    if bootstrap_trials:
+        from .wnominate_bootstrap import bootstrap
+        print(f"\n부트스트랩 표준오차 계산 중... ({bootstrap_trials}회)")
+        bootstrap(result, n_trials=bootstrap_trials, max_workers=workers)
+
+    summary = result.summary()
+    print(f"\n의원 수: {result.legislator_mask.sum()}명 ({(~result.legislator_mask).sum()}명 제외)")
+    print(f"표결 수: {len(result.bill_ids)}건 ({matrix.shape[0] - len(result.bill_ids)}건 제외)")
+    print(f"beta: {result.params.beta:.3f}, 가중치: {np.round(result.params.weights, 3)}")
+    print(f"정확도: {summary['classification']:.4f}, APRE: {summary['APRE']:.3f}, GMP: {summary['GMP']:.3f}")
+    print(f"추정 시간: {elapsed:.2f}초 ({result.iterations}회 반복)")
+
+    table = result.legislator_table(members['POLY_NM'].to_numpy(), members['HG_NM'].to_numpy())
+    table.insert(0, 'MEMBER_NO', result.member_ids)
+    if os.path.exists(reference_csv):
+        print("\nR 결과와 비교 (의원 ID 기준):")
+        for key, value in compare_with_reference(table, reference_csv, matrix.member_ids).items():
+            print(f"  - {key}: {value:.4f}")
+
+    table.to_csv(output_csv, index=False)
+    print(f"\n분석 완료. 결과가 '{output_csv}'에 저장되었습니다.")
+    return result
+
+
+def run_preview(config=None, dims=2, method='svd', output_csv=None):
+    """근사 좌표만 구해 wnominate_results_py.csv 와 같은 열로 wnominate_preview.csv 에 저장한다."""
+    config = config or Config.from_env()
+    output_csv = output_csv or os.path.join(config.analysis_dir, "wnominate_preview.csv")
+    matrix, members = _load_inputs(config)
+
+    start = time.perf_counter()
+    result = preview(matrix, dims=dims, method=method)
+    elapsed = time.perf_counter() - start
+    summary = result.summary()
+    print(f"{method} 근사 좌표: 의원 {result.legislator_mask.sum()}명, 표결 {len(result.bill_ids)}건 ({elapsed:.3f}초)")
+    print(f"정확도: {summary['classification']:.4f}, APRE: {summary['APRE']:.3f}, GMP: {summary['GMP']:.3f}")
+
+    table = result.legislator_table(members['POLY_NM'].to_numpy(), members['HG_NM'].to_numpy())
+    table.insert(0, 'MEMBER_NO', result.member_ids)
+    reference_csv = os.path.join(config.analysis_dir, REFERENCE_CSV)
+    if os.path.exists(reference_csv):
+        print("R 결과와 비교 (의원 ID 기준):")
+        for key, value in compare_with_reference(table, reference_csv, matrix.member_ids).items():
+            print(f"  - {key}: {value:.4f}")
+    table.to_csv(output_csv, index=False)
+    print(f"결과가 '{output_csv}'에 저장되었습니다.")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="W-NOMINATE 추정 (R 없이 실행)")
+    parser.add_argument('--dims', type=int, default=2)
+    parser.add_argument('--bootstrap', type=int, default=0, metavar='TRIALS',
+                        help="부트스트랩 시행 수 (0 이면 표준오차를 계산하지 않음)")
+    parser.add_argument('--workers', type=int, default=None, help="부트스트랩 작업 프로세스 수")
+    parser.add_argument('--preview', choices=sorted(PREVIEW_METHODS), help="근사 좌표만 구해 wnominate_preview.csv 에 저장")
+    parser.add_argument('--warm-start', choices=sorted(PREVIEW_METHODS), help="근사 좌표에서 추정 시작")
+    args = parser.parse_args()
+    if args.preview:
+        run_preview(Config.from_env(), dims=args.dims, method=args.preview)
+    else:
+        run(Config.from_env(), dims=args.dims, bootstrap_trials=args.bootstrap, workers=args.workers,
+            warm_start=args.warm_start)
+
+
+if __name__ == "__main__":
+    main()
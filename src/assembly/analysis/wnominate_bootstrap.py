@@ -0,0 +1,126 @@
+"""
+W-NOMINATE 모수적 부트스트랩
+추정된 모형의 찬성 확률로 표결을 다시 뽑아 재추정하는 과정을 여러 번 반복해 의원 좌표의
+표준오차(se1D, se2D ...)와 차원 간 상관계수(corr.1 ...)를 구한다.
+
+각 시행은 프로세스 풀에서 병렬로 실행한다. 관측 여부와 찬성 확률 행렬은 공유 메모리에 한 번만
+올려 두고 작업 프로세스가 복사 없이 읽으며, 시행마다 SeedSequence 로 만든 독립 시드를 써서
+작업자 수와 관계없이 같은 결과가 나온다. 재추정은 점 추정값에서 시작(warm start)한다.
+
+재추정은 점 추정과 같은 수렴 기준(DEFAULT_MAX_ITER, DEFAULT_TOL)으로 끝까지 돌린다. 반복 상한에서 멈춘
+시행은 점 추정값에 가까이 남아 표준오차를 작게 만들므로, 그런 시행이 MAX_CAPPED_SHARE 를 넘으면
+표준오차를 채우지 않는다.
+"""
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import combinations
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from .wnominate import DEFAULT_MAX_ITER, DEFAULT_TOL, apply_polarity, fit, norm_cdf, utility_difference
+
+DEFAULT_TRIALS = 100
+DEFAULT_SEED = 20240530
+# 반복 상한에 걸린 시행이 이 비율을 넘으면 표준오차를 내지 않는다
+MAX_CAPPED_SHARE = 0.5
+
+# 작업 프로세스마다 한 번 연결하는 공유 메모리 (initializer 에서 채움)
+_worker = {}
+
+
+def to_shared(array):
+    """array 를 공유 메모리에 복사하고 (블록, 작업 프로세스에 넘길 spec) 을 돌려준다. 다 쓰면 unlink 한다."""
+    block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+    view = np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)
+    view[:] = array
+    return block, (block.name, array.shape, array.dtype.str)
+
+
+def attach_shared(spec):
+    name, shape, dtype = spec
+    block = shared_memory.SharedMemory(name=name)
+    return block, np.ndarray(shape, dtype=np.dtype(dtype), buffer=block.buf)
+
+
+def _init_worker(observed_spec, prob_spec, params, polarity):
+    observed_block, observed = attach_shared(observed_spec)
+    prob_block, prob = attach_shared(prob_spec)
+    # 블록 객체를 함께 보관해야 배열이 가리키는 메모리가 닫히지 않는다
+    _worker.update(blocks=(observed_block, prob_block), observed=observed, prob=prob,
+                   params=params, polarity=polarity)
+
+
+def simulate_signs(observed, prob, rng):
+    """관측된 셀마다 찬성 확률 prob 로 찬성(1)/반대(-1)를 뽑는다. 관측되지 않은 셀은 0."""
+    draws = np.where(rng.random(prob.shape) < prob, 1, -1).astype(np.int8)
+    return np.where(observed, draws, 0).astype(np.int8)
+
+
+def run_trial(seed_seq, max_iter=DEFAULT_MAX_ITER, tol=DEFAULT_TOL):
+    """부트스트랩 시행 하나. 작업 프로세스에서 실행되며 (재추정한 의원 좌표, 반복 횟수)를 돌려준다."""
+    rng = np.random.default_rng(seed_seq)
+    signs = simulate_signs(_worker['observed'], _worker['prob'], rng)
+    params, _, iterations = fit(signs, dims=_worker['params'].ideal_points.shape[1], init=_worker['params'],
+                                max_iter=max_iter, tol=tol)
+    return apply_polarity(params, _worker['polarity']).ideal_points, iterations
+
+
+def summarize(trials):
+    """(시행 수, 의원 수, 차원) 좌표로 의원별 표준오차와 차원 쌍별 상관계수를 계산한다."""
+    standard_errors = trials.std(axis=0, ddof=1)
+    pairs = list(combinations(range(trials.shape[2]), 2))
+    correlations = np.zeros((trials.shape[1], len(pairs)))
+    centered = trials - trials.mean(axis=0)
+    for p, (a, b) in enumerate(pairs):
+        cov = (centered[:, :, a] * centered[:, :, b]).sum(axis=0) / (len(trials) - 1)
+        denom = standard_errors[:, a] * standard_errors[:, b]
+        correlations[:, p] = np.divide(cov, denom, out=np.zeros_like(cov), where=denom > 0)
+    return standard_errors, correlations
+
+
+def bootstrap(result, n_trials=DEFAULT_TRIALS, max_workers=None, seed=DEFAULT_SEED,
+              max_iter=DEFAULT_MAX_ITER, tol=DEFAULT_TOL, verbose=True):
+    """WNominateResult 에 부트스트랩 표준오차와 상관계수를 채워 넣고 그대로 돌려준다.
+
+    반복 상한(max_iter)에 걸린 시행이 MAX_CAPPED_SHARE 를 넘으면 표준오차를 채우지 않고 경고만 출력한다.
+    """
+    if n_trials < 2:
+        raise ValueError("부트스트랩 시행 수는 2 이상이어야 합니다.")
+    max_workers = max_workers or os.cpu_count() or 1
+
+    observed = result.signs != 0
+    prob = norm_cdf(utility_difference(result.params))
+    seeds = np.random.SeedSequence(seed).spawn(n_trials)
+
+    observed_block, observed_spec = to_shared(observed)
+    prob_block, prob_spec = to_shared(prob)
+    start = time.perf_counter()
+    try:
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker,
+                                 initargs=(observed_spec, prob_spec, result.params, result.polarity)) as executor:
+            trials = []
+            capped = 0
+            # map 은 입력 순서대로 결과를 돌려주므로 작업자 수가 달라도 결과가 같다
+            for i, (ideal_points, iterations) in enumerate(
+                    executor.map(run_trial, seeds, [max_iter] * n_trials, [tol] * n_trials), 1):
+                trials.append(ideal_points)
+                capped += iterations >= max_iter
+                if verbose and (i % 10 == 0 or i == n_trials):
+                    print(f"  부트스트랩 {i}/{n_trials} ({time.perf_counter() - start:.1f}초, "
+                          f"반복 상한 도달 {capped}회)")
+    finally:
+        for block in (observed_block, prob_block):
+            block.close()
+            block.unlink()
+
+    if capped > MAX_CAPPED_SHARE * n_trials:
+        print(f"경고: 부트스트랩 {n_trials}회 중 {capped}회가 수렴 전에 반복 상한({max_iter}회)에 걸려 "
+              f"표준오차를 계산하지 않습니다.")
+        result.standard_errors = result.correlations = None
+        return result
+    if capped:
+        print(f"  반복 상한({max_iter}회)에 걸린 시행: {capped}/{n_trials}회")
+    result.standard_errors, result.correlations = summarize(np.stack(trials))
+    return result
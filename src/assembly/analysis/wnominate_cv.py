@@ -0,0 +1,142 @@
+"""
+W-NOMINATE 차원 수 교차검증
+관측된 표결(찬성/반대) 중 일부를 무작위로 가려 두고 나머지로 1~max_dims 차원 모형을 추정한 뒤,
+가린 표결에 대한 분류 정확도, APRE, GMP 로 차원 수를 비교한다. R 의 wnominate 가 주는 적합도는
+추정에 쓴 표결에 대한 값이라 차원을 늘리면 항상 좋아지지만, 가린 표결에 대한 값은 과적합이면 나빠진다.
+
+(차원, 시드) 조합마다 프로세스 풀에서 따로 추정한다. 부호 행렬은 공유 메모리에 한 번만 올려 두고 작업
+프로세스가 복사 없이 읽으며, 가릴 셀은 작업 프로세스가 시드로 직접 뽑는다. 같은 시드는 차원과 관계없이
+같은 셀을 가리므로 차원 간 비교는 짝지은 비교이고, 작업자 수와 관계없이 같은 결과가 나온다.
+각 추정은 학습용 표결의 SVD 근사 좌표(preview_parameters)에서 시작한다.
+"""
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import product
+
+import numpy as np
+import pandas as pd
+
+from .vote_matrix import DEFAULT_LOP, DEFAULT_MINVOTES
+from .wnominate import DEFAULT_MAX_ITER, check_filtered, fit, fit_statistics, preview_parameters, sign_matrix
+from .wnominate_bootstrap import attach_shared, to_shared
+
+DEFAULT_MAX_DIMS = 3
+DEFAULT_SEEDS = 5
+DEFAULT_HOLDOUT = 0.1
+DEFAULT_SEED = 20240530
+
+STATISTICS = ['classification', 'APRE', 'GMP']
+FOLD_COLUMNS = (['DIMS', 'SEED', 'TRAIN_VOTES', 'HELD_OUT_VOTES']
+                + [f'train_{name}' for name in STATISTICS] + [f'test_{name}' for name in STATISTICS]
+                + ['iterations', 'seconds'])
+
+# 작업 프로세스마다 한 번 연결하는 공유 메모리 (initializer 에서 채움)
+_worker = {}
+
+
+def _init_worker(signs_spec):
+    block, signs = attach_shared(signs_spec)
+    _worker.update(block=block, signs=signs)
+
+
+def holdout_mask(signs, fraction, rng):
+    """관측된 셀(찬성/반대) 중 fraction 만큼을 무작위로 고른 bool 마스크."""
+    return (signs != 0) & (rng.random(signs.shape) < fraction)
+
+
+def split_signs(signs, held):
+    """(학습용, 평가용) 부호 행렬. 가린 셀은 학습용에서 결측(0)이 되고 평가용에만 남는다."""
+    return np.where(held, 0, signs).astype(np.int8), np.where(held, signs, 0).astype(np.int8)
+
+
+def run_fold(dims, seed_index, seed_seq, holdout, max_iter):
+    """(차원, 시드) 하나. 작업 프로세스에서 실행되며 FOLD_COLUMNS 의 dict 를 돌려준다."""
+    start = time.perf_counter()
+    signs = _worker['signs']
+    held = holdout_mask(signs, holdout, np.random.default_rng(seed_seq))
+    train, test = split_signs(signs, held)
+
+    params, _, iterations = fit(train, dims=dims, init=preview_parameters(train, dims), max_iter=max_iter)
+    train_stats = fit_statistics(params, train)
+    test_stats = fit_statistics(params, test)
+    row = {'DIMS': dims, 'SEED': seed_index, 'TRAIN_VOTES': int((train != 0).sum()),
+           'HELD_OUT_VOTES': int(held.sum())}
+    row.update({f'train_{name}': train_stats[name] for name in STATISTICS})
+    row.update({f'test_{name}': test_stats[name] for name in STATISTICS})
+    row.update(iterations=iterations, seconds=time.perf_counter() - start)
+    return row
+
+
+def summarize(folds):
+    """차원별 평균과 표준편차 (시드 간)."""
+    columns = [f'{part}_{name}' for part in ('train', 'test') for name in STATISTICS] + ['iterations', 'seconds']
+    summary = folds.groupby('DIMS')[columns].agg(['mean', 'std'])
+    summary.columns = [f'{column}_{stat}' for column, stat in summary.columns]
+    return summary.reset_index()
+
+
+def cross_validate(matrix, max_dims=DEFAULT_MAX_DIMS, n_seeds=DEFAULT_SEEDS, holdout=DEFAULT_HOLDOUT,
+                   lop=DEFAULT_LOP, minvotes=DEFAULT_MINVOTES, max_workers=None, seed=DEFAULT_SEED, max_iter=DEFAULT_MAX_ITER,
+                   verbose=True):
+    """VoteMatrix 를 wnominate() 와 같이 걸러낸 뒤 1~max_dims 차원을 n_seeds 번씩 교차검증한다.
+
+    반환값은 (시행별 표, 차원별 요약 표).
+    """
+    if not 0 < holdout < 1:
+        raise ValueError("holdout 비율은 0 과 1 사이여야 합니다.")
+    filtered = matrix.filter(lop=lop, minvotes=minvotes)
+    check_filtered(filtered, matrix, max_dims, lop, minvotes)
+    signs = sign_matrix(filtered.votes)
+    seeds = np.random.SeedSequence(seed).spawn(n_seeds)
+    tasks = list(product(range(1, max_dims + 1), range(n_seeds)))
+    max_workers = max_workers or min(len(tasks), os.cpu_count() or 1)
+    if verbose:
+        print(f"의원 {signs.shape[0]}명, 표결 {signs.shape[1]}건: 1~{max_dims}차원 x 시드 {n_seeds}개 "
+              f"(표결 {holdout:.0%} 가림, 작업자 {max_workers}개)")
+
+    block, spec = to_shared(signs)
+    start = time.perf_counter()
+    rows = []
+    try:
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker, initargs=(spec,)) as executor:
+            dims_list, seed_list = zip(*tasks)
+            fitted = executor.map(run_fold, dims_list, seed_list, [seeds[i] for i in seed_list],
+                                  [holdout] * len(tasks), [max_iter] * len(tasks))
+            for i, row in enumerate(fitted, 1):
+                rows.append(row)
+                if verbose:
+                    print(f"  {i}/{len(tasks)}: {row['DIMS']}차원 시드 {row['SEED']} - 가린 표결 정확도 "
+                          f"{row['test_classification']:.4f}, GMP {row['test_GMP']:.3f} "
+                          f"({row['iterations']}회 반복, {time.perf_counter() - start:.1f}초)")
+    finally:
+        block.close()
+        block.unlink()
+
+    folds = pd.DataFrame(rows, columns=FOLD_COLUMNS)
+    return folds, summarize(folds)
+
+
+def run(config=None, max_dims=DEFAULT_MAX_DIMS, n_seeds=DEFAULT_SEEDS, holdout=DEFAULT_HOLDOUT, max_workers=None,
+        seed=DEFAULT_SEED):
+    """analysis_dir 의 vote_table_num.csv 로 교차검증하고 wnominate_cv.csv / wnominate_cv_summary.csv 에 저장한다."""
+    from ..config import Config
+    from .vote_matrix import VoteMatrix
+
+    config = config or Config.from_env()
+    matrix = VoteMatrix.from_csv(config.analysis_path("vote_table_num.csv"))
+
+    start = time.perf_counter()
+    folds, summary = cross_validate(matrix, max_dims=max_dims, n_seeds=n_seeds, holdout=holdout,
+                                    max_workers=max_workers, seed=seed)
+    folds_path = config.analysis_path("wnominate_cv.csv")
+    summary_path = config.analysis_path("wnominate_cv_summary.csv")
+    folds.to_csv(folds_path, index=False, encoding='utf-8')
+    summary.to_csv(summary_path, index=False, encoding='utf-8')
+
+    columns = ['DIMS'] + [f'{part}_{name}_mean' for part in ('train', 'test') for name in STATISTICS]
+    print(summary[columns].to_string(index=False, float_format=lambda v: f"{v:.4f}"))
+    best = summary.loc[summary['test_GMP_mean'].idxmax(), 'DIMS']
+    print(f"\n가린 표결 GMP 가 가장 높은 차원: {best}차원")
+    print(f"교차검증 완료 ({time.perf_counter() - start:.1f}초). '{folds_path}', '{summary_path}'에 저장되었습니다.")
+    return folds, summary
@@ -0,0 +1,233 @@
+"""
+구간별 W-NOMINATE 재추정
+표결을 표결일(VOTE_DATE, 없으면 BILL_NO 순서) 기준으로 이동 구간(rolling) 또는 누적 구간(expanding)으로
+나눠 구간마다 W-NOMINATE 를 추정한다. 의원 좌표가 시간에 따라 어떻게 움직이는지 볼 수 있다.
+
+구간 추정은 모두 warm start 로 시작하고, 기준 추정과 같은 수렴 기준(DEFAULT_MAX_ITER, DEFAULT_TOL)까지 반복한다.
+    - chain (기본): 바로 앞 구간의 결과에서 다음 구간을 시작한다 (순서대로 실행, 첫 구간은 처음부터 추정).
+    - anchor: 전체 표결로 한 번 추정한 값에서 각 구간을 시작한다. 구간끼리 서로 의존하지 않으므로
+      프로세스 풀에서 동시에 추정하고, 모든 구간의 축 방향이 기준 추정과 같게 맞춰진다.
+새 본회의 표결이 들어오면 update() 로 직전 결과에서 이어서 추정해 빠르게 갱신한다.
+
+앞 구간(또는 기준 추정)에 없던 의원은 원점에서, 없던 법안은 찬성/반대 의원 평균 좌표에서 시작한다.
+lop/minvotes 필터 뒤에 추정할 만큼 법안이나 의원이 남지 않는 구간은 건너뛰고 알려 준다.
+"""
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from .member_registry import normalize_member_no, parse_vote_date
+from .vote_matrix import DEFAULT_LOP, DEFAULT_MINVOTES
+from .wnominate import (DEFAULT_MAX_ITER, Parameters, check_filtered, fit_statistics, initial_bill_points, sign_matrix,
+                        wnominate)
+
+DEFAULT_WINDOW_SIZE = 200   # 구간 길이 (표결 수, 날짜 기준이면 일수)
+DEFAULT_WINDOW_STEP = 100
+
+SUMMARY_COLUMNS = ['WINDOW', 'START', 'END', 'BILLS', 'MEMBERS', 'classification', 'APRE', 'GMP', 'iterations',
+                   'seconds']
+
+
+def bill_dates(df):
+    """긴 형식 표결 데이터에서 법안별 표결일 (BILL_NO -> Timestamp). 여러 날이면 가장 이른 날."""
+    dates = pd.Series(parse_vote_date(df['VOTE_DATE']).to_numpy(), index=df['BILL_NO'].astype(str).to_numpy())
+    return dates.groupby(level=0).min()
+
+
+def bill_order(matrix, dates=None):
+    """(순서 값, 라벨). 날짜가 있으면 첫 표결일로부터 지난 일수, 없으면 BILL_NO 순위."""
+    if dates is not None:
+        days = pd.to_datetime(pd.Series(matrix.bill_ids).map(dates))
+        if days.notna().all():
+            return (days - days.min()).dt.days.to_numpy(), days.dt.strftime('%Y-%m-%d').to_numpy()
+        print(f"표결일이 없는 법안이 {days.isna().sum()}개 있어 BILL_NO 순서로 나눕니다.")
+    order = np.argsort(np.argsort(matrix.bill_ids, kind='stable'), kind='stable')
+    return order, np.asarray(matrix.bill_ids, dtype=str)
+
+
+def split_windows(order, size=DEFAULT_WINDOW_SIZE, step=DEFAULT_WINDOW_STEP, expanding=False):
+    """구간별 법안 bool 마스크 목록. 구간 i 는 [i*step, i*step + size) (누적이면 [0, i*step + size))."""
+    order = np.asarray(order)
+    end = order.max() + 1
+    windows = []
+    start = 0
+    while True:
+        stop = start + size
+        mask = (order < stop) & (order >= (0 if expanding else start))
+        if mask.any():
+            windows.append(mask)
+        if stop >= end:
+            break
+        start += step
+    return windows
+
+
+def warm_start(params, member_ids, bill_ids, window, lop=DEFAULT_LOP, minvotes=DEFAULT_MINVOTES):
+    """params(member_ids x bill_ids 기준)를 window 의 lop/minvotes 필터 결과 모양에 맞춘 시작값."""
+    filtered = window.filter(lop=lop, minvotes=minvotes)
+    signs = sign_matrix(filtered.votes)
+    dims = params.ideal_points.shape[1]
+
+    ideal = np.zeros((len(filtered.member_ids), dims))
+    source = pd.Index(member_ids).get_indexer(filtered.member_ids)
+    ideal[source >= 0] = params.ideal_points[source[source >= 0]]
+
+    yea_pts, nay_pts = initial_bill_points(signs, ideal)
+    source = pd.Index(bill_ids).get_indexer(filtered.bill_ids)
+    yea_pts[source >= 0] = params.yea_points[source[source >= 0]]
+    nay_pts[source >= 0] = params.nay_points[source[source >= 0]]
+    return Parameters(ideal, yea_pts, nay_pts, float(params.beta), params.weights.copy())
+
+
+def included_ids(result):
+    return result.member_ids[result.legislator_mask]
+
+
+def align(result, reference_ids, reference_points):
+    """공통 의원 좌표의 상관이 음수인 차원은 뒤집어 기준과 축 방향을 맞춘다."""
+    ids = included_ids(result)
+    target = pd.Index(reference_ids).get_indexer(ids)
+    common = target >= 0
+    if common.sum() < 2:
+        return result
+    params = result.params
+    for k in range(params.ideal_points.shape[1]):
+        if np.dot(params.ideal_points[common, k], reference_points[target[common], k]) < 0:
+            params.ideal_points[:, k] *= -1
+            params.yea_points[:, k] *= -1
+            params.nay_points[:, k] *= -1
+    return result
+
+
+def _fit_window(window, init, dims, max_iter):
+    start = time.perf_counter()
+    result = wnominate(window, dims=dims, init=init, max_iter=max_iter)
+    return result, time.perf_counter() - start
+
+
+def _summary(index, result, labels, seconds):
+    stats = fit_statistics(result.params, result.signs)
+    return {'WINDOW': index, 'START': labels[0], 'END': labels[-1], 'BILLS': len(result.bill_ids),
+            'MEMBERS': int(result.legislator_mask.sum()), 'classification': stats['classification'],
+            'APRE': stats['APRE'], 'GMP': stats['GMP'], 'iterations': result.iterations, 'seconds': seconds}
+
+
+def window_table(index, result, members):
+    """구간 하나의 의원 좌표 (WINDOW, MEMBER_NO, party, name, coordND, GMP, CC)."""
+    table = result.legislator_table(members['POLY_NM'].to_numpy(), members['HG_NM'].to_numpy())
+    table.insert(0, 'MEMBER_NO', result.member_ids)
+    table.insert(0, 'WINDOW', index)
+    return table[result.legislator_mask].reset_index(drop=True)
+
+
+def fit_windows(matrix, members, dates=None, size=DEFAULT_WINDOW_SIZE, step=DEFAULT_WINDOW_STEP, expanding=False,
+                dims=2, mode='chain', anchor=None, max_workers=None, max_iter=DEFAULT_MAX_ITER, verbose=True):
+    """구간별로 추정하고 (의원 좌표표, 구간 요약표, 구간별 결과 목록) 을 돌려준다.
+
+    members: matrix.member_ids 순서의 의원 정보 (MemberRegistry.resolve 결과).
+    anchor: mode='anchor' 일 때 쓸 전체 추정 결과 (없으면 여기서 추정).
+    """
+    order, labels = bill_order(matrix, dates)
+    masks = split_windows(order, size, step, expanding)
+    window_labels = [np.sort(labels[mask]) for mask in masks]
+    windows, indices = [], []
+    for i, mask in enumerate(masks):
+        window = matrix.subset(mask)
+        try:
+            check_filtered(window.filter(), window, dims, DEFAULT_LOP, DEFAULT_MINVOTES)
+        except ValueError as e:
+            print(f"  구간 {i} ({window_labels[i][0]} ~ {window_labels[i][-1]})을 건너뜁니다: {e}")
+            continue
+        windows.append(window)
+        indices.append(i)
+    if not windows:
+        raise ValueError("추정할 수 있는 구간이 없습니다. 구간 길이(size)를 늘려 보세요.")
+    if verbose:
+        print(f"{'누적' if expanding else '이동'} 구간 {len(windows)}개 (길이 {size}, 간격 {step}, 방식 {mode}, "
+              f"건너뛴 구간 {len(masks) - len(windows)}개)")
+
+    results = []
+    if mode == 'anchor':
+        if anchor is None:
+            if verbose:
+                print("기준 추정 (전체 표결) 중...")
+            anchor = wnominate(matrix, dims=dims)
+        anchor_ids = included_ids(anchor)
+        inits = [warm_start(anchor.params, anchor_ids, anchor.bill_ids, window) for window in windows]
+        max_workers = max_workers or min(len(windows), os.cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            fitted = executor.map(_fit_window, windows, inits, [dims] * len(windows), [max_iter] * len(windows))
+            for i, (result, seconds) in zip(indices, fitted):
+                results.append((align(result, anchor_ids, anchor.params.ideal_points), seconds))
+                if verbose:
+                    print(f"  구간 {i}: {window_labels[i][0]} ~ {window_labels[i][-1]} ({seconds:.1f}초)")
+    elif mode == 'chain':
+        previous = None
+        for i, window in zip(indices, windows):
+            init = None
+            if previous is not None:
+                init = warm_start(previous.params, included_ids(previous), previous.bill_ids, window)
+            result, seconds = _fit_window(window, init, dims, max_iter)
+            if previous is not None:
+                align(result, included_ids(previous), previous.params.ideal_points)
+            results.append((result, seconds))
+            previous = result
+            if verbose:
+                print(f"  구간 {i}: {window_labels[i][0]} ~ {window_labels[i][-1]} ({seconds:.1f}초)")
+    else:
+        raise ValueError(f"알 수 없는 방식입니다: {mode}")
+
+    member_pos = pd.Index(matrix.member_ids)
+    points, summary = [], []
+    for i, (result, seconds) in zip(indices, results):
+        window_members = members.iloc[member_pos.get_indexer(result.member_ids)].reset_index(drop=True)
+        points.append(window_table(i, result, window_members))
+        summary.append(_summary(i, result, window_labels[i], seconds))
+    return (pd.concat(points, ignore_index=True), pd.DataFrame(summary, columns=SUMMARY_COLUMNS),
+            [result for result, _ in results])
+
+
+def update(previous, matrix, max_iter=DEFAULT_MAX_ITER):
+    """새 표결이 추가된 matrix 를 직전 결과(previous)에서 이어서 추정한다 (축 방향도 previous 에 맞춤)."""
+    init = warm_start(previous.params, included_ids(previous), previous.bill_ids, matrix)
+    result = wnominate(matrix, dims=previous.params.ideal_points.shape[1], init=init, max_iter=max_iter)
+    return align(result, included_ids(previous), previous.params.ideal_points)
+
+
+def run(config=None, size=DEFAULT_WINDOW_SIZE, step=DEFAULT_WINDOW_STEP, expanding=False, by='date', dims=2,
+        mode='chain', max_workers=None):
+    """analysis_dir 의 투표 행렬로 구간별 추정을 하고 wnominate_windows.csv / wnominate_windows_summary.csv 에 저장한다.
+
+    by='date' 이면 data_dir 의 최근 표결 수집 결과에서 표결일을 읽고, 없으면 BILL_NO 순서를 쓴다.
+    """
+    from ..config import Config
+    from .member_registry import MemberRegistry
+    from .vote_matrix import VoteMatrix, load_votes
+
+    config = config or Config.from_env()
+    matrix = VoteMatrix.from_csv(config.analysis_path("vote_table_num.csv"))
+    matrix.member_ids = normalize_member_no(matrix.member_ids)
+    members = MemberRegistry.from_csv(config.analysis_path("member_no_party.csv")).resolve(matrix.member_ids)
+
+    dates = None
+    voting_file = config.latest_votes() if by == 'date' else None
+    if voting_file is not None:
+        votes = load_votes(voting_file)
+        if 'VOTE_DATE' in votes.columns:
+            dates = bill_dates(votes)
+    if by == 'date' and dates is None:
+        print("표결일이 있는 표결 데이터가 없어 BILL_NO 순서로 나눕니다.")
+
+    start = time.perf_counter()
+    points, summary, _ = fit_windows(matrix, members, dates=dates, size=size, step=step, expanding=expanding,
+                                     dims=dims, mode=mode, max_workers=max_workers)
+    points_path = config.analysis_path("wnominate_windows.csv")
+    summary_path = config.analysis_path("wnominate_windows_summary.csv")
+    points.to_csv(points_path, index=False, encoding='utf-8')
+    summary.to_csv(summary_path, index=False, encoding='utf-8')
+    print(summary.to_string(index=False, float_format=lambda v: f"{v:.3f}"))
+    print(f"\n구간별 추정 완료 ({time.perf_counter() - start:.1f}초). '{points_path}', '{summary_path}'에 저장되었습니다.")
+    return points, summary
@@ -0,0 +1,144 @@
+"""
+여러 대수 일괄 수집/분석
+17~22대처럼 여러 국회를 함께 수집하고, 대수별로 투표 행렬을 만들어 W-NOMINATE 를 추정한 뒤
+대수 간에 같은 의원을 연결한 표를 만든다.
+
+- 대수마다 폴더를 따로 쓴다 (Config.for_age: data_dir/<대수>, analysis_dir/<대수>). 매니페스트와
+  API 응답 캐시, 법률안 저장소, 수집 저널도 대수별로 분리되므로 한 대수의 재수집이 다른 대수에 영향을 주지 않는다.
+- 수집은 대수별 파이프라인을 스레드로 동시에 실행한다. 같은 인증키를 쓰는 클라이언트는
+  assembly_api.shared_limiter 의 토큰 버킷 하나를 공유하므로 전체 요청 속도는 대수 수와 관계없이 같다.
+- 행렬/추정은 대수별로 별도 프로세스에서 실행한다 (수집이 끝난 파이프라인을 오프라인으로 이어서 실행).
+- 연결 결과는 기준 analysis_dir 에 member_links.csv (대수별 의원 ↔ PERSON_ID),
+  ideal_points_by_age.csv (대수별 좌표 + PERSON_ID) 로 저장한다. 대수마다 따로 추정한 좌표는
+  같은 척도가 아니므로 비교할 때는 여러 대수에 걸친 의원(TERMS > 1)을 기준으로 맞춰야 한다.
+
+사용 예:
+    assembly batch --ages 17 18 19 20 21 22
+    assembly batch --ages 20 21 --offline --jobs 2
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from .pipeline import BLOCKED, FAILED, default_pipeline
+
+DEFAULT_AGES = ['17', '18', '19', '20', '21', '22']
+
+# 수집 단계 / 분석 단계 (pipeline.default_pipeline 의 단계 이름)
+COLLECT_TARGETS = ['votes', 'vote-stats']
+ANALYZE_TARGETS = ['scale']
+
+
+def _run_pipeline(config, targets, offline, dims, bootstrap):
+    pipeline = default_pipeline(dims=dims, bootstrap=bootstrap)
+    return pipeline.run(config, targets=targets, offline=offline, label=f"[{config.age}대]")
+
+
+def collect(config, ages, max_workers=None, offline=False):
+    """대수별 수집 파이프라인을 스레드로 동시에 실행한다. {대수: {단계: 상태}}"""
+    configs = {age: config.for_age(age) for age in ages}
+    with ThreadPoolExecutor(max_workers=max_workers or len(configs)) as executor:
+        futures = {age: executor.submit(_run_pipeline, cfg, COLLECT_TARGETS, offline, 2, 0)
+                   for age, cfg in configs.items()}
+        return {age: future.result() for age, future in futures.items()}
+
+
+def analyze(config, ages, dims=2, bootstrap=0, max_workers=None):
+    """대수별 행렬/추정 파이프라인을 프로세스로 동시에 실행한다 (수집 단계는 오프라인으로 건너뜀)."""
+    configs = {age: config.for_age(age) for age in ages}
+    max_workers = max_workers or min(len(configs), os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = {age: executor.submit(_run_pipeline, cfg, ANALYZE_TARGETS, True, dims, bootstrap)
+                   for age, cfg in configs.items()}
+        return {age: future.result() for age, future in futures.items()}
+
+
+def _votes_path(config):
+    return config.data_path(f"voting_data_{config.age}_latest.parquet")
+
+
+def load_member_tables(config, ages):
+    """대수별 member_identities 표. 표결 데이터에서 연결에 필요한 열만 읽는다."""
+    import pandas as pd
+    import pyarrow.parquet as pq
+    from .analysis.member_registry import IDENTITY_COLUMNS, member_identities
+
+    tables = {}
+    for age in ages:
+        path = _votes_path(config.for_age(age))
+        if not os.path.exists(path):
+            continue
+        names = set(pq.read_schema(path).names)
+        columns = ['MEMBER_NO', 'POLY_NM', 'HG_NM', 'VOTE_DATE'] + IDENTITY_COLUMNS
+        tables[age] = member_identities(pd.read_parquet(path, columns=[c for c in columns if c in names]))
+    return tables
+
+
+def load_results(config):
+    """대수 하나의 좌표표 (MEMBER_NO 열 포함, 없으면 None).
+
+    R 결과(wnominate_results.csv)를 우선 쓰고, 없으면 Python 추정 결과(wnominate_results_py.csv)를 쓴다.
+    R 결과에는 의원 ID 가 없으므로 vote_table_num.csv 의 의원 열 순서로 붙인다.
+    """
+    import pandas as pd
+    from .analysis.member_registry import normalize_member_no
+    from .analysis.wnominate import REFERENCE_CSV, RESULTS_CSV, load_reference
+
+    reference_path = config.analysis_path(REFERENCE_CSV)
+    matrix_path = config.analysis_path("vote_table_num.csv")
+    if os.path.exists(reference_path) and os.path.exists(matrix_path):
+        member_ids = [str(c) for c in pd.read_csv(matrix_path, nrows=0).columns[1:]]
+        return load_reference(reference_path, member_ids).reset_index()
+    results_path = config.analysis_path(RESULTS_CSV)
+    if not os.path.exists(results_path):
+        return None
+    print(f"{config.age}대 국회: R 결과가 없어 Python 추정 결과('{results_path}')를 씁니다.")
+    results = pd.read_csv(results_path, dtype={'MEMBER_NO': str})
+    results['MEMBER_NO'] = normalize_member_no(results['MEMBER_NO'])
+    return results
+
+
+def combine(config, ages):
+    """대수 간 의원 연결표와 대수별 좌표표를 기준 analysis_dir 에 저장한다. (연결표, 좌표표)"""
+    import pandas as pd
+    from .analysis.member_registry import link_members
+
+    links = link_members(load_member_tables(config, ages))
+    frames = []
+    for age in ages:
+        results = load_results(config.for_age(age))
+        if results is None:
+            continue
+        results.insert(0, 'AGE', str(age))
+        frames.append(results)
+
+    points = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=['AGE', 'MEMBER_NO'])
+    points = points.merge(links[['AGE', 'MEMBER_NO', 'PERSON_ID', 'TERMS']], on=['AGE', 'MEMBER_NO'], how='left')
+
+    os.makedirs(config.analysis_dir, exist_ok=True)
+    links_path = config.analysis_path("member_links.csv")
+    points_path = config.analysis_path("ideal_points_by_age.csv")
+    links.to_csv(links_path, index=False, encoding='utf-8')
+    points.to_csv(points_path, index=False, encoding='utf-8')
+    print(f"의원 연결표: '{links_path}' ({links['PERSON_ID'].nunique()}명, "
+          f"여러 대수에 걸친 의원 {links.loc[links['TERMS'] > 1, 'PERSON_ID'].nunique()}명)")
+    print(f"대수별 좌표표: '{points_path}' ({len(points)}행)")
+    return links, points
+
+
+def run_batch(config, ages=DEFAULT_AGES, dims=2, bootstrap=0, collect_workers=None, analyze_workers=None,
+              offline=False):
+    """수집 → 추정 → 연결. 수집이 실패한 대수는 추정에서 뺀다. {대수: {단계: 상태}}"""
+    ages = [str(age) for age in ages]
+    print(f"{', '.join(ages)}대 국회 일괄 처리 시작...")
+    status = collect(config, ages, max_workers=collect_workers, offline=offline)
+    collected = [age for age in ages if FAILED not in status[age].values() and BLOCKED not in status[age].values()]
+    for age in ages:
+        if age not in collected:
+            print(f"{age}대 국회 수집에 실패해 추정에서 제외합니다.")
+
+    if collected:
+        for age, stages in analyze(config, collected, dims=dims, bootstrap=bootstrap,
+                                   max_workers=analyze_workers).items():
+            status[age].update(stages)
+        combine(config, [age for age in collected if FAILED not in status[age].values()])
+    return status
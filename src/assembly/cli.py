@@ -0,0 +1,286 @@
+"""
+assembly 명령줄 도구
+수집부터 시각화까지 각 단계를 하위 명령으로 실행한다. 하위 명령이 실제로 실행될 때만 해당 모듈
+(numpy/pandas/matplotlib 등)을 불러오므로, --help 나 status/stats 는 표준 라이브러리만으로 바로 끝난다.
+
+사용 예:
+    assembly collect-bills            # 법률안 수집 → data/assembly_bills_21_*.parquet, data/bills.db
+    assembly sync                     # 이전 수집 이후 바뀐 법률안만 가져오기
+    assembly filter                   # 표결 대상 법안 집계
+    assembly collect-votes            # 본회의 표결정보 수집 → data/voting_data_21_*.parquet
+    assembly build-matrix             # 투표 행렬 → src/data/analysis/vote_table_num.csv
+    assembly scale --dims 2 --bootstrap 100
+    assembly scale --preview svd      # 근사 좌표만 → wnominate_preview.csv
+    assembly plot --workers 3
+    assembly windows --size 90 --step 30   # 90일 이동 구간별 재추정 (wnominate_windows.py)
+    assembly cv --max-dims 3 --seeds 5   # 1~3차원 가린 표결 교차검증 (wnominate_cv.py)
+    assembly metrics                  # 의원 일치도, 정당 결속력/일치율 (vote_metrics.py)
+    assembly run                      # 위 단계를 바뀐 것만 이어서 실행 (pipeline.py)
+    assembly batch --ages 20 21 22    # 여러 대수 수집/추정 + 의원 연결 (batch.py)
+    assembly status
+    assembly --age 22 --data-dir data/22 status
+"""
+import argparse
+import json
+import os
+import sqlite3
+import sys
+
+from . import __version__
+from .config import Config
+
+
+def cmd_collect_bills(config, args):
+    from .collection.get_assembly_bill import main
+    main(config)
+
+
+def cmd_sync(config, args):
+    from .collection.bill_sync import main
+    main(config, full=args.full)
+
+
+def cmd_filter(config, args):
+    from .collection.filter_bills import TARGET_RESULTS, main
+    main(config, input_file=args.input, target_results=args.results or TARGET_RESULTS, output_csv=args.output)
+
+
+def cmd_collect_votes(config, args):
+    from .collection.get_voting_data import TARGET_RESULTS, main
+    main(config, max_workers=args.workers, target_results=args.results or TARGET_RESULTS)
+
+
+def cmd_build_matrix(config, args):
+    from .analysis.vote_matrix import main
+    main(config, voting_file=args.input, streaming=args.streaming, batch_size=args.batch_size)
+
+
+def cmd_scale(config, args):
+    from .analysis.wnominate import run, run_preview
+    if args.preview:
+        run_preview(config, dims=args.dims, method=args.preview)
+    else:
+        run(config, dims=args.dims, bootstrap_trials=args.bootstrap, workers=args.workers,
+            warm_start=args.warm_start)
+
+
+def cmd_windows(config, args):
+    from .analysis.wnominate_windows import run
+    run(config, size=args.size, step=args.step, expanding=args.expanding, by=args.by, dims=args.dims,
+        mode=args.mode, max_workers=args.workers)
+
+
+def cmd_cv(config, args):
+    from .analysis.wnominate_cv import run
+    run(config, max_dims=args.max_dims, n_seeds=args.seeds, holdout=args.holdout, max_workers=args.workers,
+        seed=args.seed)
+
+
+def cmd_metrics(config, args):
+    from .analysis.vote_metrics import run
+    run(config, output_dir=args.output_dir)
+
+
+def cmd_plot(config, args):
+    from .analysis.visualize_wnominate import run
+    run(config, input_file=args.input, parties=args.parties, suffix=args.suffix, figures=args.figures,
+        dpi=args.dpi, max_workers=args.workers, force=args.force)
+
+
+def cmd_run(config, args):
+    from .pipeline import FAILED, default_pipeline
+    pipeline = default_pipeline(dims=args.dims, bootstrap=args.bootstrap)
+    status = pipeline.run(config, targets=args.stages, force=args.force, offline=args.offline,
+                          max_workers=args.jobs, dry_run=args.dry_run, profile=args.profile,
+                          metrics_interval=args.metrics_interval)
+    counts = {}
+    for value in status.values():
+        counts[value] = counts.get(value, 0) + 1
+    print("\n파이프라인: " + ", ".join(f"{key} {n}개" for key, n in counts.items()))
+    return 1 if FAILED in counts else 0
+
+
+def cmd_batch(config, args):
+    from .batch import run_batch
+    from .pipeline import FAILED
+    status = run_batch(config, ages=args.ages, dims=args.dims, bootstrap=args.bootstrap,
+                       analyze_workers=args.jobs, offline=args.offline)
+    print()
+    for age, stages in status.items():
+        print(f"{age}대: " + ", ".join(f"{name} {value}" for name, value in stages.items()))
+    return 1 if any(FAILED in stages.values() for stages in status.values()) else 0
+
+
+def _count_lines(path):
+    with open(path, 'rb') as f:
+        return sum(1 for _ in f)
+
+
+def _describe(path):
+    if not os.path.exists(path):
+        return "없음"
+    return f"{os.path.getsize(path) / 1024:.1f} KB"
+
+
+def cmd_status(config, args):
+    print(f"국회 대수: {config.age}")
+    print(f"데이터 폴더: {config.data_dir}")
+    print(f"분석 폴더: {config.analysis_dir}")
+    print(f"API 키 파일: {config.api_key_path} ({'있음' if os.path.exists(config.api_key_path) else '없음'})")
+
+    print("\n수집 데이터:")
+    for label, pattern in (("법률안", f"assembly_bills_{config.age}_*"), ("표결정보", f"voting_data_{config.age}_*")):
+        print(f"- {label}: {config.latest(pattern) or '없음'}")
+    if os.path.exists(config.store_path):
+        # bill_store 를 거치지 않고 바로 센다 (pandas 를 불러오지 않도록)
+        with sqlite3.connect(config.store_path) as conn:
+            total = conn.execute("SELECT COUNT(*) FROM bills").fetchone()[0]
+            age_total = conn.execute("SELECT COUNT(*) FROM bills WHERE AGE = ?", (config.age,)).fetchone()[0]
+        print(f"- 법률안 저장소: {config.store_path} ({total}개, {config.age}대 {age_total}개)")
+    else:
+        print(f"- 법률안 저장소: {config.store_path} (없음)")
+    if os.path.exists(config.journal_path):
+        print(f"- 표결 수집 저널: {config.journal_path} ({_count_lines(config.journal_path)}개 기록)")
+    else:
+        print(f"- 표결 수집 저널: {config.journal_path} (없음)")
+
+    print("\n분석 결과:")
+    for name in ("vote_table_num.csv", "member_no_party.csv", "wnominate_results_py.csv", "wnominate_results.csv"):
+        print(f"- {name}: {_describe(config.analysis_path(name))}")
+    meta_path = os.path.join(config.matrix_cache_dir, 'meta.json')
+    if os.path.exists(meta_path):
+        with open(meta_path, 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        print(f"- 행렬 캐시: {config.matrix_cache_dir} ({' x '.join(map(str, meta.get('shape', [])))})")
+    else:
+        print(f"- 행렬 캐시: {config.matrix_cache_dir} (없음)")
+
+
+def cmd_stats(config, args):
+    from .collection.bill_store import BillStore
+    if not os.path.exists(config.store_path):
+        print(f"법률안 저장소 '{config.store_path}'가 없습니다. 먼저 collect-bills 를 실행하세요.")
+        return 1
+    with BillStore(config.store_path) as store:
+        counts = store.counts(args.by, age=config.age)
+    print(f"{config.age}대 법률안 {args.by}별 개수:")
+    for key, count in counts.items():
+        print(f"- {key}: {count}개")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='assembly', description="국회 표결 데이터 수집 및 W-NOMINATE 분석")
+    parser.add_argument('--version', action='version', version=f"%(prog)s {__version__}")
+    parser.add_argument('--data-dir', help="수집 데이터 폴더 (기본: $ASSEMBLY_DATA_DIR 또는 data)")
+    parser.add_argument('--analysis-dir', help="분석 결과 폴더 (기본: $ASSEMBLY_ANALYSIS_DIR 또는 src/data/analysis)")
+    parser.add_argument('--api-key-file', help="API 키 파일 (기본: $ASSEMBLY_API_KEY_FILE 또는 api_key.txt)")
+    parser.add_argument('--age', help="국회 대수 (기본: $ASSEMBLY_AGE 또는 21)")
+    commands = parser.add_subparsers(dest='command', metavar='COMMAND', required=True)
+
+    commands.add_parser('collect-bills', help="법률안 전체 수집").set_defaults(handler=cmd_collect_bills)
+    sub = commands.add_parser('sync', help="바뀐 법률안만 수집")
+    sub.add_argument('--full', action='store_true',
+                     help="목록 끝까지 읽어 모든 법안의 처리 결과를 비교 (기본: 7일마다 자동)")
+    sub.set_defaults(handler=cmd_sync)
+
+    sub = commands.add_parser('filter', help="표결 대상 법안 거르기")
+    sub.add_argument('--input', help="저장소에 먼저 불러올 법률안 CSV/Parquet")
+    sub.add_argument('--result', nargs='+', dest='results', default=None, help="처리 결과 (기본: 원안가결 수정가결 부결)")
+    sub.add_argument('--output', help="거른 법안을 저장할 CSV 경로")
+    sub.set_defaults(handler=cmd_filter)
+
+    sub = commands.add_parser('collect-votes', help="본회의 표결정보 수집")
+    sub.add_argument('--workers', type=int, default=8)
+    sub.add_argument('--result', nargs='+', dest='results', default=None, help="처리 결과 (기본: 원안가결 수정가결 부결)")
+    sub.set_defaults(handler=cmd_collect_votes)
+
+    sub = commands.add_parser('build-matrix', help="투표 행렬 만들기")
+    sub.add_argument('--input', help="표결 데이터 파일 (기본: data_dir 의 가장 최근 수집 결과)")
+    sub.add_argument('--streaming', action='store_true', default=None,
+                     help="배치 단위로 나눠 읽어 메모리 맵 행렬에 바로 쓴다 (기본: 256MB 이상인 파일만)")
+    sub.add_argument('--batch-size', type=int, metavar='ROWS', help="스트리밍 때 한 번에 읽는 행 수 (기본 1,000,000)")
+    sub.set_defaults(handler=cmd_build_matrix)
+
+    sub = commands.add_parser('scale', help="W-NOMINATE 추정")
+    sub.add_argument('--dims', type=int, default=2)
+    sub.add_argument('--bootstrap', type=int, default=0, metavar='TRIALS', help="부트스트랩 시행 수")
+    sub.add_argument('--workers', type=int, default=None, help="부트스트랩 작업 프로세스 수")
+    sub.add_argument('--preview', choices=['eigen', 'svd'],
+                     help="반복 추정 없이 근사 좌표만 구해 wnominate_preview.csv 에 저장 (1초 이내)")
+    sub.add_argument('--warm-start', choices=['eigen', 'svd'], help="근사 좌표에서 추정을 시작해 반복 횟수를 줄인다")
+    sub.set_defaults(handler=cmd_scale)
+
+    sub = commands.add_parser('windows', help="표결 구간별 W-NOMINATE 재추정")
+    sub.add_argument('--by', choices=['date', 'bill'], default='date',
+                     help="구간 기준: 표결일(일수) 또는 BILL_NO 순서(표결 수)")
+    sub.add_argument('--size', type=int, default=200, help="구간 길이 (일수 또는 표결 수)")
+    sub.add_argument('--step', type=int, default=100, help="구간 간격")
+    sub.add_argument('--expanding', action='store_true', help="처음부터 누적하는 구간")
+    sub.add_argument('--mode', choices=['chain', 'anchor'], default='chain',
+                     help="chain: 앞 구간에서 이어서 순서대로 / anchor: 전체 추정에서 시작해 구간 병렬")
+    sub.add_argument('--dims', type=int, default=2)
+    sub.add_argument('--workers', type=int, default=None)
+    sub.set_defaults(handler=cmd_windows)
+
+    sub = commands.add_parser('cv', help="차원 수별 가린 표결 교차검증")
+    sub.add_argument('--max-dims', type=int, default=3, help="1 부터 이 차원까지 비교")
+    sub.add_argument('--seeds', type=int, default=5, help="차원마다 가릴 표결을 바꿔 뽑는 횟수")
+    sub.add_argument('--holdout', type=float, default=0.1, help="가릴 표결 비율")
+    sub.add_argument('--seed', type=int, default=20240530)
+    sub.add_argument('--workers', type=int, default=None)
+    sub.set_defaults(handler=cmd_cv)
+
+    sub = commands.add_parser('metrics', help="의원 일치도와 정당 결속력/일치율 지표")
+    sub.add_argument('--output-dir', default=None, help="저장 폴더 (기본: analysis_dir)")
+    sub.set_defaults(handler=cmd_metrics)
+
+    sub = commands.add_parser('plot', help="W-NOMINATE 결과 시각화")
+    sub.add_argument('--input', help="결과 CSV (기본: analysis_dir/wnominate_results.csv, 없으면 wnominate_results_py.csv)")
+    sub.add_argument('--parties', nargs='+', default=['더불어민주당', '국민의힘', '정의당'])
+    sub.add_argument('--suffix', default='3parties')
+    sub.add_argument('--figures', nargs='+', choices=['distribution', 'boxplot', 'performance'])
+    sub.add_argument('--dpi', type=int, default=300)
+    sub.add_argument('--workers', type=int, default=None)
+    sub.add_argument('--force', action='store_true', help="바뀌지 않은 그림도 다시 그린다")
+    sub.set_defaults(handler=cmd_plot)
+
+    sub = commands.add_parser('run', help="바뀐 단계만 다시 실행하는 전체 파이프라인")
+    sub.add_argument('stages', nargs='*', help="여기까지 필요한 단계만 실행 (기본: 전체)")
+    sub.add_argument('--force', nargs='+', default=[], metavar='STAGE', help="변경이 없어도 다시 실행할 단계")
+    sub.add_argument('--offline', action='store_true', help="API 동기화 없이 기존 수집 결과로 실행")
+    sub.add_argument('--dry-run', action='store_true', help="실행할 단계만 출력")
+    sub.add_argument('--jobs', type=int, default=2, help="동시에 실행할 단계 수")
+    sub.add_argument('--dims', type=int, default=2)
+    sub.add_argument('--bootstrap', type=int, default=0, metavar='TRIALS')
+    sub.add_argument('--profile', choices=['cprofile', 'sample'], default=None,
+                     help="실행한 단계마다 data_dir/profiles/ 에 프로파일 저장")
+    sub.add_argument('--metrics-interval', type=float, default=30.0, metavar='SECONDS',
+                     help="data_dir/metrics/pipeline.json, .prom 을 다시 쓰는 간격 (0 이면 끝날 때만)")
+    sub.set_defaults(handler=cmd_run)
+
+    sub = commands.add_parser('batch', help="여러 대수 일괄 수집/추정과 대수 간 의원 연결")
+    sub.add_argument('--ages', nargs='+', default=['17', '18', '19', '20', '21', '22'])
+    sub.add_argument('--jobs', type=int, default=None, help="동시에 추정할 대수 (프로세스 수)")
+    sub.add_argument('--offline', action='store_true', help="API 동기화 없이 기존 수집 결과로 실행")
+    sub.add_argument('--dims', type=int, default=2)
+    sub.add_argument('--bootstrap', type=int, default=0, metavar='TRIALS')
+    sub.set_defaults(handler=cmd_batch)
+
+    commands.add_parser('status', help="설정과 데이터 현황").set_defaults(handler=cmd_status)
+
+    sub = commands.add_parser('stats', help="법률안 저장소 집계")
+    sub.add_argument('--by', default='PROC_RESULT_CD',
+                     choices=['AGE', 'PROC_RESULT_CD', 'COMMITTEE_NM', 'PROPOSER', 'PROPOSE_DT'])
+    sub.set_defaults(handler=cmd_stats)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    config = Config.from_env(data_dir=args.data_dir, analysis_dir=args.analysis_dir,
+                             api_key_path=args.api_key_file, age=args.age)
+    return args.handler(config, args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,4 @@
+"""
+국회 Open API 수집기
+법률안/표결 정보 수집, 응답 캐시, 요청 속도 제한, 수집 기록, 로컬 법률안 저장소
+"""
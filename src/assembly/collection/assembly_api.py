@@ -0,0 +1,249 @@
+"""
+국회 Open API (open.assembly.go.kr) 공용 클라이언트
+연결 풀을 공유하는 세션, gzip 압축, 지수 백오프(지터 포함) 재시도, 응답 결과 코드 해석을 한곳에 모은다.
+요청 시간, 결과 코드, 원인별 재시도, 바이트 수, 캐시 적중, 속도 제한 대기는 telemetry.REGISTRY 에 기록한다.
+"""
+import json
+import os
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from ..config import DEFAULT_API_KEY_PATH
+from ..telemetry import REGISTRY
+from .pagination import MAX_PAGE_SIZE, fetch_all_pages, read_total_count
+from .rate_limiter import TokenBucket
+
+# 로컬 스텁 서버(stub_server.py)를 쓰려면 ASSEMBLY_API_BASE_URL을 지정한다
+BASE_URL = os.environ.get('ASSEMBLY_API_BASE_URL', "https://open.assembly.go.kr/portal/openapi")
+
+# 서비스(엔드포인트) 이름
+BILLS_ENDPOINT = 'nwbpacrgavhjryiph'   # 본회의 처리안건 법률안
+VOTES_ENDPOINT = 'nojepdqqaweusdfbi'   # 국회의원 본회의 표결정보
+
+# 응답 결과 코드
+OK_CODE = 'INFO-000'
+NO_DATA_CODE = 'INFO-200'                  # 해당하는 데이터가 없습니다
+QUOTA_CODES = {'ERROR-337', 'INFO-300'}    # 일별 트래픽 초과, 인증키 사용 제한
+RETRYABLE_CODES = {'ERROR-500', 'ERROR-600'}  # 서버 오류, DB 연결 오류
+
+# 응답 캐시 유효 시간(초). 표결 결과는 확정 후 바뀌지 않으므로 만료 없음,
+# 법률안 목록은 처리 결과가 갱신될 수 있으므로 하루. '데이터 없음'(INFO-200) 응답은 캐시하지 않는다.
+DEFAULT_CACHE_TTLS = {
+    VOTES_ENDPOINT: None,
+    BILLS_ENDPOINT: 24 * 60 * 60,
+}
+
+
+# 인증키 하나의 전체 요청 속도 (초당). 국회 Open API 는 인증키 단위로 트래픽을 제한한다.
+DEFAULT_REQUESTS_PER_SECOND = 10
+
+_shared_limiters = {}
+_shared_limiters_lock = threading.Lock()
+
+
+def shared_limiter(key, requests_per_second=DEFAULT_REQUESTS_PER_SECOND):
+    """key(인증키 파일 경로)마다 프로세스 안에서 하나뿐인 토큰 버킷.
+
+    여러 대수를 동시에 수집하는 수집기들이 같은 인증키를 쓰면 전체 요청 속도가 하나로 묶인다.
+    속도는 처음 만들 때 정해진다.
+    """
+    with _shared_limiters_lock:
+        if key not in _shared_limiters:
+            _shared_limiters[key] = TokenBucket(requests_per_second)
+        return _shared_limiters[key]
+
+
+def read_api_key(path=DEFAULT_API_KEY_PATH):
+    # 스텁 서버처럼 인증키가 필요 없는 환경에서는 환경 변수로 대신할 수 있다
+    if 'ASSEMBLY_API_KEY' in os.environ:
+        return os.environ['ASSEMBLY_API_KEY']
+    with open(path, 'r') as f:
+        return f.read().strip()
+
+
+
+def client_from_config(config, **kwargs):
+    """config 의 API 키 파일과 응답 캐시 폴더로 클라이언트를 만든다. kwargs 는 AssemblyApiClient 로 넘긴다.
+
+    limiter 를 주지 않으면 같은 인증키를 쓰는 클라이언트끼리 shared_limiter 를 공유한다.
+    """
+    from .response_cache import ResponseCache
+    cache = ResponseCache(config.cache_dir, ttls=DEFAULT_CACHE_TTLS)
+    requests_per_second = kwargs.pop('requests_per_second', None) or DEFAULT_REQUESTS_PER_SECOND
+    if kwargs.get('limiter') is None:
+        kwargs['limiter'] = shared_limiter(os.path.abspath(config.api_key_path), requests_per_second)
+    return AssemblyApiClient(read_api_key(config.api_key_path), cache=cache, **kwargs)
+
+
+class ApiError(Exception):
+    def __init__(self, code, message):
+        super().__init__(f"{code}: {message}")
+        self.code = code
+        self.message = message
+
+
+class TransientApiError(ApiError):
+    """재시도하면 성공할 수 있는 오류 (네트워크, 5xx, 서버 측 일시 오류)"""
+
+
+class QuotaExceededError(ApiError):
+    """인증키의 호출 한도를 넘은 경우. 재시도해도 소용없으므로 수집을 중단해야 한다."""
+
+
+@dataclass
+class ApiPage:
+    endpoint: str
+    page_index: int
+    total_count: int
+    code: str
+    rows: list = field(default_factory=list)
+
+
+def parse_response(endpoint, data, page_index=1):
+    """응답 JSON을 ApiPage로 바꾼다. INFO-200(데이터 없음)은 빈 페이지로, 나머지 오류 코드는 예외로 처리한다."""
+    if endpoint in data:
+        envelope = data[endpoint]
+        result = next(item['RESULT'] for item in envelope[0]['head'] if 'RESULT' in item)
+        rows = envelope[1]['row'] if len(envelope) > 1 else []
+    elif 'RESULT' in data:
+        # 데이터가 없거나 요청 자체가 잘못된 경우 서비스 이름 없이 RESULT만 온다
+        result = data['RESULT']
+        rows = []
+    else:
+        raise ApiError('FORMAT', "응답 데이터 형식이 올바르지 않습니다.")
+
+    code = result['CODE']
+    if code == OK_CODE:
+        return ApiPage(endpoint, page_index, read_total_count(envelope), code, rows)
+    if code == NO_DATA_CODE:
+        return ApiPage(endpoint, page_index, 0, code, [])
+    if code in QUOTA_CODES:
+        raise QuotaExceededError(code, result.get('MESSAGE', ''))
+    if code in RETRYABLE_CODES:
+        raise TransientApiError(code, result.get('MESSAGE', ''))
+    raise ApiError(code, result.get('MESSAGE', ''))
+
+
+def error_cause(error):
+    """재시도/오류 원인 라벨: ApiError 는 결과 코드(HTTP-503, ERROR-500, JSON 등), 네트워크 오류는 TIMEOUT/CONNECTION."""
+    if isinstance(error, ApiError):
+        return error.code
+    if isinstance(error, requests.exceptions.Timeout):
+        return 'TIMEOUT'
+    return 'CONNECTION'
+
+
+class AssemblyApiClient:
+    def __init__(self, api_key, base_url=BASE_URL, requests_per_second=None, limiter=None,
+                 max_retries=5, backoff_base=1.0, backoff_max=30.0, timeout=30, pool_size=16,
+                 cache=None, metrics=REGISTRY):
+        self.api_key = api_key
+        self.cache = cache
+        self.metrics = metrics
+        self.base_url = base_url.rstrip('/')
+        if limiter is None and requests_per_second:
+            limiter = TokenBucket(requests_per_second)
+        self.limiter = limiter
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.timeout = timeout
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.session.headers.update({
+            'Accept': 'application/json',
+            'Accept-Encoding': 'gzip, deflate',
+            'Connection': 'keep-alive',
+        })
+
+    def backoff_delay(self, attempt):
+        # full jitter: 0 ~ min(최대, 기본 * 2^attempt) 사이에서 무작위로 대기
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    def _request(self, endpoint, params):
+        if self.limiter is not None:
+            waited = self.limiter.acquire()
+            self.metrics.observe('assembly_rate_limit_wait_seconds', waited, endpoint=endpoint)
+        started = time.perf_counter()
+        try:
+            response = self.session.get(f"{self.base_url}/{endpoint}", params=params, timeout=self.timeout)
+        finally:
+            self.metrics.observe('assembly_api_request_seconds', time.perf_counter() - started, endpoint=endpoint)
+        self.metrics.inc('assembly_api_bytes_total', len(response.content), endpoint=endpoint)
+        if response.status_code == 429 or response.status_code >= 500:
+            raise TransientApiError(f"HTTP-{response.status_code}", response.text[:200])
+        if response.status_code != 200:
+            raise ApiError(f"HTTP-{response.status_code}", response.text[:200])
+        try:
+            return response.json(), response.content
+        except ValueError:
+            raise TransientApiError('JSON', "JSON 파싱 오류")
+
+    def get_page(self, endpoint, page_index=1, page_size=MAX_PAGE_SIZE, use_cache=True, **params):
+        query = {
+            'KEY': self.api_key,
+            'Type': 'json',
+            'pIndex': page_index,
+            'pSize': page_size,
+        }
+        query.update(params)
+
+        if use_cache and self.cache is not None:
+            body = self.cache.get(endpoint, query)
+            if body is not None:
+                page = parse_response(endpoint, json.loads(body), page_index)
+                # 예전에 저장된 '데이터 없음' 응답은 쓰지 않고 다시 요청한다
+                if page.code != NO_DATA_CODE:
+                    self.metrics.inc('assembly_api_cache_hits_total', endpoint=endpoint)
+                    return page
+
+        # 첫 요청 한 번 + 일시 오류마다 최대 max_retries 번 재시도 (max_retries=0 이어도 한 번은 요청한다)
+        for attempt in range(self.max_retries + 1):
+            try:
+                data, body = self._request(endpoint, query)
+                page = parse_response(endpoint, data, page_index)
+                self.metrics.inc('assembly_api_responses_total', endpoint=endpoint, code=page.code)
+                # '데이터 없음'은 저장하지 않는다: 표결 전에 조회한 법안이 표결 후에도 계속 비어 보이지 않도록
+                if self.cache is not None and page.code != NO_DATA_CODE:
+                    self.cache.put(endpoint, query, body)
+                return page
+            except (TransientApiError, requests.exceptions.ConnectionError,
+                    requests.exceptions.Timeout) as e:
+                cause = error_cause(e)
+                self.metrics.inc('assembly_api_responses_total', endpoint=endpoint, code=cause)
+                if attempt == self.max_retries:
+                    if isinstance(e, ApiError):
+                        raise
+                    raise TransientApiError('NETWORK', str(e)) from e
+                self.metrics.inc('assembly_api_retries_total', endpoint=endpoint, cause=cause)
+                delay = self.backoff_delay(attempt)
+                print(f"{endpoint} 요청 실패 ({e}), {delay:.1f}초 후 재시도 ({attempt+1}/{self.max_retries})...")
+                time.sleep(delay)
+            except ApiError as e:
+                self.metrics.inc('assembly_api_responses_total', endpoint=endpoint, code=e.code)
+                raise
+
+    def get_all(self, endpoint, page_size=MAX_PAGE_SIZE, max_workers=4, **params):
+        """모든 페이지의 행을 페이지 순서대로 반환한다. 데이터가 없으면 빈 목록을 반환한다."""
+        def fetch_page(page_index):
+            page = self.get_page(endpoint, page_index, page_size, **params)
+            return page.total_count, page.rows
+
+        return fetch_all_pages(fetch_page, page_size, max_workers=max_workers)
+
+    def close(self):
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,201 @@
+"""
+로컬 법률안 저장소 (SQLite)
+수집한 법률안을 BILL_ID 기준으로 한 파일에 모아 두고, 자주 거르는 열(AGE, PROC_RESULT_CD,
+COMMITTEE_NM, PROPOSER, PROPOSE_DT)에 인덱스를 걸어 조건 조회를 인덱스 탐색으로 처리한다.
+필터마다 CSV 전체를 다시 읽고 새 파일로 쓰는 대신 query()로 필요한 법안만 꺼내 쓴다.
+
+사용 예:
+    python -m assembly.collection.bill_store import data/assembly_bills_21_20250317_175143.csv
+    python -m assembly.collection.bill_store query --age 21 --result 원안가결 수정가결 부결 --output filtered.csv
+    python -m assembly.collection.bill_store stats --age 21 --by PROC_RESULT_CD
+
+pandas 는 불러오기/조회 때만 가져온다 (stats 같은 가벼운 명령의 시작 시간을 늘리지 않도록).
+"""
+import argparse
+import json
+import math
+import os
+import sqlite3
+
+from ..config import DEFAULT_DATA_DIR
+
+DEFAULT_STORE_PATH = os.path.join(DEFAULT_DATA_DIR, "bills.db")
+
+# 표결 대상 법안 (본회의 표결이 있는 처리 결과)
+TARGET_RESULTS = ["원안가결", "수정가결", "부결"]
+
+# 인덱스를 거는 열 (원본 행 전체는 data 열에 JSON 으로 보관)
+INDEXED_COLUMNS = ['AGE', 'PROC_RESULT_CD', 'COMMITTEE_NM', 'PROPOSER', 'PROPOSE_DT']
+
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS bills (
+    BILL_ID TEXT PRIMARY KEY,
+    BILL_NO TEXT,
+    BILL_NAME TEXT,
+    {', '.join(f'{column} TEXT' for column in INDEXED_COLUMNS)},
+    data TEXT NOT NULL
+);
+{''.join(f'CREATE INDEX IF NOT EXISTS idx_bills_{column.lower()} ON bills({column});' for column in INDEXED_COLUMNS)}
+CREATE INDEX IF NOT EXISTS idx_bills_age_result ON bills(AGE, PROC_RESULT_CD);
+"""
+
+
+def _text(value):
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return None
+    return str(value)
+
+
+def _record(row):
+    row = {key: _text(value) for key, value in row.items()}
+    return (row['BILL_ID'], row.get('BILL_NO'), row.get('BILL_NAME') or row.get('BILL_NM'),
+            *(row.get(column) for column in INDEXED_COLUMNS), json.dumps(row, ensure_ascii=False))
+
+
+def _as_list(value):
+    if value is None:
+        return None
+    return [value] if isinstance(value, str) else list(value)
+
+
+class BillStore:
+    def __init__(self, path=DEFAULT_STORE_PATH):
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+
+    def upsert(self, rows):
+        """법안 행(dict)들을 넣는다. 같은 BILL_ID 는 새 값으로 바꾼다. 넣은 행 수를 반환한다."""
+        records = [_record(row) for row in rows if row.get('BILL_ID')]
+        placeholders = ', '.join(['?'] * (4 + len(INDEXED_COLUMNS)))
+        with self._conn:
+            self._conn.executemany(f"INSERT OR REPLACE INTO bills VALUES ({placeholders})", records)
+        return len(records)
+
+    def import_file(self, path, chunk_size=50000):
+        """get_assembly_bill.py 출력(CSV 또는 Parquet)을 불러온다."""
+        import pandas as pd
+        if path.endswith('.parquet'):
+            chunks = [pd.read_parquet(path)]
+        else:
+            chunks = pd.read_csv(path, dtype=str, encoding='utf-8-sig', chunksize=chunk_size)
+        total = 0
+        for chunk in chunks:
+            total += self.upsert(chunk.to_dict('records'))
+        return total
+
+    def _where(self, age=None, results=None, committees=None, proposers=None,
+               proposed_from=None, proposed_to=None, bill_ids=None):
+        clauses, params = [], []
+        if age is not None:
+            clauses.append("AGE = ?")
+            params.append(str(age))
+        for column, values in (('PROC_RESULT_CD', results), ('COMMITTEE_NM', committees),
+                               ('PROPOSER', proposers), ('BILL_ID', bill_ids)):
+            values = _as_list(values)
+            if values is not None:
+                clauses.append(f"{column} IN ({', '.join(['?'] * len(values))})")
+                params.extend(values)
+        if proposed_from is not None:
+            clauses.append("PROPOSE_DT >= ?")
+            params.append(str(proposed_from))
+        if proposed_to is not None:
+            clauses.append("PROPOSE_DT <= ?")
+            params.append(str(proposed_to))
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+    def query(self, limit=None, **filters):
+        """조건에 맞는 법안을 원본 열 그대로 DataFrame 으로 반환한다 (BILL_ID 순).
+
+        filters: age, results, committees, proposers, proposed_from, proposed_to, bill_ids
+        """
+        where, params = self._where(**filters)
+        sql = f"SELECT data FROM bills{where} ORDER BY BILL_ID"
+        if limit is not None:
+            sql += f" LIMIT {int(limit)}"
+        rows = [json.loads(data) for (data,) in self._conn.execute(sql, params)]
+        import pandas as pd
+        return pd.DataFrame(rows)
+
+    def bill_ids(self, **filters):
+        """조건에 맞는 BILL_ID 목록. 인덱스만으로 처리되어 원본 행을 읽지 않는다."""
+        where, params = self._where(**filters)
+        return [bill_id for (bill_id,) in self._conn.execute(f"SELECT BILL_ID FROM bills{where} ORDER BY BILL_ID",
+                                                             params)]
+
+    def counts(self, column='PROC_RESULT_CD', **filters):
+        """column 값별 법안 수 (많은 순, {값: 개수} dict)."""
+        if column not in INDEXED_COLUMNS + ['BILL_NO']:
+            raise ValueError(f"집계할 수 없는 열입니다: {column}")
+        where, params = self._where(**filters)
+        rows = self._conn.execute(f"SELECT {column}, COUNT(*) AS n FROM bills{where} "
+                                  f"GROUP BY {column} ORDER BY n DESC", params).fetchall()
+        return {key if key is not None else '미정': n for key, n in rows}
+
+    def __len__(self):
+        return self._conn.execute("SELECT COUNT(*) FROM bills").fetchone()[0]
+
+    def close(self):
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _add_filter_arguments(parser):
+    parser.add_argument('--age')
+    parser.add_argument('--result', nargs='+', dest='results', help="PROC_RESULT_CD (여러 개 가능)")
+    parser.add_argument('--committee', nargs='+', dest='committees')
+    parser.add_argument('--proposer', nargs='+', dest='proposers')
+    parser.add_argument('--from', dest='proposed_from', help="제안일 시작 (YYYY-MM-DD)")
+    parser.add_argument('--to', dest='proposed_to', help="제안일 끝 (YYYY-MM-DD)")
+
+
+def _filters(args):
+    return {key: getattr(args, key) for key in
+            ('age', 'results', 'committees', 'proposers', 'proposed_from', 'proposed_to')}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="로컬 법률안 저장소")
+    parser.add_argument('--db', default=DEFAULT_STORE_PATH, help="SQLite 파일 경로")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    import_parser = commands.add_parser('import', help="CSV/Parquet 법률안 파일 불러오기")
+    import_parser.add_argument('files', nargs='+')
+
+    query_parser = commands.add_parser('query', help="조건에 맞는 법안 조회")
+    _add_filter_arguments(query_parser)
+    query_parser.add_argument('--limit', type=int)
+    query_parser.add_argument('--output', help="저장할 CSV 경로 (없으면 개수와 앞부분만 출력)")
+
+    stats_parser = commands.add_parser('stats', help="열 값별 법안 수")
+    _add_filter_arguments(stats_parser)
+    stats_parser.add_argument('--by', default='PROC_RESULT_CD', choices=INDEXED_COLUMNS)
+
+    args = parser.parse_args()
+    with BillStore(args.db) as store:
+        if args.command == 'import':
+            for path in args.files:
+                print(f"'{path}' 에서 {store.import_file(path)}개 법안을 불러왔습니다.")
+            print(f"저장소 '{args.db}' 법안 수: {len(store)}개")
+        elif args.command == 'query':
+            df = store.query(limit=args.limit, **_filters(args))
+            print(f"조건에 맞는 법안: {len(df)}개")
+            if args.output:
+                df.to_csv(args.output, index=False, encoding='utf-8-sig')
+                print(f"'{args.output}'에 저장되었습니다.")
+            elif not df.empty:
+                print(df.head(10).to_string(index=False))
+        else:
+            for key, count in store.counts(args.by, **_filters(args)).items():
+                print(f"- {key}: {count}개")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+"""
+법률안 증분 동기화
+마지막 동기화 시점의 상태(법안별 마지막 PROC_RESULT_CD, 전체 법안 수)를 저장해 두고,
+다음 실행에서는 새로 생기거나 처리 결과가 바뀐 법안만 받아 델타 CSV로 내보낸다.
+목록은 최근 처리 법안부터 읽으며, 전체 법안 수가 늘어난 만큼의 새 법안을 찾을 때까지는 멈추지 않는다.
+
+조기 종료는 API 목록이 최근 처리(변경) 법안부터 정렬되어 있다는 가정에 기댄다. 오래된 법안의 처리 결과가
+바뀌었는데 목록 앞쪽으로 올라오지 않으면 증분 동기화로는 놓치므로, 마지막 전체 점검(full_synced_at)이
+FULL_SWEEP_INTERVAL_DAYS 보다 오래되었거나 full=True 이면 목록 끝까지 읽어 모든 법안의 상태를 비교한다.
+델타 CSV는 get_voting_data.collect_voting_data_for_bills의 입력으로 바로 쓸 수 있다.
+"""
+import json
+import os
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+from ..config import DEFAULT_DATA_DIR, Config
+from ..telemetry import MetricsDumper
+from .assembly_api import BILLS_ENDPOINT, ApiError, client_from_config
+from .bill_store import BillStore
+from .get_assembly_bill import get_assembly_bills
+from .pagination import MAX_PAGE_SIZE
+
+# 증분 동기화 시 한 번에 받는 페이지 크기. 변경분은 보통 첫 페이지 안에 있으므로 작게 잡는다.
+SYNC_PAGE_SIZE = 100
+# 전체 점검(목록 끝까지 상태 비교) 주기와 그때 쓰는 페이지 크기
+FULL_SWEEP_INTERVAL_DAYS = 7
+FULL_SWEEP_PAGE_SIZE = MAX_PAGE_SIZE
+TIME_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+
+def load_state(state_path):
+    if not os.path.exists(state_path):
+        return None
+    with open(state_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_state(state, state_path):
+    os.makedirs(os.path.dirname(state_path) or '.', exist_ok=True)
+    tmp_path = f"{state_path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(state, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, state_path)
+
+
+def _is_new_or_changed(state, row):
+    return state['bills'].get(row['BILL_ID']) != row.get('PROC_RESULT_CD')
+
+
+def full_sweep_due(state, now=None):
+    """마지막 전체 점검 후 FULL_SWEEP_INTERVAL_DAYS 가 지났으면 True (기록이 없어도 True)"""
+    full_synced_at = state.get('full_synced_at')
+    if full_synced_at is None:
+        return True
+    now = now or datetime.now()
+    return now - datetime.strptime(full_synced_at, TIME_FORMAT) >= timedelta(days=FULL_SWEEP_INTERVAL_DAYS)
+
+
+def fetch_changed_bills(client, state, age='21', page_size=SYNC_PAGE_SIZE, full=False):
+    """목록 앞쪽(최근 처리 법안)부터 페이지를 읽다가, 새 법안/변경 법안이 하나도 없는 페이지를 만나면 멈춘다.
+
+    지난 동기화 이후 전체 법안 수가 늘었으면 늘어난 수만큼 새 법안을 찾기 전에는 멈추지 않는다.
+    목록이 최근 처리 법안부터 정렬되어 있다고 가정하므로, full=True 이면 멈추지 않고 목록 끝까지 읽는다.
+    """
+    delta = []
+    new_count = 0
+    page_index = 1
+    while True:
+        page = client.get_page(BILLS_ENDPOINT, page_index, page_size, use_cache=False,
+                               AGE=age, BILL_KIND='법률안')
+        changed = [row for row in page.rows if _is_new_or_changed(state, row)]
+        delta.extend(changed)
+        new_count += sum(row['BILL_ID'] not in state['bills'] for row in changed)
+        expected_new = page.total_count - state.get('total_count', page.total_count)
+        print(f"페이지 {page_index}: {len(page.rows)}개 중 새 법안/변경 법안 {len(changed)}개")
+
+        if page_index * page_size >= page.total_count:
+            return delta, page.total_count
+        if not full and not changed and new_count >= expected_new:
+            return delta, page.total_count
+        page_index += 1
+
+
+def update_state(state, rows, age, total_count, full=False):
+    if state is None:
+        state = {'age': age, 'bills': {}}
+    for row in rows:
+        state['bills'][row['BILL_ID']] = row.get('PROC_RESULT_CD')
+    state['total_count'] = total_count
+    state['synced_at'] = datetime.now().strftime(TIME_FORMAT)
+    if full:
+        state['full_synced_at'] = state['synced_at']
+    return state
+
+
+def merge_snapshot(delta, snapshot_path):
+    """전체 법안 스냅샷 CSV에서 델타 법안을 교체/추가한다."""
+    delta_df = pd.DataFrame(delta)
+    if os.path.exists(snapshot_path):
+        # BILL_NO, 날짜 열이 숫자로 바뀌지 않도록 문자열로 읽는다
+        snapshot = pd.read_csv(snapshot_path, dtype=str, encoding='utf-8-sig')
+        snapshot = snapshot[~snapshot['BILL_ID'].isin(delta_df['BILL_ID'])]
+        delta_df = pd.concat([snapshot, delta_df], ignore_index=True)
+    delta_df.to_csv(snapshot_path, index=False, encoding='utf-8-sig')
+
+
+def sync_bills(client, age='21', data_dir=DEFAULT_DATA_DIR, full=False):
+    state_path = os.path.join(data_dir, f"bill_sync_state_{age}.json")
+    snapshot_path = os.path.join(data_dir, f"assembly_bills_{age}_latest.csv")
+
+    state = load_state(state_path)
+    if state is None:
+        print(f"{age}대 국회 동기화 상태가 없어 전체 법률안을 수집합니다.")
+        delta = get_assembly_bills(client, age=age)
+        if not delta:
+            # 수집 실패(API 오류)로 빈 상태를 저장하면 다음 실행이 증분 동기화로 넘어가 전체 목록을 놓친다
+            print("법률안을 받지 못해 동기화 상태를 저장하지 않습니다.")
+            return None
+        total_count = len(delta)
+        full = True
+    else:
+        full = full or full_sweep_due(state)
+        print(f"{age}대 국회 {'전체 점검' if full else '증분'} 동기화 (마지막 동기화: {state['synced_at']}, "
+              f"마지막 전체 점검: {state.get('full_synced_at', '없음')}, "
+              f"법안 {len(state['bills'])}개, 전체 {state.get('total_count', '?')}개)")
+        try:
+            if full:
+                delta, total_count = fetch_changed_bills(client, state, age=age, page_size=FULL_SWEEP_PAGE_SIZE,
+                                                         full=True)
+            else:
+                delta, total_count = fetch_changed_bills(client, state, age=age)
+        except ApiError as e:
+            print(f"API 오류: {e.code}")
+            print(e.message)
+            print("동기화에 실패해 상태를 바꾸지 않습니다.")
+            return None
+
+    if not delta:
+        print("새로 추가되거나 변경된 법안이 없습니다.")
+        save_state(update_state(state, [], age, total_count, full=full), state_path)
+        return None
+
+    now = datetime.now().strftime("%Y%m%d_%H%M%S")
+    delta_path = os.path.join(data_dir, f"bill_delta_{age}_{now}.csv")
+    pd.DataFrame(delta).to_csv(delta_path, index=False, encoding='utf-8-sig')
+    merge_snapshot(delta, snapshot_path)
+
+    # 델타와 스냅샷을 모두 기록한 뒤에 동기화 상태를 갱신해야 중단되어도 변경분을 잃지 않는다
+    save_state(update_state(state, delta, age, total_count, full=full), state_path)
+
+    print(f"새 법안/변경 법안 {len(delta)}개를 '{delta_path}'에 저장했습니다.")
+    print(f"전체 스냅샷: '{snapshot_path}'")
+    return delta_path
+
+
+def main(config=None, full=False):
+    config = config or Config.from_env()
+    with MetricsDumper(os.path.join(config.metrics_dir, 'sync')):
+        delta_path = sync_bills(client_from_config(config), age=config.age, data_dir=config.data_dir, full=full)
+    if delta_path is not None:
+        # 새 법안/변경 법안을 로컬 법률안 저장소에도 반영
+        with BillStore(config.store_path) as store:
+            store.import_file(delta_path)
+    return delta_path
+
+
+if __name__ == "__main__":
+    main()
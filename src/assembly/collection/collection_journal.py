@@ -0,0 +1,84 @@
+"""
+표결정보 수집 저널
+법안별 수집 결과를 JSONL 한 줄씩 추가 기록하여, 중단 후 재시작 시 이어서 수집할 수 있게 한다.
+메모리에는 법안별 상태와 줄의 위치만 두고, 표결 행은 필요할 때 그 줄만 다시 읽는다.
+"""
+import json
+import os
+
+STATUS_OK = 'ok'
+STATUS_EMPTY = 'empty'
+STATUS_ERROR = 'error'
+
+
+class CollectionJournal:
+    def __init__(self, path):
+        self.path = path
+        self.index = {}  # bill_id -> (상태, 줄 시작 위치)
+        if os.path.exists(path):
+            self._load()
+        else:
+            os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self._file = open(path, 'ab')
+        self._reader = None
+
+    def _load(self):
+        with open(self.path, 'rb+') as f:
+            complete = 0  # 마지막 완전한 줄(줄바꿈으로 끝나는 줄)의 끝 위치
+            for line in f:
+                if not line.endswith(b'\n'):
+                    break
+                offset, complete = complete, complete + len(line)
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                self.index[entry['bill_id']] = (entry['status'], offset)
+            # 기록 도중 중단된 마지막 줄은 잘라 낸다. 남겨 두면 다음 기록이 그 줄 뒤에 붙어 함께 깨진다.
+            if f.seek(0, os.SEEK_END) > complete:
+                f.truncate(complete)
+
+    def record(self, bill_id, voting_data):
+        """get_voting_info_for_bill 결과(None / [] / 행 목록)를 기록하고 디스크에 반영한다."""
+        if voting_data is None:
+            status = STATUS_ERROR
+        elif len(voting_data) == 0:
+            status = STATUS_EMPTY
+        else:
+            status = STATUS_OK
+        entry = {'bill_id': bill_id, 'status': status, 'rows': voting_data or []}
+        offset = self._file.seek(0, os.SEEK_END)
+        self._file.write((json.dumps(entry, ensure_ascii=False) + '\n').encode('utf-8'))
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self.index[bill_id] = (status, offset)
+
+    def is_done(self, bill_id):
+        status = self.status(bill_id)
+        return status is not None and status != STATUS_ERROR
+
+    def status(self, bill_id):
+        entry = self.index.get(bill_id)
+        return entry[0] if entry else None
+
+    def rows(self, bill_id):
+        """bill_id 의 표결 행. 성공으로 기록된 법안이 아니면 빈 목록."""
+        status, offset = self.index.get(bill_id, (None, None))
+        if status != STATUS_OK:
+            return []
+        if self._reader is None:
+            self._reader = open(self.path, 'rb')
+        self._reader.seek(offset)
+        return json.loads(self._reader.readline())['rows']
+
+    def close(self):
+        self._file.close()
+        if self._reader is not None:
+            self._reader.close()
+            self._reader = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,180 @@
+"""
+수집 결과 통계
+표결/법률안 수집 결과(행 dict 목록 또는 DataFrame)를 열마다 한 번 정수 코드로 인코딩한 뒤
+np.bincount 로 모든 집계(결과별, 정당별, 법안별 투표 수와 찬반 분포, 의원별 참여, 정당별 찬반)를
+한 번에 계산한다. 텍스트 보고서와 함께 JSON 요약, Parquet 표(법안별/의원별)로 저장할 수 있다.
+"""
+import json
+import os
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+VOTE_RESULTS = ['찬성', '반대', '기권', '불참']
+ABSENT = '불참'
+
+
+def _frame(data, columns):
+    """필요한 열만 DataFrame 으로. 없는 열은 결측으로 채운다."""
+    if isinstance(data, pd.DataFrame):
+        return data.reindex(columns=columns)
+    return pd.DataFrame.from_records(data, columns=columns)
+
+
+def _encode(values, missing):
+    """(정수 코드, 고유값). 결측은 missing 라벨로 센다.
+
+    Parquet 의 사전 인코딩 열(category)은 이미 있는 코드를 그대로 쓰므로 문자열을 다시 해시하지 않는다.
+    """
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        codes, uniques = values.cat.codes.to_numpy(dtype=np.int64), values.cat.categories
+    else:
+        codes, uniques = pd.factorize(values, sort=False)
+    uniques = np.asarray(uniques, dtype=object)
+    if (codes < 0).any():
+        codes = np.where(codes < 0, len(uniques), codes)
+        uniques = np.append(uniques, missing)
+    return codes, uniques
+
+
+def _counts(codes, uniques):
+    """코드별 개수를 많은 순으로 정렬한 Series."""
+    counts = np.bincount(codes, minlength=len(uniques))
+    series = pd.Series(counts, index=uniques)
+    return series[series > 0].sort_values(ascending=False, kind='stable')
+
+
+def _crosstab(row_codes, n_rows, col_codes, n_cols):
+    """두 코드의 교차 개수 (n_rows, n_cols). 하나의 bincount 로 계산한다."""
+    return np.bincount(row_codes * n_cols + col_codes, minlength=n_rows * n_cols).reshape(n_rows, n_cols)
+
+
+def vote_statistics(data):
+    """표결 데이터 통계 (빈 데이터는 호출하는 쪽에서 거른다). Series/DataFrame 은 많은 순으로 정렬된다."""
+    df = _frame(data, ['RESULT_VOTE_MOD', 'POLY_NM', 'BILL_NO', 'BILL_NAME', 'HG_NM'])
+    result_codes, results = _encode(df['RESULT_VOTE_MOD'], '미정')
+    party_codes, parties = _encode(df['POLY_NM'], '미상')
+    bill_codes, bills = _encode(df['BILL_NO'], '미상')
+    member_codes, members = _encode(df['HG_NM'], '미상')
+
+    # 표결 결과 열 순서를 찬성/반대/기권/불참(+기타)으로 고정
+    order = [r for r in VOTE_RESULTS if r in set(results)] + [r for r in results if r not in VOTE_RESULTS]
+    remap = np.array([order.index(r) for r in results], dtype=np.int64)
+    result_codes = remap[result_codes]
+    absent = order.index(ABSENT) if ABSENT in order else -1
+
+    bill_by_result = _crosstab(bill_codes, len(bills), result_codes, len(order))
+    member_by_result = _crosstab(member_codes, len(members), result_codes, len(order))
+    party_by_result = _crosstab(party_codes, len(parties), result_codes, len(order))
+
+    # 법안 이름: 법안별 처음 나온 행 (행 순회 없이 코드의 첫 등장 위치로)
+    first = ~pd.Series(bill_codes).duplicated().to_numpy()
+    first_row = np.zeros(len(bills), dtype=np.int64)
+    first_row[bill_codes[first]] = np.flatnonzero(first)
+    bill_names = df['BILL_NAME'].iloc[first_row].fillna('알 수 없음').to_numpy(dtype=object)
+
+    bill_table = pd.DataFrame(bill_by_result, columns=order)
+    bill_table.insert(0, 'BILL_NO', bills)
+    bill_table.insert(1, 'BILL_NAME', bill_names)
+    bill_table['votes'] = bill_by_result.sum(axis=1)
+    bill_table['turnout'] = _present_ratio(bill_by_result, absent)
+    bill_table = bill_table[bill_table['votes'] > 0]
+
+    member_table = pd.DataFrame(member_by_result, columns=order)
+    member_table.insert(0, 'HG_NM', members)
+    member_table['votes'] = member_by_result.sum(axis=1)
+    member_table['participation'] = _present_ratio(member_by_result, absent)
+    member_table = member_table[member_table['votes'] > 0]
+
+    party_splits = pd.DataFrame(party_by_result, index=parties, columns=order)
+    party_splits = party_splits[party_splits.sum(axis=1) > 0]
+
+    return {
+        'total_votes': int(len(df)),
+        'vote_results': _counts(result_codes, np.array(order, dtype=object)),
+        'parties': _counts(party_codes, parties),
+        'bills': bill_table.sort_values('votes', ascending=False, kind='stable').reset_index(drop=True),
+        'members': member_table.sort_values('votes', ascending=False, kind='stable').reset_index(drop=True),
+        'party_splits': party_splits.loc[party_splits.sum(axis=1).sort_values(ascending=False, kind='stable').index],
+    }
+
+
+def _present_ratio(counts, absent):
+    total = counts.sum(axis=1)
+    present = total - (counts[:, absent] if absent >= 0 else 0)
+    return np.divide(present, total, out=np.zeros(len(total)), where=total > 0)
+
+
+def bill_statistics(data):
+    """법률안 데이터 통계: 처리 결과별, 제안자별, 소관위원회별 개수."""
+    df = _frame(data, ['PROC_RESULT_CD', 'PROPOSER', 'COMMITTEE_NM'])
+    return {
+        'total_bills': int(len(df)),
+        'proc_results': _counts(*_encode(df['PROC_RESULT_CD'], '미정')),
+        'proposers': _counts(*_encode(df['PROPOSER'], '미상')),
+        'committees': _counts(*_encode(df['COMMITTEE_NM'], '미상')),
+    }
+
+
+def _count_lines(counts, limit=None, unit='개'):
+    items = counts.iloc[:limit] if limit else counts
+    return [f"- {key}: {count}{unit}" for key, count in items.items()]
+
+
+def vote_report(stats, title="21대 국회 본회의 표결정보 분석 결과", top=10):
+    """save_analysis_to_txt 가 쓰던 형식의 텍스트 보고서."""
+    total = stats['total_votes']
+    n_members = len(stats['members'])
+    lines = [f"=== {title} ===", "", f"수집 일시: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}", ""]
+    lines += ["1. 표결 결과별 통계"] + _count_lines(stats['vote_results'])
+    lines += ["", "2. 정당별 통계"] + _count_lines(stats['parties'])
+    lines += ["", f"3. 총 법안 수: {len(stats['bills'])}개"]
+    lines += ["", f"4. 총 의원 수: {n_members}명"]
+    lines += ["", f"5. 총 투표 수: {total}개"]
+    lines += ["", "6. 의원 1인당 평균 투표 수: " + (f"{total / n_members:.2f}개" if n_members else "계산할 수 없음")]
+    lines += ["", f"7. 투표 수 기준 상위 {top}개 법안"]
+    for row in stats['bills'].head(top).itertuples(index=False):
+        lines.append(f"- {row.BILL_NO} ({row.BILL_NAME}): {row.votes}개 투표")
+    lines += ["", "8. 정당별 표결 결과"]
+    for party, row in stats['party_splits'].iterrows():
+        lines.append(f"- {party}: " + ", ".join(f"{result} {count}" for result, count in row.items()))
+    return "\n".join(lines) + "\n"
+
+
+def bill_report(stats, top=10):
+    lines = [f"총 {stats['total_bills']}개의 법률안", "", "처리 결과별 통계:"]
+    lines += _count_lines(stats['proc_results'])
+    lines += ["", f"상위 {top}명 제안자별 통계:"] + _count_lines(stats['proposers'], top)
+    lines += ["", "소관위원회별 통계:"] + _count_lines(stats['committees'])
+    return "\n".join(lines) + "\n"
+
+
+def to_json(stats):
+    """통계 dict 를 JSON 으로 저장할 수 있는 형태로 바꾼다 (표는 레코드 목록)."""
+    out = {}
+    for key, value in stats.items():
+        if isinstance(value, pd.Series):
+            out[key] = {str(k): int(v) for k, v in value.items()}
+        elif isinstance(value, pd.DataFrame):
+            frame = value.rename_axis('POLY_NM').reset_index() if key == 'party_splits' else value
+            out[key] = json.loads(frame.to_json(orient='records', force_ascii=False))
+        else:
+            out[key] = value
+    return out
+
+
+def save_report(stats, text, text_path, json_path=None, parquet_prefix=None):
+    """텍스트 보고서, JSON 요약, (선택) 표마다 Parquet 파일을 저장한다."""
+    os.makedirs(os.path.dirname(text_path) or '.', exist_ok=True)
+    with open(text_path, 'w', encoding='utf-8') as f:
+        f.write(text)
+    if json_path is not None:
+        with open(json_path, 'w', encoding='utf-8') as f:
+            json.dump(to_json(stats), f, ensure_ascii=False, indent=2)
+    if parquet_prefix is not None:
+        for key, value in stats.items():
+            if isinstance(value, pd.DataFrame):
+                frame = value.rename_axis('POLY_NM').reset_index() if key == 'party_splits' else value
+                frame.to_parquet(f"{parquet_prefix}_{key}.parquet", index=False)
+    return text_path
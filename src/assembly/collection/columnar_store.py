@@ -0,0 +1,151 @@
+"""
+Parquet 열 지향 저장소
+수집한 행(dict)을 메모리에 모두 쌓지 않고 일정 크기의 row group 단위로 Parquet 파일에 흘려 쓴다.
+반복이 많은 문자열 열(정당, 의원 이름, 표결 결과, 법안 번호)은 사전(dictionary) 인코딩하고,
+표결 결과는 R 스크립트와 같은 숫자 코드(int8)로도 저장한다.
+
+스키마는 열 목록(columns)을 주면 처음부터 그것으로 정하고, 없으면 처음 쓰는 row group 의 키로 정한다.
+스키마에 없는 키가 나중에 나오면 기본으로는 ValueError 를 내고, unknown_columns='drop' 이면
+열 이름마다 한 번 경고를 출력한 뒤 그 값은 버린다. 표결 writer 는 API 가 열을 새로 추가해도
+수집(과 저널 재생)이 멈추지 않도록 'drop' 을 쓴다.
+"""
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+# prepare_wnominate_data.R 과 같은 표결 코드 (0: 결측)
+VOTE_CODES = {'찬성': 1, '반대': 2, '기권': 3, '불참': 4}
+
+# 국회의원 본회의 표결정보(nojepdqqaweusdfbi) 응답 열 (Open API 명세 순서)
+VOTE_API_COLUMNS = ['HG_NM', 'HJ_NM', 'POLY_NM', 'ORIG_NM', 'MEMBER_NO', 'POLY_CD', 'ORIG_CD', 'VOTE_DATE',
+                    'BILL_NO', 'BILL_NAME', 'BILL_ID', 'LAW_TITLE', 'CURR_COMMITTEE', 'RESULT_VOTE_MOD', 'DEPT_CD',
+                    'CURR_COMMITTEE_ID', 'DISP_ORDER', 'BILL_URL', 'BILL_NAME_URL', 'SESSION_CD', 'CURRENTS_CD',
+                    'AGE', 'MONA_CD']
+
+VOTE_DICTIONARY_COLUMNS = ['POLY_NM', 'HG_NM', 'RESULT_VOTE_MOD', 'BILL_NO']
+BILL_DICTIONARY_COLUMNS = ['PROC_RESULT_CD', 'COMMITTEE_NM', 'PROPOSER', 'BILL_KIND']
+
+DEFAULT_ROW_GROUP_SIZE = 64 * 1024
+
+
+def encode_vote(result):
+    return VOTE_CODES.get(result, 0)
+
+
+class StreamingParquetWriter:
+    def __init__(self, path, dictionary_columns=(), int8_columns=(), row_group_size=DEFAULT_ROW_GROUP_SIZE,
+                 compression='zstd', transform=None, columns=None, unknown_columns='raise'):
+        if unknown_columns not in ('raise', 'drop'):
+            raise ValueError(f"unknown_columns 는 'raise' 또는 'drop' 이어야 합니다: {unknown_columns!r}")
+        self.path = path
+        self.unknown_columns = unknown_columns
+        self.dropped_columns = set()
+        self.transform = transform
+        self.dictionary_columns = list(dictionary_columns)
+        self.int8_columns = list(int8_columns)
+        self.row_group_size = row_group_size
+        self.compression = compression
+        self.schema = self._build_schema(columns) if columns is not None else None
+        self.rows_written = 0
+        self._buffer = []
+        self._writer = None
+
+    @staticmethod
+    def _row_names(rows):
+        names = {}
+        for row in rows:
+            names.update(dict.fromkeys(row))
+        return list(names)
+
+    def _check_columns(self, rows):
+        unexpected = [name for name in self._row_names(rows)
+                      if name not in self._names and name not in self.dropped_columns]
+        if not unexpected:
+            return
+        if self.unknown_columns == 'raise':
+            raise ValueError(f"'{self.path}' 스키마에 없는 열입니다: {', '.join(unexpected)}")
+        # 스키마에 없는 값은 _column 에서 읽지 않으므로 경고만 남기면 버려진다
+        print(f"경고: '{self.path}' 스키마에 없는 열은 저장하지 않습니다: {', '.join(unexpected)}")
+        self.dropped_columns.update(unexpected)
+
+    def _build_schema(self, names):
+        self._names = set(names)
+        fields = []
+        for name in names:
+            if name in self.int8_columns:
+                fields.append(pa.field(name, pa.int8()))
+            elif name in self.dictionary_columns:
+                fields.append(pa.field(name, pa.dictionary(pa.int32(), pa.string())))
+            else:
+                fields.append(pa.field(name, pa.string()))
+        return pa.schema(fields)
+
+    def _column(self, name, rows):
+        values = [row.get(name) for row in rows]
+        if name in self.int8_columns:
+            return pa.array(values, type=pa.int8())
+        values = [None if v is None else str(v) for v in values]
+        if name in self.dictionary_columns:
+            return pa.array(values, type=pa.string()).dictionary_encode()
+        return pa.array(values, type=pa.string())
+
+    def _flush(self, count=None):
+        if not self._buffer:
+            return
+        count = len(self._buffer) if count is None else count
+        rows = self._buffer[:count]
+        del self._buffer[:count]
+        if self.schema is None:
+            self.schema = self._build_schema(self._row_names(rows))
+        self._check_columns(rows)
+        if self._writer is None:
+            self._writer = pq.ParquetWriter(self.path, self.schema, compression=self.compression,
+                                            use_dictionary=self.dictionary_columns)
+        table = pa.Table.from_arrays([self._column(f.name, rows) for f in self.schema], schema=self.schema)
+        self._writer.write_table(table, row_group_size=self.row_group_size)
+        self.rows_written += len(rows)
+
+    def write_rows(self, rows):
+        if self.transform is not None:
+            rows = [self.transform(row) for row in rows]
+        if self.schema is not None:
+            self._check_columns(rows)
+        self._buffer.extend(rows)
+        while len(self._buffer) >= self.row_group_size:
+            self._flush(self.row_group_size)
+
+    def close(self):
+        self._flush()
+        if self._writer is not None:
+            self._writer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def vote_writer(path, **kwargs):
+    """표결 데이터용 writer. 스키마는 VOTE_API_COLUMNS 로 정하고, 각 행에 VOTE_CODE(int8) 열을 덧붙여 쓴다.
+    API 응답에 명세에 없는 열이 새로 생기면 경고만 출력하고 그 열은 버린다."""
+    kwargs.setdefault('columns', VOTE_API_COLUMNS + ['VOTE_CODE'])
+    kwargs.setdefault('unknown_columns', 'drop')
+    return StreamingParquetWriter(path, dictionary_columns=VOTE_DICTIONARY_COLUMNS, int8_columns=['VOTE_CODE'],
+                                  transform=lambda row: dict(row, VOTE_CODE=encode_vote(row.get('RESULT_VOTE_MOD'))),
+                                  **kwargs)
+
+
+def bill_writer(path, **kwargs):
+    return StreamingParquetWriter(path, dictionary_columns=BILL_DICTIONARY_COLUMNS, **kwargs)
+
+
+def read_table(path, columns=None, filters=None):
+    """필요한 열만 읽고(columns), 조건(filters)은 row group 통계로 미리 걸러낸다.
+
+    filters 예: [('POLY_NM', '=', '국민의힘'), ('VOTE_CODE', 'in', [1, 2])]
+    """
+    return pq.read_table(path, columns=columns, filters=filters)
+
+
+def read_frame(path, columns=None, filters=None):
+    return read_table(path, columns=columns, filters=filters).to_pandas()
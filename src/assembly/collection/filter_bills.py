@@ -0,0 +1,66 @@
+import os
+from datetime import datetime
+
+from ..config import DEFAULT_DATA_DIR, Config
+from .bill_store import DEFAULT_STORE_PATH, TARGET_RESULTS, BillStore
+
+def filter_bills(input_file, target_results, store_path=DEFAULT_STORE_PATH, age=None, output_csv=None,
+                 report_dir=DEFAULT_DATA_DIR):
+    """법률안 파일을 로컬 저장소에 불러온 뒤 인덱스 조회로 거른다.
+
+    input_file 이 None 이면 저장소에 이미 있는 법안만 쓴다. 거른 결과를 CSV 로 남기고 싶을 때만
+    output_csv 를 준다 (표결 수집은 BillStore.query 결과를 바로 받을 수 있다).
+    """
+    with BillStore(store_path) as store:
+        if input_file is not None:
+            print(f"'{input_file}' 파일을 저장소 '{store_path}'에 불러오는 중...")
+            store.import_file(input_file)
+        
+        result_counts_before = store.counts('PROC_RESULT_CD', age=age)
+        original_count = sum(result_counts_before.values())
+        print(f"원본 데이터 개수: {original_count}개")
+        
+        result_counts_after = store.counts('PROC_RESULT_CD', age=age, results=target_results)
+        filtered_count = sum(result_counts_after.values())
+        print(f"필터링 후 데이터 개수: {filtered_count}개")
+        print(f"제거된 데이터 개수: {original_count - filtered_count}개")
+        
+        if output_csv is not None:
+            store.query(age=age, results=target_results).to_csv(output_csv, index=False, encoding='utf-8-sig')
+            print(f"필터링된 데이터가 '{output_csv}'에 저장되었습니다.")
+    
+    now = datetime.now().strftime("%Y%m%d_%H%M%S")
+    os.makedirs(report_dir, exist_ok=True)
+    output_txt = os.path.join(report_dir, f"filtering_results_{now}.txt")
+    with open(output_txt, 'w', encoding='utf-8') as f:
+        f.write(f"원본 파일: {input_file or store_path}\n")
+        f.write(f"필터링 기준: {', '.join(target_results)}\n\n")
+        
+        f.write("=== 필터링 전 처리 결과별 개수 ===\n")
+        for result, count in result_counts_before.items():
+            f.write(f"{result}: {count}개\n")
+        
+        f.write("\n=== 필터링 후 처리 결과별 개수 ===\n")
+        for result, count in result_counts_after.items():
+            f.write(f"{result}: {count}개\n")
+        
+        f.write(f"\n총 {original_count}개 중 {filtered_count}개 남음 ({original_count - filtered_count}개 제거됨)\n")
+        f.write(f"제거 비율: {((original_count - filtered_count) / max(original_count, 1)) * 100:.2f}%\n")
+    
+    print(f"필터링 결과가 '{output_txt}'에 저장되었습니다.")
+    
+    return output_csv, output_txt
+
+def main(config=None, input_file=None, target_results=TARGET_RESULTS, output_csv=None):
+    # input_file: get_assembly_bill.py 의 CSV/Parquet 출력. 없으면 저장소에 이미 있는 법안을 거른다.
+    config = config or Config.from_env()
+    output_csv, output_txt = filter_bills(input_file, target_results, store_path=config.store_path, age=config.age,
+                                          output_csv=output_csv, report_dir=config.data_dir)
+    
+    print("\n=== 결과 파일 내용 ===")
+    with open(output_txt, 'r', encoding='utf-8') as f:
+        print(f.read())
+    return output_csv, output_txt
+
+if __name__ == "__main__":
+    main()
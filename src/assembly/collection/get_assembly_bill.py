@@ -0,0 +1,123 @@
+import pandas as pd
+import os
+from datetime import datetime
+
+from ..config import DEFAULT_DATA_DIR, Config
+from ..telemetry import MetricsDumper, stage
+from .assembly_api import BILLS_ENDPOINT, ApiError, client_from_config
+from .bill_store import BillStore
+from .collection_stats import bill_report, bill_statistics, save_report
+from .pagination import MAX_PAGE_SIZE
+
+def get_assembly_bills(client, age='21', page_size=MAX_PAGE_SIZE, max_workers=4):
+    # 첫 페이지의 list_total_count로 전체 페이지 수를 구하고 나머지 페이지는 동시에 요청
+    with stage('bills') as progress:
+        try:
+            all_data = client.get_all(BILLS_ENDPOINT, page_size=page_size, max_workers=max_workers,
+                                      AGE=age, BILL_KIND='법률안')
+        except ApiError as e:
+            progress.add(outcome='error')
+            print(f"API 오류: {e.code}")
+            print(e.message)
+            return []
+        progress.add(len(all_data or []), outcome='success' if all_data else 'empty')
+    
+    if not all_data:
+        print("더 이상 데이터가 없습니다.")
+    else:
+        print(f"법률안 데이터 {len(all_data)}개 수집 완료")
+    
+    return all_data
+
+def save_to_csv(data, filename=None, data_dir=DEFAULT_DATA_DIR, age='21'):
+    if not data:
+        print("저장할 데이터가 없습니다.")
+        return
+    
+    if filename is None:
+        now = datetime.now().strftime("%Y%m%d_%H%M%S")
+        filename = f"assembly_bills_{age}_{now}.csv"
+    filename = os.path.join(data_dir, filename)
+    
+    os.makedirs(os.path.dirname(filename), exist_ok=True)
+    
+    df = pd.DataFrame(data)
+    df.to_csv(filename, index=False, encoding='utf-8-sig')
+    print(f"데이터가 '{filename}'에 저장되었습니다.")
+    return filename
+
+def save_to_parquet(data, filename=None, data_dir=DEFAULT_DATA_DIR, age='21', chunk_size=10000):
+    if not data:
+        print("저장할 데이터가 없습니다.")
+        return
+    
+    # pyarrow는 Parquet 저장에만 필요하므로 여기서 불러온다
+    from .columnar_store import bill_writer
+    
+    if filename is None:
+        now = datetime.now().strftime("%Y%m%d_%H%M%S")
+        filename = f"assembly_bills_{age}_{now}.parquet"
+    filename = os.path.join(data_dir, filename)
+    
+    os.makedirs(os.path.dirname(filename), exist_ok=True)
+    
+    # 데이터가 모두 메모리에 있으므로 전체 행의 열로 스키마를 정한다
+    columns = list(dict.fromkeys(key for row in data for key in row))
+    with bill_writer(filename, columns=columns) as writer:
+        for start in range(0, len(data), chunk_size):
+            writer.write_rows(data[start:start + chunk_size])
+    print(f"데이터가 '{filename}'에 저장되었습니다.")
+    return filename
+
+def analyze_bills(data):
+    if not data:
+        print("분석할 데이터가 없습니다.")
+        return None
+
+    stats = bill_statistics(data)
+
+    print("\n처리 결과별 통계:")
+    for result, count in stats['proc_results'].items():
+        print(f"- {result}: {count}개")
+
+    print("\n상위 10명 제안자별 통계:")
+    for proposer, count in stats['proposers'].head(10).items():
+        print(f"- {proposer}: {count}개")
+
+    print("\n소관위원회별 통계:")
+    for committee, count in stats['committees'].items():
+        print(f"- {committee}: {count}개")
+    return stats
+
+def main(config=None):
+    config = config or Config.from_env()
+    client = client_from_config(config)
+    
+    print(f"{config.age}대 국회 법률안 데이터 수집 시작...")
+    with MetricsDumper(os.path.join(config.metrics_dir, 'bills')):
+        assembly_data = get_assembly_bills(client, age=config.age)
+    
+    filename = save_to_parquet(assembly_data, data_dir=config.data_dir, age=config.age)
+    
+    # 로컬 법률안 저장소에도 반영 (filter_bills / get_voting_data 가 여기서 조회)
+    with BillStore(config.store_path) as store:
+        store.upsert(assembly_data)
+    
+    if assembly_data:
+        print(f"\n총 {len(assembly_data)}개의 법률안 정보를 수집했습니다.")
+        
+        stats = analyze_bills(assembly_data)
+        
+        print("\n수집된 정보 필드:")
+        for key in assembly_data[0].keys():
+            print(f"- {key}")
+
+        # 분석 결과를 텍스트 파일과 JSON 요약으로 저장
+        now = datetime.now().strftime("%Y%m%d_%H%M%S")
+        text = bill_report(stats) + "\n수집된 정보 필드:\n" + "".join(f"- {key}\n" for key in assembly_data[0].keys())
+        save_report(stats, text, config.data_path(f"bill_analysis_{now}.txt"),
+                    json_path=config.data_path(f"bill_analysis_{now}.json"))
+    return filename
+
+if __name__ == "__main__":
+    main()
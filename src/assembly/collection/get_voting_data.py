@@ -0,0 +1,286 @@
+import pandas as pd
+import os
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+
+from ..config import DEFAULT_DATA_DIR, Config
+from ..telemetry import MetricsDumper, stage
+from .assembly_api import (DEFAULT_REQUESTS_PER_SECOND, VOTES_ENDPOINT, ApiError, QuotaExceededError,
+                           client_from_config)
+from .bill_store import TARGET_RESULTS, BillStore
+from .collection_journal import CollectionJournal
+from .collection_stats import save_report, vote_report, vote_statistics
+
+# 동시 수집 설정: 국회 Open API는 인증키당 초당 요청 수를 제한하므로
+# 토큰 버킷으로 전체 요청 속도를 맞춘다.
+MAX_WORKERS = 8
+REQUESTS_PER_SECOND = DEFAULT_REQUESTS_PER_SECOND
+
+def get_voting_info_for_bill(client, bill_id, age='21'):
+    try:
+        items = client.get_all(VOTES_ENDPOINT, AGE=age, BILL_ID=bill_id)
+    except QuotaExceededError:
+        # 호출 한도 초과는 다른 법안도 모두 실패하므로 수집 전체를 중단시킨다
+        raise
+    except ApiError as e:
+        print(f"API 오류: {e.code}")
+        print(e.message)
+        return None
+    
+    if not items:
+        print(f"법안 ID {bill_id}에 대한 표결 정보가 없습니다.")
+    return items
+
+def iter_voting_info(client, bill_ids, max_workers=1, age='21'):
+    """bill_ids 순서대로 (bill_id, 표결 정보) 를 돌려준다.
+
+    max_workers > 1 이면 스레드 풀로 동시에 요청한다. 초당 요청 수는 client의 토큰 버킷이 제한한다.
+    결과는 완료 순서와 관계없이 입력 순서대로 반환되므로 직렬 수집과 같은 출력을 만든다.
+    """
+    if max_workers <= 1:
+        for bill_id in bill_ids:
+            yield bill_id, get_voting_info_for_bill(client, bill_id, age)
+        return
+
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    futures = [executor.submit(get_voting_info_for_bill, client, bill_id, age) for bill_id in bill_ids]
+    try:
+        for bill_id, future in zip(bill_ids, futures):
+            yield bill_id, future.result()
+    finally:
+        # 중단되면 아직 시작하지 않은 요청은 취소한다 (shutdown 의 cancel_futures 는 3.9 이상)
+        for future in futures:
+            future.cancel()
+        executor.shutdown(wait=False)
+
+def collect_voting_data_for_bills(client, bills, output_path, max_workers=1,
+                                  journal_path=os.path.join(DEFAULT_DATA_DIR, "voting_collection_journal.jsonl"),
+                                  age='21'):
+    """법안별 표결 정보를 수집해 output_path(Parquet)에 바로 쓰고, 쓴 행 수를 반환한다.
+
+    법안 하나가 끝날 때마다 그 행을 저널에 기록하고 writer 에 넘기므로, 메모리에는 법안별 상태만 남는다.
+    출력은 입력 법안 순서이며, 이전 실행에서 완료된 법안의 행은 저널에서 다시 읽어 쓴다.
+    """
+    # bills: 법안 CSV 경로 또는 BillStore.query() 결과 DataFrame
+    if isinstance(bills, pd.DataFrame):
+        df = bills
+    else:
+        print(f"{bills} 파일에서 법안 정보를 읽는 중...")
+        df = pd.read_csv(bills)
+    
+    if 'BILL_ID' not in df.columns:
+        print("법안 목록에 BILL_ID 열이 없습니다.")
+        return None
+    
+    # pyarrow는 Parquet 저장에만 필요하므로 여기서 불러온다
+    from .columnar_store import vote_writer
+    
+    total_bills = len(df)
+    print(f"총 {total_bills}개의 법안에 대한 표결 정보를 수집합니다.")
+    print(f"동시 요청 수: {max_workers}")
+    
+    bill_ids = df['BILL_ID'].tolist()
+    bill_names = dict(zip(bill_ids, df['BILL_NM'])) if 'BILL_NM' in df.columns else {}
+    
+    # 저널에 완료(성공/정보 없음)로 기록된 법안은 건너뛰고, 오류였던 법안만 다시 수집
+    journal = CollectionJournal(journal_path)
+    pending = [not journal.is_done(bill_id) for bill_id in bill_ids]
+    pending_ids = [bill_id for bill_id, flag in zip(bill_ids, pending) if flag]
+    resumed_count = total_bills - len(pending_ids)
+    if resumed_count:
+        print(f"저널 '{journal_path}'에서 {resumed_count}개 법안의 수집 결과를 불러왔습니다. "
+              f"남은 법안: {len(pending_ids)}개")
+    
+    success_count = 0
+    error_count = 0
+    empty_count = 0
+    
+    # 진행 상황을 저장할 파일 생성
+    progress_file = os.path.join(os.path.dirname(journal_path), "voting_collection_progress.txt")
+    with open(progress_file, 'w', encoding='utf-8') as f:
+        f.write(f"{age}대 국회 표결정보 수집 진행 상황\n")
+        f.write(f"시작 시간: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+        f.write(f"저널에서 이어받은 법안: {resumed_count}개\n\n")
+    
+    # 다 쓴 뒤에 이름을 바꿔, 중간에 실패해도 이전 출력 파일이 반쯤 쓴 파일로 바뀌지 않게 한다
+    tmp_path = f"{output_path}.tmp"
+    os.makedirs(os.path.dirname(output_path) or '.', exist_ok=True)
+    writer = vote_writer(tmp_path)
+    results = iter_voting_info(client, pending_ids, max_workers, age)
+    progress = stage('votes')
+    written_bills = 0  # 입력 순서로 처리를 마친 법안 수
+    try:
+        try:
+            for bill_id, is_pending in zip(bill_ids, pending):
+                if not is_pending:
+                    writer.write_rows(journal.rows(bill_id))
+                    written_bills += 1
+                    continue
+                
+                _, voting_data = next(results)
+                idx = success_count + empty_count + error_count
+                bill_name = bill_names.get(bill_id, "알 수 없음")
+                
+                print(f"[{idx+1}/{len(pending_ids)}] '{bill_name}' (ID: {bill_id}) 법안의 표결 정보를 수집 중...")
+                
+                # 도착 즉시 저널에 기록하고 Parquet 에 쓴다
+                journal.record(bill_id, voting_data)
+                if voting_data:
+                    writer.write_rows(voting_data)
+                written_bills += 1
+                
+                # 진행 상황 업데이트
+                if idx % 10 == 0:
+                    with open(progress_file, 'a', encoding='utf-8') as f:
+                        f.write(f"[{idx+1}/{len(pending_ids)}] 처리 중... (성공: {success_count}, 없음: {empty_count}, 오류: {error_count})\n")
+                
+                if voting_data is None:
+                    print(f"  - 오류 발생, 다음 법안으로 넘어갑니다.")
+                    error_count += 1
+                    progress.add(outcome='error')
+                elif len(voting_data) == 0:
+                    print(f"  - 표결 정보가 없습니다.")
+                    empty_count += 1
+                    progress.add(outcome='empty')
+                else:
+                    print(f"  - {len(voting_data)}개의 표결 정보를 수집했습니다.")
+                    success_count += 1
+                    progress.add(len(voting_data), outcome='success')
+        
+        except KeyboardInterrupt:
+            print("\n사용자에 의해 수집이 중단되었습니다. 다시 실행하면 저널에서 이어서 수집합니다.")
+            with open(progress_file, 'a', encoding='utf-8') as f:
+                f.write(f"\n사용자에 의해 수집이 중단되었습니다. ({datetime.now().strftime('%Y-%m-%d %H:%M:%S')})\n")
+        except Exception as e:
+            print(f"\n오류로 인해 수집이 중단되었습니다: {str(e)}")
+            with open(progress_file, 'a', encoding='utf-8') as f:
+                f.write(f"\n오류로 인해 수집이 중단되었습니다: {str(e)} ({datetime.now().strftime('%Y-%m-%d %H:%M:%S')})\n")
+        finally:
+            progress.finish()
+            results.close()
+        
+        # 중단된 경우 남은 법안 중 저널에 성공으로 기록된 것(이전 실행분 포함)만 이어서 쓴다
+        for bill_id in bill_ids[written_bills:]:
+            writer.write_rows(journal.rows(bill_id))
+    finally:
+        writer.close()
+        journal.close()
+    
+    total_rows = writer.rows_written
+    if total_rows:
+        os.replace(tmp_path, output_path)
+    elif os.path.exists(tmp_path):
+        os.remove(tmp_path)
+    
+    # 최종 진행 상황 저장
+    with open(progress_file, 'a', encoding='utf-8') as f:
+        f.write(f"\n수집 완료 시간: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+        f.write(f"표결 정보 수집 결과:\n")
+        f.write(f"- 성공: {success_count}개 법안\n")
+        f.write(f"- 정보 없음: {empty_count}개 법안\n")
+        f.write(f"- 오류: {error_count}개 법안\n")
+        f.write(f"- 이전 실행에서 완료: {resumed_count}개 법안\n")
+        f.write(f"- 총 수집된 표결 정보: {total_rows}개\n")
+    
+    print(f"\n표결 정보 수집 완료:")
+    print(f"- 성공: {success_count}개 법안")
+    print(f"- 정보 없음: {empty_count}개 법안")
+    print(f"- 오류: {error_count}개 법안")
+    print(f"- 이전 실행에서 완료: {resumed_count}개 법안")
+    print(f"- 총 수집된 표결 정보: {total_rows}개")
+    if total_rows:
+        print(f"데이터가 '{output_path}'에 저장되었습니다. ({total_rows}개 행)")
+    
+    return total_rows
+
+def save_to_csv(data, filename=None, data_dir=DEFAULT_DATA_DIR, age='21'):
+    if not data:
+        print("저장할 데이터가 없습니다.")
+        return None
+    
+    if filename is None:
+        now = datetime.now().strftime("%Y%m%d_%H%M%S")
+        filename = os.path.join(data_dir, f"voting_data_{age}_{now}.csv")
+    
+    df = pd.DataFrame(data)
+    df.to_csv(filename, index=False, encoding='utf-8-sig')
+    print(f"데이터가 '{filename}'에 저장되었습니다.")
+    return filename
+
+def analyze_voting_data(data):
+    if data is None or len(data) == 0:
+        print("분석할 데이터가 없습니다.")
+        return None
+
+    stats = vote_statistics(data)
+
+    print("\n표결 결과별 통계:")
+    for result, count in stats['vote_results'].items():
+        print(f"- {result}: {count}개")
+
+    print("\n정당별 통계:")
+    for party, count in stats['parties'].items():
+        print(f"- {party}: {count}개")
+
+    print(f"\n총 법안 수: {len(stats['bills'])}개")
+    print(f"\n총 의원 수: {len(stats['members'])}명")
+    return stats
+
+def save_analysis_to_txt(analysis, filename=None, data_dir=DEFAULT_DATA_DIR, age='21'):
+    """텍스트 보고서와 같은 이름의 JSON 요약, 법안별/의원별/정당별 Parquet 표를 함께 저장한다."""
+    if not analysis:
+        print("저장할 분석 결과가 없습니다.")
+        return None
+
+    if filename is None:
+        now = datetime.now().strftime("%Y%m%d_%H%M%S")
+        filename = os.path.join(data_dir, f"voting_analysis_{now}.txt")
+
+    prefix = os.path.splitext(filename)[0]
+    save_report(analysis, vote_report(analysis, title=f"{age}대 국회 본회의 표결정보 분석 결과"), filename, json_path=f"{prefix}.json", parquet_prefix=prefix)
+
+    print(f"분석 결과가 '{filename}'에 저장되었습니다.")
+    return filename
+
+def main(config=None, max_workers=MAX_WORKERS, target_results=TARGET_RESULTS):
+    config = config or Config.from_env()
+    client = client_from_config(config, requests_per_second=REQUESTS_PER_SECOND)
+    
+    print(f"{config.age}대 국회 본회의 표결정보 수집 시작...")
+    os.makedirs(config.data_dir, exist_ok=True)
+    
+    # 로컬 법률안 저장소에서 표결 대상 법안 조회 (filter / bill_store import 로 채움)
+    with BillStore(config.store_path) as store:
+        bills = store.query(age=config.age, results=target_results)
+    print(f"저장소 '{config.store_path}'에서 {len(bills)}개 법안을 조회했습니다.")
+    
+    now = datetime.now().strftime("%Y%m%d_%H%M%S")
+    parquet_path = config.data_path(f"voting_data_{config.age}_{now}.parquet")
+    
+    # 요청 시간/재시도/처리량 지표를 주기적으로 metrics/votes.json, votes.prom 에 쓴다
+    with MetricsDumper(os.path.join(config.metrics_dir, 'votes')):
+        row_count = collect_voting_data_for_bills(client, bills, parquet_path, max_workers=max_workers,
+                                                  journal_path=config.journal_path, age=config.age)
+    
+    if row_count:
+        print(f"\n총 {row_count}개의 표결정보를 수집했습니다.")
+        
+        # 통계에 쓰는 열만 Parquet 에서 다시 읽는다
+        voting_data = pd.read_parquet(parquet_path, columns=['RESULT_VOTE_MOD', 'POLY_NM', 'BILL_NO', 'BILL_NAME',
+                                                             'HG_NM'])
+        analysis_results = analyze_voting_data(voting_data)
+        txt_path = save_analysis_to_txt(analysis_results, config.data_path(f"voting_analysis_{now}.txt"),
+                                        age=config.age)
+        
+        import pyarrow.parquet as pq
+        print("\n수집된 정보 필드:")
+        for key in pq.read_schema(parquet_path).names:
+            print(f"- {key}")
+        
+        print("\n작업이 완료되었습니다.")
+        print(f"- Parquet 파일: {parquet_path}")
+        print(f"- 분석 결과: {txt_path}")
+        return parquet_path
+
+if __name__ == "__main__":
+    main()
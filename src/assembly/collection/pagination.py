@@ -0,0 +1,43 @@
+"""
+국회 Open API 페이지 수집 도우미
+첫 페이지 응답의 list_total_count로 전체 페이지 수를 구한 뒤, 나머지 페이지를 동시에 가져온다.
+"""
+import math
+from concurrent.futures import ThreadPoolExecutor
+
+# Open API가 한 번에 허용하는 최대 pSize (초과 시 ERROR-336)
+MAX_PAGE_SIZE = 1000
+
+
+def read_total_count(envelope):
+    """data[서비스명][0]['head'] 에서 list_total_count를 읽는다."""
+    for item in envelope[0]['head']:
+        if 'list_total_count' in item:
+            return int(item['list_total_count'])
+    return 0
+
+
+def fetch_all_pages(fetch_page, page_size, max_workers=4):
+    """fetch_page(page_index)는 (전체 건수, 행 목록)을 반환하고, 실패하면 None을 반환하거나 예외를 던진다.
+
+    모든 페이지를 페이지 순서대로 이어 붙인 행 목록을 반환하며, 한 페이지라도 실패하면 None을 반환한다.
+    """
+    first = fetch_page(1)
+    if first is None:
+        return None
+
+    total_count, rows = first
+    rows = list(rows)
+    page_count = math.ceil(total_count / page_size)
+    if page_count <= 1:
+        return rows
+
+    remaining = range(2, page_count + 1)
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(remaining))) as executor:
+        pages = list(executor.map(fetch_page, remaining))
+
+    for page in pages:
+        if page is None:
+            return None
+        rows.extend(page[1])
+    return rows
@@ -0,0 +1,37 @@
+"""
+토큰 버킷 기반 요청 속도 제한기
+여러 스레드가 하나의 인스턴스를 공유해도 전체 요청 속도가 rate를 넘지 않도록 보장한다.
+"""
+import threading
+import time
+
+
+class TokenBucket:
+    def __init__(self, rate, burst=None):
+        if rate <= 0:
+            raise ValueError("rate는 0보다 커야 합니다.")
+        self.rate = float(rate)
+        self.capacity = float(burst if burst is not None else max(1.0, rate))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        elapsed = now - self._updated
+        if elapsed > 0:
+            self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+            self._updated = now
+
+    def acquire(self, tokens=1):
+        """토큰을 얻을 때까지 대기한다. 실제로 대기한 시간(초)을 반환한다."""
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return waited
+                wait = (tokens - self._tokens) / self.rate
+            time.sleep(wait)
+            waited += wait
@@ -0,0 +1,117 @@
+"""
+국회 Open API 응답 디스크 캐시
+엔드포인트와 요청 파라미터(인증키 제외)의 해시를 주소로 원본 응답을 gzip 압축해 저장한다.
+엔드포인트별 TTL과 전체 용량 상한(가장 오래 사용되지 않은 항목부터 삭제)을 지원한다.
+"""
+import gzip
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+# 캐시 키에서 제외할 파라미터 (인증키가 바뀌어도 같은 응답을 재사용)
+IGNORED_PARAMS = {'KEY'}
+
+
+def cache_key(endpoint, params):
+    normalized = {k: str(v) for k, v in params.items() if k not in IGNORED_PARAMS}
+    payload = json.dumps({'endpoint': endpoint, 'params': normalized}, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class ResponseCache:
+    def __init__(self, cache_dir, ttls=None, default_ttl=None, max_bytes=2 * 1024 ** 3):
+        """ttls는 {엔드포인트: 유효 시간(초)} 이며, None은 만료되지 않음을 뜻한다."""
+        self.cache_dir = cache_dir
+        self.ttls = dict(ttls or {})
+        self.default_ttl = default_ttl
+        self.max_bytes = max_bytes
+        os.makedirs(os.path.join(cache_dir, 'objects'), exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(os.path.join(cache_dir, 'index.db'), check_same_thread=False)
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS entries (
+                key TEXT PRIMARY KEY,
+                endpoint TEXT NOT NULL,
+                params TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created REAL NOT NULL,
+                accessed REAL NOT NULL
+            )""")
+        self._db.execute("CREATE INDEX IF NOT EXISTS idx_entries_accessed ON entries (accessed)")
+        self._db.commit()
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, 'objects', key[:2], f"{key}.json.gz")
+
+    def _ttl(self, endpoint):
+        return self.ttls.get(endpoint, self.default_ttl)
+
+    def get(self, endpoint, params, ignore_ttl=False):
+        """캐시된 원본 응답(bytes)을 반환한다. 없거나 만료되었으면 None."""
+        key = cache_key(endpoint, params)
+        with self._lock:
+            row = self._db.execute("SELECT created FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            ttl = self._ttl(endpoint)
+            if not ignore_ttl and ttl is not None and time.time() - row[0] > ttl:
+                return None
+            try:
+                with gzip.open(self._path(key), 'rb') as f:
+                    body = f.read()
+            except (OSError, EOFError):
+                # 인덱스와 파일이 어긋난 경우 항목을 버린다
+                self._db.execute("DELETE FROM entries WHERE key = ?", (key,))
+                self._db.commit()
+                return None
+            self._db.execute("UPDATE entries SET accessed = ? WHERE key = ?", (time.time(), key))
+            self._db.commit()
+        return body
+
+    def put(self, endpoint, params, body):
+        key = cache_key(endpoint, params)
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with gzip.open(tmp_path, 'wb') as f:
+            f.write(body)
+        os.replace(tmp_path, path)
+
+        size = os.path.getsize(path)
+        now = time.time()
+        normalized = {k: str(v) for k, v in params.items() if k not in IGNORED_PARAMS}
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO entries (key, endpoint, params, size, created, accessed) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, endpoint, json.dumps(normalized, sort_keys=True, ensure_ascii=False), size, now, now))
+            self._db.commit()
+            self._evict()
+
+    def _evict(self):
+        total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, size in self._db.execute("SELECT key, size FROM entries ORDER BY accessed").fetchall():
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(self._path(key))
+            except FileNotFoundError:
+                pass
+            self._db.execute("DELETE FROM entries WHERE key = ?", (key,))
+            total -= size
+        self._db.commit()
+
+    def stats(self):
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT endpoint, COUNT(*), SUM(size) FROM entries GROUP BY endpoint").fetchall()
+        return {endpoint: {'entries': count, 'bytes': size} for endpoint, count, size in rows}
+
+    def close(self):
+        self._db.close()
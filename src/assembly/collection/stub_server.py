@@ -0,0 +1,119 @@
+"""
+국회 Open API 로컬 스텁 서버
+response_cache.py로 저장된 응답을 그대로 재생하여, 인증키와 네트워크 없이 수집기를 개발/테스트/벤치마크할 수 있게 한다.
+실제 API 처럼 응답 지연(latency, 0.5~1.5배 무작위)과 일시 오류(error_rate 비율로 HTTP 503 또는 ERROR-500)를
+넣어 재시도/동시 요청 경로도 확인할 수 있다.
+
+사용 예:
+    python -m assembly.collection.stub_server --cache-dir data/api_cache --port 8765
+    python -m assembly.collection.stub_server --latency 0.05 --error-rate 0.02
+    ASSEMBLY_API_BASE_URL=http://127.0.0.1:8765/portal/openapi ASSEMBLY_API_KEY=stub assembly collect-votes
+"""
+import argparse
+import gzip
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from ..config import Config
+from .response_cache import ResponseCache
+
+PATH_PREFIX = '/portal/openapi/'
+
+
+TRANSIENT_ERROR = {'RESULT': {'CODE': 'ERROR-500', 'MESSAGE': '서버 오류입니다. (스텁 서버가 넣은 오류)'}}
+
+
+def make_handler(cache, latency=0.0, error_rate=0.0, seed=None):
+    rng = random.Random(seed)
+    rng_lock = threading.Lock()
+
+    def draw():
+        with rng_lock:
+            return rng.random(), rng.uniform(0.5, 1.5)
+
+    class StubHandler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def log_message(self, format, *args):
+            pass
+
+        def _send(self, status, body):
+            if 'gzip' in self.headers.get('Accept-Encoding', ''):
+                body = gzip.compress(body)
+                encoding = 'gzip'
+            else:
+                encoding = None
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json; charset=utf-8')
+            if encoding:
+                self.send_header('Content-Encoding', encoding)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            if not url.path.startswith(PATH_PREFIX):
+                self._send(404, b'{}')
+                return
+            endpoint = url.path[len(PATH_PREFIX):].strip('/')
+
+            failure, jitter = draw()
+            if latency:
+                time.sleep(latency * jitter)
+            if failure < error_rate:
+                # 절반은 HTTP 오류, 절반은 정상 응답 안의 결과 코드 오류
+                if failure < error_rate / 2:
+                    self._send(503, b'{}')
+                else:
+                    self._send(200, json.dumps(TRANSIENT_ERROR, ensure_ascii=False).encode('utf-8'))
+                return
+            params = {k: v[0] for k, v in parse_qs(url.query).items()}
+
+            body = cache.get(endpoint, params, ignore_ttl=True)
+            if body is None:
+                # 캐시에 없는 요청은 수집기가 오류로 기록하도록 404로 응답한다
+                miss = {'RESULT': {'CODE': 'ERROR-404', 'MESSAGE': '스텁 캐시에 없는 요청입니다.'}}
+                self._send(404, json.dumps(miss, ensure_ascii=False).encode('utf-8'))
+                return
+            self._send(200, body)
+
+    return StubHandler
+
+
+def serve(cache, host='127.0.0.1', port=8765, latency=0.0, error_rate=0.0, seed=None):
+    """port=0 이면 빈 포트를 쓴다 (server.server_port). 호출하는 쪽에서 serve_forever 를 실행한다."""
+    server = ThreadingHTTPServer((host, port), make_handler(cache, latency, error_rate, seed))
+    server.daemon_threads = True
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="국회 Open API 캐시 재생 스텁 서버")
+    parser.add_argument('--cache-dir', default=Config.from_env().cache_dir)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency', type=float, default=0.0, help="평균 응답 지연 (초)")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="일시 오류로 응답할 요청 비율 (0~1)")
+    parser.add_argument('--seed', type=int, default=None)
+    args = parser.parse_args()
+
+    cache = ResponseCache(args.cache_dir)
+    server = serve(cache, args.host, args.port, latency=args.latency, error_rate=args.error_rate, seed=args.seed)
+    print(f"스텁 서버 시작: http://{args.host}:{server.server_port}{PATH_PREFIX}")
+    for endpoint, stat in cache.stats().items():
+        print(f"- {endpoint}: {stat['entries']}개 응답 ({stat['bytes']} bytes)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n스텁 서버를 종료합니다.")
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+경로/설정
+모든 경로는 여기서 한 번 정해 명시적으로 넘긴다 (작업 디렉토리에 따라 달라지는 '../../data' 같은
+상대 경로를 쓰지 않는다). 기본값은 저장소 루트에서 실행한다고 보고, 환경 변수나 CLI 옵션으로 바꾼다.
+
+    ASSEMBLY_DATA_DIR       수집 데이터 폴더 (기본: data)
+    ASSEMBLY_ANALYSIS_DIR   분석 결과 폴더 (기본: src/data/analysis)
+    ASSEMBLY_API_KEY_FILE   API 키 파일 (기본: api_key.txt, ASSEMBLY_API_KEY 가 있으면 그 값을 씀)
+    ASSEMBLY_AGE            국회 대수 (기본: 21)
+
+이 모듈은 표준 라이브러리만 써서 CLI 시작 시간을 늘리지 않는다.
+"""
+import glob
+import os
+from dataclasses import dataclass, replace
+
+DEFAULT_DATA_DIR = "data"
+DEFAULT_ANALYSIS_DIR = os.path.join("src", "data", "analysis")
+DEFAULT_API_KEY_PATH = "api_key.txt"
+DEFAULT_AGE = '21'
+
+
+@dataclass
+class Config:
+    data_dir: str = DEFAULT_DATA_DIR
+    analysis_dir: str = DEFAULT_ANALYSIS_DIR
+    api_key_path: str = DEFAULT_API_KEY_PATH
+    age: str = DEFAULT_AGE
+
+    @classmethod
+    def from_env(cls, **overrides):
+        """환경 변수로 기본값을 정하고, None 이 아닌 overrides 로 덮어쓴다."""
+        config = cls(
+            data_dir=os.environ.get('ASSEMBLY_DATA_DIR', DEFAULT_DATA_DIR),
+            analysis_dir=os.environ.get('ASSEMBLY_ANALYSIS_DIR', DEFAULT_ANALYSIS_DIR),
+            api_key_path=os.environ.get('ASSEMBLY_API_KEY_FILE', DEFAULT_API_KEY_PATH),
+            age=os.environ.get('ASSEMBLY_AGE', DEFAULT_AGE),
+        )
+        for key, value in overrides.items():
+            if value is not None:
+                setattr(config, key, str(value) if key == 'age' else value)
+        return config
+
+    def for_age(self, age):
+        """대수별로 분리된 폴더(data_dir/<age>, analysis_dir/<age>)를 쓰는 설정. API 키는 같이 쓴다."""
+        age = str(age)
+        return replace(self, data_dir=os.path.join(self.data_dir, age),
+                       analysis_dir=os.path.join(self.analysis_dir, age), age=age)
+
+    def data_path(self, *parts):
+        return os.path.join(self.data_dir, *parts)
+
+    def analysis_path(self, *parts):
+        return os.path.join(self.analysis_dir, *parts)
+
+    @property
+    def cache_dir(self):
+        return self.data_path("api_cache")
+
+    @property
+    def store_path(self):
+        return self.data_path("bills.db")
+
+    @property
+    def journal_path(self):
+        return self.data_path("voting_collection_journal.jsonl")
+
+    @property
+    def metrics_dir(self):
+        return self.data_path("metrics")
+
+    @property
+    def matrix_cache_dir(self):
+        return self.analysis_path("matrix_cache")
+
+    def latest(self, pattern):
+        """data_dir 안에서 pattern 에 맞는 가장 최근(이름 순 마지막) 파일. 없으면 None."""
+        matches = sorted(glob.glob(self.data_path(pattern)))
+        return matches[-1] if matches else None
+
+    def latest_votes(self):
+        """가장 최근 표결 수집 결과 (Parquet 우선, 없으면 CSV)."""
+        return (self.latest(f"voting_data_{self.age}_*.parquet")
+                or self.latest(f"voting_data_{self.age}_*.csv"))
@@ -0,0 +1,421 @@
+"""
+수집-분석 파이프라인
+법률안 동기화 → 표결 대상 법안 → 표결정보 수집 → 투표 행렬 / 표결 통계 → W-NOMINATE → 시각화
+단계를 선언적으로 정의하고, 단계마다 입력 파일 내용, 파라미터, 코드의 해시(키)를 매니페스트
+(data_dir/pipeline_manifest.json)에 기록한다. 키가 같고 기록된 산출물이 그대로 있는 단계는 건너뛰고,
+바뀐 단계와 그 아래 단계만 다시 실행한다. 의존 관계가 없는 단계는 동시에 실행한다.
+
+입력은 파일 이름이 아니라 내용으로 비교하므로, 윗단계가 다시 실행되어도 산출물이 같으면
+아랫단계는 실행되지 않는다. 외부 API 에 의존하는 단계(volatile)는 매번 실행해 변경 여부를
+확인하며(bill_sync 의 증분 동기화), --offline 이면 기존 산출물을 그대로 쓴다.
+
+파일 해시는 크기/수정 시각과 함께 매니페스트에 남겨 두고, 둘 다 같으면 다시 읽지 않는다.
+실행 중에는 API/처리량 지표(telemetry)를 data_dir/metrics/pipeline.json, pipeline.prom 에 주기적으로 쓰고,
+profile 을 주면 실행한 단계마다 data_dir/profiles/ 에 프로파일을 남긴다 (cprofile 이면 단계를 하나씩 실행).
+
+사용 예:
+    assembly run                       # 바뀐 단계만 실행
+    assembly run --dry-run             # 실행될 단계만 확인
+    assembly run plot --force scale    # plot 까지 필요한 단계만, scale 은 강제로 다시
+    assembly run votes --profile sample
+"""
+import ast
+import hashlib
+import importlib.util
+import inspect
+import json
+import os
+import threading
+import textwrap
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+
+from .telemetry import DEFAULT_DUMP_INTERVAL, MetricsDumper, profile_stage
+
+MANIFEST_VERSION = 1
+MANIFEST_NAME = "pipeline_manifest.json"
+PROFILE_DIR = "profiles"
+
+# 단계 실행 결과
+RAN = 'ran'
+SKIPPED = 'skipped'
+FAILED = 'failed'
+BLOCKED = 'blocked'     # 윗단계 실패
+PENDING = 'pending'     # dry-run: 윗단계 결과에 따라 실행 여부가 정해짐
+
+
+def file_hash(path, chunk_size=1024 * 1024):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _hash_json(value):
+    return hashlib.sha256(json.dumps(value, sort_keys=True, ensure_ascii=False).encode('utf-8')).hexdigest()
+
+
+def _module_path(name):
+    """패키지 안 모듈 이름을 소스 파일 경로로 바꾼다 (불러오지 않음). 패키지 밖이거나 없으면 None"""
+    package, *parts = name.split('.')
+    if package != __package__:
+        return None
+    root = os.path.dirname(os.path.abspath(__file__))
+    base = os.path.join(root, *parts)
+    for path in (base + '.py', os.path.join(base, '__init__.py')):
+        if os.path.isfile(path):
+            return path
+    return None
+
+
+def _imported_modules(source, module_name, is_package=False):
+    """소스에서 가져오는(import) 패키지 안 모듈 이름. 함수 안의 지연 import 와 상대 import 도 포함한다."""
+    package_parts = module_name.split('.') if is_package else module_name.split('.')[:-1]
+    names = []
+    for node in ast.walk(ast.parse(source)):
+        if isinstance(node, ast.Import):
+            names.extend(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            if node.level:
+                base = package_parts[:len(package_parts) - node.level + 1]
+                base = '.'.join(base + ([node.module] if node.module else []))
+            else:
+                base = node.module
+            names.append(base)
+            # from .pkg import module 처럼 하위 모듈을 가져오는 경우
+            names.extend(f"{base}.{alias.name}" for alias in node.names)
+    return [name for name in names if _module_path(name) is not None]
+
+
+def module_closure(source, module_name, modules=()):
+    """source 와 modules 가 (간접적으로) 가져오는 패키지 안 모듈의 {이름: 경로}. 이름 순으로 정렬한다."""
+    pending = _imported_modules(source, module_name) + list(modules)
+    found = {}
+    while pending:
+        name = pending.pop()
+        path = _module_path(name)
+        if path is None or name in found:
+            continue
+        found[name] = path
+        with open(path, 'r', encoding='utf-8') as f:
+            pending.extend(_imported_modules(f.read(), name, is_package=path.endswith('__init__.py')))
+    return dict(sorted(found.items()))
+
+
+@dataclass
+class Stage:
+    """파이프라인 단계.
+
+    func(config, inputs, outputs, **params) 는 outputs 경로에 산출물을 써야 한다.
+    outputs 는 경로 템플릿으로 {data}, {analysis}, {age} 와 params 의 키를 쓸 수 있다.
+    inputs 는 deps 단계 산출물을 순서대로 이어 붙인 목록이다.
+    """
+    name: str
+    func: object
+    outputs: list
+    deps: list = field(default_factory=list)
+    params: dict = field(default_factory=dict)
+    modules: list = field(default_factory=list)  # 코드 해시에 넣을 모듈 (불러오지 않고 파일만 읽음, 간접 import 포함)
+    volatile: bool = False                       # 외부 데이터에 의존: 매번 실행
+
+    def output_paths(self, config):
+        values = {**self.params, 'data': config.data_dir, 'analysis': config.analysis_dir, 'age': config.age}
+        return [os.path.normpath(template.format(**values)) for template in self.outputs]
+
+    def code_hash(self):
+        """func 소스와, func 와 modules 가 가져오는 패키지 안 모듈 전체(간접 import 포함)의 해시"""
+        source = inspect.getsource(self.func)
+        digest = hashlib.sha256(source.encode('utf-8'))
+        for module in self.modules:
+            # 패키지 밖 모듈도 명시하면 해시에 넣는다
+            if _module_path(module) is None:
+                with open(importlib.util.find_spec(module).origin, 'rb') as f:
+                    digest.update(f.read())
+        for name, path in module_closure(textwrap.dedent(source), self.func.__module__, self.modules).items():
+            digest.update(name.encode('utf-8'))
+            with open(path, 'rb') as f:
+                digest.update(f.read())
+        return digest.hexdigest()
+
+
+class Manifest:
+    """단계별 키/입력/산출물 기록과 파일 해시 캐시. 여러 스레드에서 함께 쓴다."""
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        data = {}
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        if data.get('version') != MANIFEST_VERSION:
+            data = {}
+        self.stages = data.get('stages', {})
+        self.files = data.get('files', {})
+
+    def hash(self, path):
+        """파일 내용 해시. 크기와 수정 시각이 기록과 같으면 파일을 다시 읽지 않는다."""
+        stat = os.stat(path)
+        key = os.path.abspath(path)
+        with self._lock:
+            cached = self.files.get(key)
+        if cached and cached['size'] == stat.st_size and cached['mtime_ns'] == stat.st_mtime_ns:
+            return cached['hash']
+        digest = file_hash(path)
+        with self._lock:
+            self.files[key] = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'hash': digest}
+        return digest
+
+    def outputs_intact(self, name, paths):
+        record = self.stages.get(name)
+        if record is None or sorted(record['outputs']) != sorted(paths):
+            return False
+        return all(os.path.exists(path) and self.hash(path) == digest for path, digest in record['outputs'].items())
+
+    def record(self, name, record):
+        with self._lock:
+            self.stages[name] = record
+            self._save()
+
+    def flush(self):
+        """건너뛴 단계에서 새로 계산한 파일 해시도 남긴다."""
+        with self._lock:
+            self._save()
+
+    def _save(self):
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': MANIFEST_VERSION, 'stages': self.stages, 'files': self.files},
+                      f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.path)
+
+
+class Pipeline:
+    def __init__(self, stages):
+        self.stages = {stage.name: stage for stage in stages}
+        for stage in stages:
+            for dep in stage.deps:
+                if dep not in self.stages:
+                    raise ValueError(f"'{stage.name}' 단계의 윗단계 '{dep}'가 없습니다.")
+
+    def required(self, targets=None):
+        """targets 와 그 윗단계 이름 (정의 순서). targets 가 없으면 전체."""
+        if not targets:
+            return list(self.stages)
+        needed = set()
+        stack = list(targets)
+        while stack:
+            name = stack.pop()
+            if name not in self.stages:
+                raise ValueError(f"없는 단계입니다: {name}")
+            if name not in needed:
+                needed.add(name)
+                stack.extend(self.stages[name].deps)
+        return [name for name in self.stages if name in needed]
+
+    def inputs(self, stage, config):
+        return [path for dep in stage.deps for path in self.stages[dep].output_paths(config)]
+
+    def stage_key(self, stage, config, manifest):
+        inputs = self.inputs(stage, config)
+        missing = [path for path in inputs if not os.path.exists(path)]
+        if missing:
+            raise FileNotFoundError(f"'{stage.name}' 단계의 입력 파일이 없습니다: {', '.join(missing)}")
+        return _hash_json({
+            'code': stage.code_hash(),
+            'params': stage.params,
+            'age': config.age,
+            'inputs': [manifest.hash(path) for path in inputs],
+        })
+
+    def _decide(self, stage, config, manifest, force, offline):
+        """(실행 여부, 키, 이유)"""
+        outputs = stage.output_paths(config)
+        if stage.volatile:
+            if not offline:
+                return True, self.stage_key(stage, config, manifest), "외부 데이터 확인"
+            if not manifest.outputs_intact(stage.name, outputs):
+                raise FileNotFoundError(f"오프라인 실행인데 '{stage.name}' 단계의 이전 산출물이 없습니다.")
+            return False, manifest.stages[stage.name]['key'], "오프라인"
+        key = self.stage_key(stage, config, manifest)
+        if stage.name in force:
+            return True, key, "강제 실행"
+        if manifest.stages.get(stage.name, {}).get('key') != key:
+            return True, key, "입력/파라미터/코드 변경"
+        if not manifest.outputs_intact(stage.name, outputs):
+            return True, key, "산출물 없음 또는 변경"
+        return False, key, "변경 없음"
+
+    def _execute(self, stage, config, manifest, key, profile=None):
+        inputs = self.inputs(stage, config)
+        outputs = stage.output_paths(config)
+        for path in outputs:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        started = time.time()
+        with profile_stage(stage.name, config.data_path(PROFILE_DIR), profile):
+            stage.func(config, inputs, outputs, **stage.params)
+        missing = [path for path in outputs if not os.path.exists(path)]
+        if missing:
+            raise RuntimeError(f"산출물이 만들어지지 않았습니다: {', '.join(missing)}")
+        manifest.record(stage.name, {
+            'key': key,
+            'params': stage.params,
+            'inputs': {path: manifest.hash(path) for path in inputs},
+            'outputs': {path: manifest.hash(path) for path in outputs},
+            'started': time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(started)),
+            'duration': round(time.time() - started, 3),
+        })
+
+    def run(self, config, targets=None, force=(), offline=False, max_workers=2, dry_run=False, verbose=True,
+            label=None, profile=None, metrics_interval=DEFAULT_DUMP_INTERVAL):
+        """필요한 단계를 실행하고 {단계: 상태} 를 반환한다. label 은 로그 앞에 붙는다 (여러 대수를 함께 돌릴 때).
+
+        profile: None, 'cprofile', 'sample' (telemetry.profile_stage). metrics_interval 이 0 이면 끝날 때만 쓴다.
+        """
+        manifest = Manifest(config.data_path(MANIFEST_NAME))
+        names = self.required(targets)
+        force = set(force)
+        status = {}
+
+        def log(message):
+            if verbose:
+                print(f"{label} {message}" if label else message, flush=True)
+
+        if dry_run:
+            for name in names:
+                stage = self.stages[name]
+                if any(status[dep] == PENDING for dep in stage.deps):
+                    status[name] = PENDING
+                    log(f"[{name}] 윗단계 결과에 따라 결정")
+                    continue
+                try:
+                    will_run, _, reason = self._decide(stage, config, manifest, force, offline)
+                except FileNotFoundError as e:
+                    will_run, reason = True, str(e)
+                status[name] = PENDING if will_run else SKIPPED
+                log(f"[{name}] {'실행' if will_run else '건너뜀'} ({reason})")
+            return status
+
+        if profile == 'cprofile':
+            # cProfile 은 동시에 하나만 켤 수 있다
+            max_workers = 1
+        remaining = list(names)
+        running = {}
+        dumper = MetricsDumper(os.path.join(config.metrics_dir, 'pipeline'), interval=metrics_interval)
+        with dumper, ThreadPoolExecutor(max_workers=max_workers) as executor:
+            while remaining or running:
+                ready = [name for name in remaining if all(dep in status for dep in self.stages[name].deps)]
+                if not ready and not running:
+                    raise ValueError(f"순환 의존 관계가 있습니다: {', '.join(remaining)}")
+                for name in ready:
+                    stage = self.stages[name]
+                    dep_status = [status[dep] for dep in stage.deps]
+                    remaining.remove(name)
+                    if any(s in (FAILED, BLOCKED) for s in dep_status):
+                        status[name] = BLOCKED
+                        log(f"[{name}] 윗단계 실패로 건너뜀")
+                        continue
+                    try:
+                        will_run, key, reason = self._decide(stage, config, manifest, force, offline)
+                    except Exception as e:
+                        status[name] = FAILED
+                        log(f"[{name}] 실패: {e}")
+                        continue
+                    if not will_run:
+                        status[name] = SKIPPED
+                        log(f"[{name}] 건너뜀 ({reason})")
+                        continue
+                    log(f"[{name}] 실행 ({reason})")
+                    running[executor.submit(self._execute, stage, config, manifest, key, profile)] = name
+
+                if not running:
+                    continue
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    try:
+                        future.result()
+                        status[name] = RAN
+                        log(f"[{name}] 완료 ({manifest.stages[name]['duration']:.1f}초)")
+                    except Exception as e:
+                        status[name] = FAILED
+                        log(f"[{name}] 실패: {e}")
+        manifest.flush()
+        return status
+
+
+# 기본 파이프라인 단계. 각 단계는 해당 모듈을 실행할 때만 불러온다.
+
+def sync_bills(config, inputs, outputs):
+    from .collection.bill_sync import main
+    main(config)
+
+
+def target_bills(config, inputs, outputs, results):
+    from .collection.filter_bills import filter_bills
+    filter_bills(inputs[0], results, store_path=config.store_path, age=config.age,
+                 output_csv=outputs[0], report_dir=config.data_dir)
+
+
+def collect_votes(config, inputs, outputs):
+    import pandas as pd
+    from .collection.assembly_api import client_from_config
+    from .collection.get_voting_data import MAX_WORKERS, REQUESTS_PER_SECOND, collect_voting_data_for_bills
+    client = client_from_config(config, requests_per_second=REQUESTS_PER_SECOND)
+    bills = pd.read_csv(inputs[0], dtype=str, encoding='utf-8-sig')
+    if not collect_voting_data_for_bills(client, bills, outputs[0], max_workers=MAX_WORKERS,
+                                         journal_path=config.journal_path, age=config.age):
+        raise RuntimeError("수집된 표결 정보가 없습니다.")
+
+
+def vote_stats(config, inputs, outputs):
+    import pandas as pd
+    from .collection.collection_stats import save_report, vote_report, vote_statistics
+    stats = vote_statistics(pd.read_parquet(inputs[0]))
+    save_report(stats, vote_report(stats, title=f"{config.age}대 국회 본회의 표결정보 분석 결과"), outputs[0],
+                json_path=outputs[1])
+
+
+def build_matrix(config, inputs, outputs):
+    from .analysis.vote_matrix import main
+    main(config, voting_file=inputs[0])
+
+
+def scale(config, inputs, outputs, dims, bootstrap):
+    from .analysis.wnominate import run
+    run(config, dims=dims, bootstrap_trials=bootstrap)
+
+
+def plot(config, inputs, outputs, parties, suffix, dpi):
+    from .analysis.visualize_wnominate import run
+    # scale 단계 결과(inputs[0])가 아니라 visualize_wnominate.run 의 기본 입력(R 결과 우선)을 그린다
+    run(config, parties=parties, suffix=suffix, dpi=dpi)
+
+
+def default_pipeline(dims=2, bootstrap=0, results=("원안가결", "수정가결", "부결"),
+                     parties=("더불어민주당", "국민의힘", "정의당"), suffix='3parties', dpi=300):
+    return Pipeline([
+        Stage('sync', sync_bills, ["{data}/assembly_bills_{age}_latest.csv"], volatile=True,
+              modules=['assembly.collection.bill_sync', 'assembly.collection.get_assembly_bill']),
+        Stage('targets', target_bills, ["{data}/target_bills_{age}.csv"], deps=['sync'],
+              params={'results': list(results)},
+              modules=['assembly.collection.filter_bills', 'assembly.collection.bill_store']),
+        Stage('votes', collect_votes, ["{data}/voting_data_{age}_latest.parquet"], deps=['targets'],
+              modules=['assembly.collection.get_voting_data', 'assembly.collection.columnar_store']),
+        Stage('vote-stats', vote_stats, ["{data}/voting_analysis_{age}.txt", "{data}/voting_analysis_{age}.json"],
+              deps=['votes'], modules=['assembly.collection.collection_stats']),
+        Stage('matrix', build_matrix, ["{analysis}/vote_table_num.csv", "{analysis}/member_no_party.csv",
+                                       "{analysis}/member_party_history.csv"],
+              deps=['votes'], modules=['assembly.analysis.vote_matrix', 'assembly.analysis.member_registry']),
+        Stage('scale', scale, ["{analysis}/wnominate_results_py.csv"], deps=['matrix'],
+              params={'dims': dims, 'bootstrap': bootstrap},
+              modules=['assembly.analysis.wnominate', 'assembly.analysis.wnominate_bootstrap']),
+        Stage('plot', plot, ["{analysis}/wnominate_distribution_{suffix}.png",
+                             "{analysis}/wnominate_party_boxplot_{suffix}.png",
+                             "{analysis}/wnominate_party_performance_{suffix}.png"],
+              deps=['scale'], params={'parties': list(parties), 'suffix': suffix, 'dpi': dpi},
+              modules=['assembly.analysis.visualize_wnominate']),
+    ])
@@ -0,0 +1,223 @@
+"""
+가상 본회의 표결 데이터 생성
+공간 투표 모형(W-NOMINATE 와 같은 효용 함수)으로 의원 x 법안 표결을 만들어, 실제 수집 없이
+행렬 생성, 통계, 추정, 시각화, 수집기를 원하는 크기(300 x 3,000 ~ 300 x 100,000)로 돌려 볼 수 있게 한다.
+
+21대 국회 표결 데이터와 비슷하게 만든다.
+    - 대부분의 법안은 거의 만장일치 찬성이고, 일부(contested_share)만 정당 간에 갈린다.
+    - 불참(4)은 의원마다 다른 불참 성향(평균 약 20%)과 회의마다 다른 출석률로 정한다.
+    - 기권(3)은 반대 쪽 표의 일부(abstain_share)다 (run_wnominate.R 에서는 기권도 반대로 본다).
+    - 임기 중에 들어오거나 나간 의원(partial_share)은 임기 밖 법안이 결측(0, 표결 행 없음)이다.
+표결 코드는 prepare_wnominate_data.R 과 같다 (0 결측, 1 찬성, 2 반대, 3 기권, 4 불참).
+
+사용 예:
+    from assembly.synthetic import generate
+    data = generate(n_members=300, n_bills=20000, seed=1)
+    data.matrix            # VoteMatrix (법안 x 의원 int8)
+    data.to_long()         # 수집 결과와 같은 열의 긴 형식 DataFrame
+"""
+import json
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from .analysis.vote_matrix import ABSTAIN, MISSING, NAY, NOT_IN_LEGIS, YEA, VoteMatrix
+from .analysis.wnominate import DEFAULT_BETA, DEFAULT_WEIGHT, norm_cdf
+
+# (정당, 의석 비율, 1차원 중심)
+DEFAULT_PARTIES = [
+    ('더불어민주당', 0.55, -0.45),
+    ('국민의힘', 0.35, 0.5),
+    ('정의당', 0.03, -0.75),
+    ('무소속', 0.07, 0.0),
+]
+RESULT_LABELS = {YEA: '찬성', NAY: '반대', ABSTAIN: '기권', NOT_IN_LEGIS: '불참'}
+
+# 본회의 한 번에 처리하는 법안 수 (표결일 간격을 정할 때 쓴다)
+BILLS_PER_SESSION = 40
+FIRST_SESSION = '2020-06-01'
+
+# 한 번에 효용을 계산할 (의원 x 법안) 셀 수
+CHUNK_CELLS = 2_000_000
+
+
+@dataclass
+class SyntheticRollCalls:
+    matrix: VoteMatrix
+    members: pd.DataFrame      # MEMBER_NO, POLY_NM, HG_NM, HJ_NM, MONA_CD (matrix.member_ids 순서)
+    bills: pd.DataFrame        # BILL_ID, BILL_NO, BILL_NAME, VOTE_DATE, CONTESTED (matrix.bill_ids 순서)
+    ideal_points: np.ndarray   # 참값 (의원 x 차원)
+    age: str = '21'
+
+    def to_long(self):
+        """결측이 아닌 칸마다 한 행인 긴 형식 표결 데이터 (국회 API 표결정보와 같은 열).
+
+        문자열 열은 category 로 만들어 300 x 100,000 크기에서도 메모리를 적게 쓴다.
+        """
+        votes = self.matrix.votes
+        bill_index, member_index = np.nonzero(votes != MISSING)
+        codes = votes[bill_index, member_index]
+
+        def take(values, index):
+            codes, uniques = pd.factorize(np.asarray(values, dtype=object))
+            return pd.Categorical.from_codes(codes[index], uniques)
+
+        labels = np.array([RESULT_LABELS.get(code, '') for code in range(max(RESULT_LABELS) + 1)], dtype=object)
+        return pd.DataFrame({
+            'AGE': pd.Categorical.from_codes(np.zeros(len(codes), dtype=np.int8), [self.age]),
+            'BILL_ID': take(self.bills['BILL_ID'], bill_index),
+            'BILL_NO': take(self.bills['BILL_NO'], bill_index),
+            'BILL_NAME': take(self.bills['BILL_NAME'], bill_index),
+            'VOTE_DATE': take(self.bills['VOTE_DATE'], bill_index),
+            'MEMBER_NO': take(self.members['MEMBER_NO'], member_index),
+            'MONA_CD': take(self.members['MONA_CD'], member_index),
+            'HG_NM': take(self.members['HG_NM'], member_index),
+            'HJ_NM': take(self.members['HJ_NM'], member_index),
+            'POLY_NM': take(self.members['POLY_NM'], member_index),
+            'RESULT_VOTE_MOD': pd.Categorical.from_codes(codes.astype(np.int64), labels),
+        })
+
+    def bill_rows(self, bill_id):
+        """법안 하나의 표결 행(dict) 목록. 스텁 서버 응답을 만들 때 쓴다."""
+        j = int(np.flatnonzero(self.bills['BILL_ID'].to_numpy() == bill_id)[0])
+        bill = self.bills.iloc[j]
+        rows = []
+        for i in np.flatnonzero(self.matrix.votes[j] != MISSING):
+            member = self.members.iloc[i]
+            rows.append({
+                'HG_NM': member['HG_NM'], 'HJ_NM': member['HJ_NM'], 'POLY_NM': member['POLY_NM'],
+                'MEMBER_NO': member['MEMBER_NO'], 'MONA_CD': member['MONA_CD'],
+                'RESULT_VOTE_MOD': RESULT_LABELS[int(self.matrix.votes[j, i])],
+                'BILL_ID': bill['BILL_ID'], 'BILL_NO': bill['BILL_NO'], 'BILL_NAME': bill['BILL_NAME'],
+                'VOTE_DATE': bill['VOTE_DATE'], 'AGE': self.age,
+            })
+        return rows
+
+
+def _ideal_points(rng, party_index, centers, dims):
+    ideal = np.zeros((len(party_index), dims))
+    ideal[:, 0] = centers[party_index] + rng.normal(0, 0.15, len(party_index))
+    if dims > 1:
+        ideal[:, 1:] = rng.normal(0, 0.3, (len(party_index), dims - 1))
+    norms = np.linalg.norm(ideal, axis=1, keepdims=True)
+    return ideal / np.maximum(norms, 1.0)
+
+
+def _bill_points(rng, n_bills, dims, contested):
+    """법안별 (찬성 결과 좌표, 반대 결과 좌표). 합의 법안은 거의 모든 의원이 찬성 쪽에 있도록 절단점을 민다."""
+    direction = rng.normal(size=(n_bills, dims))
+    direction[:, 0] *= 2.0  # 1차원(정당 축) 쪽으로 기운 법안이 많다
+    direction /= np.linalg.norm(direction, axis=1, keepdims=True)
+    cut = np.where(contested, rng.normal(0, 0.3, n_bills), rng.uniform(1.0, 1.4, n_bills))
+    spread = rng.uniform(0.2, 0.6, n_bills)
+    # 찬성 쪽이 -direction 방향: 절단점이 멀수록 모두 찬성
+    midpoint = direction * cut[:, None]
+    yea = midpoint - direction * spread[:, None] / 2
+    nay = midpoint + direction * spread[:, None] / 2
+    return yea, nay
+
+
+def _yea_probability(ideal, yea, nay, beta, weights):
+    w2 = weights ** 2
+    dy = ((ideal[:, None, :] - yea[None, :, :]) ** 2 * w2).sum(axis=2)
+    dn = ((ideal[:, None, :] - nay[None, :, :]) ** 2 * w2).sum(axis=2)
+    return norm_cdf(beta * (np.exp(-0.5 * dy) - np.exp(-0.5 * dn)))
+
+
+def _service(rng, n_members, n_bills, partial_share):
+    """의원별 임기 [시작, 끝) 법안 번호. partial_share 만큼은 중간에 들어오거나 나간다."""
+    start = np.zeros(n_members, dtype=np.int64)
+    end = np.full(n_members, n_bills, dtype=np.int64)
+    partial = np.flatnonzero(rng.random(n_members) < partial_share)
+    late = rng.random(len(partial)) < 0.5
+    cut = rng.integers(n_bills // 10, n_bills - n_bills // 10 + 1, len(partial))
+    start[partial[late]] = cut[late]
+    end[partial[~late]] = cut[~late]
+    return start, end
+
+
+def generate(n_members=300, n_bills=3000, dims=2, parties=DEFAULT_PARTIES, contested_share=0.1,
+             absent_rate=0.2, abstain_share=0.6, partial_share=0.08, beta=DEFAULT_BETA, weights=None, seed=0,
+             age='21'):
+    """가상 표결 데이터를 만든다. 같은 seed 면 같은 결과가 나온다."""
+    rng = np.random.default_rng(seed)
+    weights = np.asarray(weights if weights is not None else [1.0] + [DEFAULT_WEIGHT] * (dims - 1), dtype=float)
+
+    names = [p[0] for p in parties]
+    shares = np.array([p[1] for p in parties], dtype=float)
+    centers = np.array([p[2] for p in parties], dtype=float)
+    party_index = np.sort(rng.choice(len(parties), n_members, p=shares / shares.sum()))
+    ideal = _ideal_points(rng, party_index, centers, dims)
+
+    contested = rng.random(n_bills) < contested_share
+    yea_pts, nay_pts = _bill_points(rng, n_bills, dims, contested)
+
+    # 불참: 의원별 성향(Beta 분포) x 회의별 출석률
+    absent_propensity = rng.beta(2, 2 * (1 - absent_rate) / absent_rate, n_members)
+    session = np.arange(n_bills) // BILLS_PER_SESSION
+    session_shift = rng.normal(0, 0.5, session.max() + 1)[session]
+    service_start, service_end = _service(rng, n_members, n_bills, partial_share)
+
+    votes = np.empty((n_bills, n_members), dtype=np.int8)
+    chunk = max(1, CHUNK_CELLS // n_members)
+    for first in range(0, n_bills, chunk):
+        cols = slice(first, min(first + chunk, n_bills))
+        p_yea = _yea_probability(ideal, yea_pts[cols], nay_pts[cols], beta, weights).T  # 법안 x 의원
+        draw = rng.random(p_yea.shape)
+        code = np.where(draw < p_yea, YEA, np.where(rng.random(p_yea.shape) < abstain_share, ABSTAIN, NAY))
+        logit = np.log(absent_propensity / (1 - absent_propensity))[None, :] + session_shift[cols, None]
+        absent = rng.random(p_yea.shape) < 1 / (1 + np.exp(-logit))
+        code = np.where(absent, NOT_IN_LEGIS, code)
+        bill_pos = np.arange(cols.start, cols.stop)[:, None]
+        serving = (bill_pos >= service_start[None, :]) & (bill_pos < service_end[None, :])
+        votes[cols] = np.where(serving, code, MISSING)
+
+    member_ids = np.array([f"{age}{i + 1:011d}" for i in range(n_members)])
+    bill_numbers = np.array([f"{age}{j + 1:05d}" for j in range(n_bills)])
+    session_dates = pd.Timestamp(FIRST_SESSION) + pd.to_timedelta(session * 7, unit='D')
+    members = pd.DataFrame({
+        'MEMBER_NO': member_ids,
+        'POLY_NM': np.asarray(names, dtype=object)[party_index],
+        'HG_NM': [f"의원{i + 1:04d}" for i in range(n_members)],
+        'HJ_NM': [f"議員{i + 1:04d}" for i in range(n_members)],
+        'MONA_CD': [f"M{age}{i + 1:05d}" for i in range(n_members)],
+    })
+    bills = pd.DataFrame({
+        'BILL_ID': [f"PRC_SYN{age}{j + 1:07d}" for j in range(n_bills)],
+        'BILL_NO': bill_numbers,
+        'BILL_NAME': [f"가상법 일부개정법률안 {j + 1}" for j in range(n_bills)],
+        'VOTE_DATE': session_dates.strftime('%Y%m%d 150000'),
+        'CONTESTED': contested,
+    })
+    return SyntheticRollCalls(VoteMatrix(votes, bill_numbers, member_ids), members, bills, ideal, str(age))
+
+
+def api_response(endpoint, rows, total_count=None):
+    """국회 Open API 형식의 응답 본문 (bytes). 행이 없으면 INFO-200."""
+    if not rows and not total_count:
+        data = {'RESULT': {'CODE': 'INFO-200', 'MESSAGE': '해당하는 데이터가 없습니다.'}}
+    else:
+        head = [{'list_total_count': total_count if total_count is not None else len(rows)},
+                {'RESULT': {'CODE': 'INFO-000', 'MESSAGE': '정상 처리되었습니다.'}}]
+        data = {endpoint: [{'head': head}, {'row': rows}]}
+    return json.dumps(data, ensure_ascii=False).encode('utf-8')
+
+
+def fill_cache(cache, data, bill_ids=None, page_size=None):
+    """bill_ids(기본: 전부)의 표결정보 응답을 ResponseCache 에 넣는다. stub_server 가 그대로 재생한다.
+
+    요청 파라미터는 AssemblyApiClient.get_page 가 만드는 것과 같다 (인증키는 캐시 키에서 빠진다).
+    """
+    from .collection.assembly_api import VOTES_ENDPOINT
+    from .collection.pagination import MAX_PAGE_SIZE
+
+    page_size = page_size or MAX_PAGE_SIZE
+    bill_ids = data.bills['BILL_ID'] if bill_ids is None else bill_ids
+    for bill_id in bill_ids:
+        rows = data.bill_rows(bill_id)
+        pages = range(0, max(len(rows), 1), page_size)
+        for page_index, start in enumerate(pages, start=1):
+            params = {'Type': 'json', 'pIndex': page_index, 'pSize': page_size, 'AGE': data.age, 'BILL_ID': bill_id}
+            body = api_response(VOTES_ENDPOINT, rows[start:start + page_size], len(rows))
+            cache.put(VOTES_ENDPOINT, params, body)
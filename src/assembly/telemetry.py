@@ -0,0 +1,342 @@
+"""
+수집 계측과 단계별 프로파일링
+API 요청 시간(히스토그램), 원인별 재시도 수, 결과 코드별 응답 수, 전송 바이트, 캐시 적중, 속도 제한 대기,
+단계별 처리량(행/초)을 프로세스 안의 레지스트리 하나(REGISTRY)에 모으고, JSON 과 Prometheus 텍스트 형식으로
+주기적으로 파일에 쓴다 (MetricsDumper). 긴 수집 중에도 파일만 보면 동시 요청 수 조정이나 API 지연을 확인할 수 있다.
+
+단계별 프로파일링은 선택 사항이다 (profile_stage).
+    - cprofile: 단계를 실행한 스레드만 측정한다. <단계>.prof (pstats/snakeviz) 와 상위 함수 요약 <단계>.txt
+    - sample: 모든 스레드의 호출 스택을 일정 간격으로 모아 <단계>.folded 로 쓴다 (flamegraph.pl, speedscope).
+      수집기처럼 스레드 풀에서 일하는 단계는 sample 이 더 정확하다.
+
+이 모듈은 표준 라이브러리만 쓴다.
+"""
+import bisect
+import collections
+import contextlib
+import json
+import os
+import sys
+import threading
+import time
+
+# 요청 시간 버킷 (초)
+REQUEST_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+WAIT_BUCKETS = (0.001, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+
+COUNTER, GAUGE, HISTOGRAM = 'counter', 'gauge', 'histogram'
+
+# 지표 파일을 다시 쓰는 간격 (초)
+DEFAULT_DUMP_INTERVAL = 30.0
+
+# 이름: (종류, 설명, 히스토그램 버킷)
+METRICS = {
+    'assembly_api_request_seconds': (HISTOGRAM, "API 요청 한 번의 응답 시간 (재시도는 각각 센다)", REQUEST_BUCKETS),
+    'assembly_api_responses_total': (COUNTER, "결과 코드별 API 응답 수 (HTTP-5xx, NETWORK 등 포함)", None),
+    'assembly_api_retries_total': (COUNTER, "원인별 재시도 수", None),
+    'assembly_api_bytes_total': (COUNTER, "API 응답 본문 바이트 수 (gzip 압축을 푼 크기)", None),
+    'assembly_api_cache_hits_total': (COUNTER, "응답 캐시에서 바로 돌려준 요청 수", None),
+    'assembly_rate_limit_wait_seconds': (HISTOGRAM, "토큰 버킷 대기 시간", WAIT_BUCKETS),
+    'assembly_stage_items_total': (COUNTER, "단계별 처리 항목 수 (결과별)", None),
+    'assembly_stage_rows_total': (COUNTER, "단계별 수집 행 수", None),
+    'assembly_stage_seconds': (GAUGE, "단계 실행 시간 (실행 중이면 지금까지)", None),
+    'assembly_stage_rows_per_second': (GAUGE, "단계별 처리량 (행/초)", None),
+}
+
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)   # 마지막은 +Inf
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, q):
+        """버킷 경계로 어림한 분위수 (해당 분위가 속한 버킷의 상한, 마지막 버킷을 넘으면 '+Inf')."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        cumulative = 0
+        for bound, count in zip(self.buckets + (float('inf'),), self.counts):
+            cumulative += count
+            if cumulative >= rank:
+                return '+Inf' if bound == float('inf') else bound
+        return '+Inf'
+
+
+def _label_key(labels):
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+class Registry:
+    """스레드 안전한 지표 저장소. 지표는 METRICS 에 선언된 이름만 쓴다."""
+
+    def __init__(self, metrics=METRICS):
+        self.metrics = dict(metrics)
+        self._values = {name: {} for name in self.metrics}
+        self._lock = threading.Lock()
+
+    def _series(self, name, kind, labels):
+        declared = self.metrics[name]
+        if declared[0] != kind:
+            raise ValueError(f"{name} 은(는) {declared[0]} 지표입니다.")
+        return self._values[name], _label_key(labels)
+
+    def inc(self, name, value=1, **labels):
+        values, key = self._series(name, COUNTER, labels)
+        with self._lock:
+            values[key] = values.get(key, 0) + value
+
+    def set(self, name, value, **labels):
+        values, key = self._series(name, GAUGE, labels)
+        with self._lock:
+            values[key] = value
+
+    def observe(self, name, value, **labels):
+        values, key = self._series(name, HISTOGRAM, labels)
+        with self._lock:
+            if key not in values:
+                values[key] = Histogram(self.metrics[name][2])
+            values[key].observe(value)
+
+    def value(self, name, **labels):
+        """카운터/게이지 값 (히스토그램이면 관측 수). 없으면 0."""
+        with self._lock:
+            found = self._values[name].get(_label_key(labels), 0)
+        return found.count if isinstance(found, Histogram) else found
+
+    def reset(self):
+        with self._lock:
+            self._values = {name: {} for name in self.metrics}
+
+    def snapshot(self):
+        """JSON 으로 쓸 수 있는 dict. 히스토그램은 count/sum/평균/분위수/버킷."""
+        out = {}
+        with self._lock:
+            for name, series in self._values.items():
+                kind = self.metrics[name][0]
+                rows = []
+                for key, value in sorted(series.items()):
+                    row = {'labels': dict(key)}
+                    if kind == HISTOGRAM:
+                        row.update({
+                            'count': value.count, 'sum': round(value.sum, 6),
+                            'mean': round(value.sum / value.count, 6) if value.count else None,
+                            'p50': value.quantile(0.5), 'p95': value.quantile(0.95), 'p99': value.quantile(0.99),
+                            'buckets': dict(zip([str(b) for b in value.buckets] + ['+Inf'], value.counts)),
+                        })
+                    else:
+                        row['value'] = value
+                    rows.append(row)
+                if rows:
+                    out[name] = {'type': kind, 'series': rows}
+        return out
+
+    def to_json(self):
+        return json.dumps({'time': time.strftime('%Y-%m-%dT%H:%M:%S'), 'metrics': self.snapshot()},
+                          ensure_ascii=False, indent=2)
+
+    def to_prometheus(self):
+        """Prometheus 텍스트 노출 형식."""
+        lines = []
+        with self._lock:
+            for name, series in self._values.items():
+                if not series:
+                    continue
+                kind, help_text, _ = self.metrics[name]
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} {kind}")
+                for key, value in sorted(series.items()):
+                    if kind != HISTOGRAM:
+                        lines.append(f"{name}{_format_labels(key)} {_format_number(value)}")
+                        continue
+                    cumulative = 0
+                    for bound, count in zip(value.buckets + (float('inf'),), value.counts):
+                        cumulative += count
+                        le = '+Inf' if bound == float('inf') else _format_number(bound)
+                        lines.append(f"{name}_bucket{_format_labels(key + (('le', le),))} {cumulative}")
+                    lines.append(f"{name}_sum{_format_labels(key)} {_format_number(value.sum)}")
+                    lines.append(f"{name}_count{_format_labels(key)} {value.count}")
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(key):
+    if not key:
+        return ''
+    return '{' + ','.join(f'{k}="{_escape(v)}"' for k, v in key) + '}'
+
+
+def _format_number(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+# 프로세스 전체에서 함께 쓰는 레지스트리
+REGISTRY = Registry()
+
+
+def _write_atomic(path, text):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+
+
+class MetricsDumper:
+    """interval 초마다 (그리고 끝날 때) <prefix>.json, <prefix>.prom 을 쓴다. with 문으로 쓴다."""
+
+    def __init__(self, prefix, registry=REGISTRY, interval=DEFAULT_DUMP_INTERVAL):
+        self.prefix = prefix
+        self.registry = registry
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = None
+
+    def dump(self):
+        os.makedirs(os.path.dirname(os.path.abspath(self.prefix)), exist_ok=True)
+        _write_atomic(f"{self.prefix}.json", self.registry.to_json())
+        _write_atomic(f"{self.prefix}.prom", self.registry.to_prometheus())
+
+    def _loop(self):
+        while not self._stop.wait(self.interval):
+            self.dump()
+
+    def __enter__(self):
+        if self.interval and self.interval > 0:
+            self._thread = threading.Thread(target=self._loop, name='metrics-dumper', daemon=True)
+            self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.dump()
+
+
+class StageTimer:
+    """단계 실행 시간과 처리량을 기록한다. with stage('votes') as timer: ... timer.add(rows, 'success')"""
+
+    def __init__(self, name, registry=REGISTRY):
+        self.name = name
+        self.registry = registry
+        self.started = time.perf_counter()
+        self.rows = 0
+
+    def add(self, rows=0, outcome=None):
+        """수집한 행 수와 항목 하나의 결과(success/empty/error 등)를 기록하고 처리량 게이지를 갱신한다."""
+        if outcome is not None:
+            self.registry.inc('assembly_stage_items_total', stage=self.name, outcome=outcome)
+        if rows:
+            self.rows += rows
+            self.registry.inc('assembly_stage_rows_total', rows, stage=self.name)
+        self.finish()
+
+    def finish(self):
+        elapsed = time.perf_counter() - self.started
+        self.registry.set('assembly_stage_seconds', round(elapsed, 3), stage=self.name)
+        self.registry.set('assembly_stage_rows_per_second', round(self.rows / elapsed, 3) if elapsed else 0.0,
+                          stage=self.name)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.finish()
+
+
+def stage(name, registry=REGISTRY):
+    return StageTimer(name, registry)
+
+
+# ---- 프로파일링 ----
+
+PROFILE_MODES = ('cprofile', 'sample')
+SAMPLE_INTERVAL = 0.005
+PROFILE_TOP = 30
+
+
+class StackSampler:
+    """모든 스레드(자기 자신 제외)의 호출 스택을 interval 초마다 세어 folded stack 형식으로 쓴다."""
+
+    def __init__(self, interval=SAMPLE_INTERVAL):
+        self.interval = interval
+        self.stacks = collections.Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._loop, name='stack-sampler', daemon=True)
+
+    def _loop(self):
+        own = threading.get_ident()
+        names = {}
+        while not self._stop.wait(self.interval):
+            names.update({t.ident: t.name for t in threading.enumerate()})
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})")
+                    frame = frame.f_back
+                stack.append(names.get(ident, str(ident)))
+                self.stacks[';'.join(reversed(stack))] += 1
+            self.samples += 1
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def write(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+
+@contextlib.contextmanager
+def profile_stage(name, output_dir, mode='cprofile'):
+    """mode 가 None 이면 아무것도 하지 않는다. 결과 파일 경로 목록을 yield 한 목록에 채운다."""
+    paths = []
+    if mode is None:
+        yield paths
+        return
+    if mode not in PROFILE_MODES:
+        raise ValueError(f"알 수 없는 프로파일링 방식입니다: {mode}")
+    os.makedirs(output_dir, exist_ok=True)
+    base = os.path.join(output_dir, name)
+
+    if mode == 'cprofile':
+        import cProfile
+        import io
+        import pstats
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            yield paths
+        finally:
+            profiler.disable()
+            profiler.dump_stats(f"{base}.prof")
+            summary = io.StringIO()
+            pstats.Stats(profiler, stream=summary).sort_stats('cumulative').print_stats(PROFILE_TOP)
+            _write_atomic(f"{base}.txt", summary.getvalue())
+            paths.extend([f"{base}.prof", f"{base}.txt"])
+    else:
+        sampler = StackSampler()
+        sampler.start()
+        try:
+            yield paths
+        finally:
+            sampler.stop()
+            sampler.write(f"{base}.folded")
+            paths.append(f"{base}.folded")
@@ -0,0 +1,42 @@
+from datetime import datetime, timedelta
+
+from assembly.collection import bill_sync
+from assembly.collection.assembly_api import BILLS_ENDPOINT, ApiPage
+
+
+class FakeClient:
+    def __init__(self, rows):
+        self.rows = rows
+        self.pages = []
+
+    def get_page(self, endpoint, page_index=1, page_size=100, use_cache=True, **params):
+        self.pages.append(page_index)
+        start = (page_index - 1) * page_size
+        return ApiPage(BILLS_ENDPOINT, page_index, len(self.rows), 'INFO-000', self.rows[start:start + page_size])
+
+
+def _rows(n):
+    return [{'BILL_ID': f'B{i}', 'PROC_RESULT_CD': '원안가결'} for i in range(n)]
+
+
+def test_full_sweep_finds_change_on_old_page():
+    rows = _rows(5)
+    state = bill_sync.update_state(None, rows, '21', len(rows))
+    rows[4] = {'BILL_ID': 'B4', 'PROC_RESULT_CD': '부결'}
+
+    delta, _ = bill_sync.fetch_changed_bills(FakeClient(rows), state, page_size=2)
+    assert delta == []
+
+    client = FakeClient(rows)
+    delta, _ = bill_sync.fetch_changed_bills(client, state, page_size=2, full=True)
+    assert [row['BILL_ID'] for row in delta] == ['B4']
+    assert client.pages == [1, 2, 3]
+
+
+def test_full_sweep_due():
+    state = bill_sync.update_state(None, [], '21', 0)
+    assert bill_sync.full_sweep_due(state)
+    state = bill_sync.update_state(state, [], '21', 0, full=True)
+    assert not bill_sync.full_sweep_due(state)
+    later = datetime.now() + timedelta(days=bill_sync.FULL_SWEEP_INTERVAL_DAYS)
+    assert bill_sync.full_sweep_due(state, now=later)
@@ -0,0 +1,24 @@
+from assembly.collection.collection_journal import STATUS_ERROR, STATUS_OK, CollectionJournal
+
+
+def test_recovers_from_partial_last_line(tmp_path):
+    path = str(tmp_path / 'journal.jsonl')
+    with CollectionJournal(path) as journal:
+        journal.record('B1', [{'MEMBER_NO': '1', 'RESULT_VOTE_MOD': '찬성'}])
+        journal.record('B2', None)
+    # B3 를 기록하던 중 중단된 상황
+    with open(path, 'ab') as f:
+        f.write(b'{"bill_id": "B3", "status": "ok", "ro')
+
+    with CollectionJournal(path) as journal:
+        assert journal.status('B1') == STATUS_OK
+        assert journal.status('B2') == STATUS_ERROR
+        assert journal.status('B3') is None
+        assert not journal.is_done('B2')
+        journal.record('B3', [{'MEMBER_NO': '2', 'RESULT_VOTE_MOD': '반대'}])
+
+    with CollectionJournal(path) as journal:
+        assert journal.rows('B1') == [{'MEMBER_NO': '1', 'RESULT_VOTE_MOD': '찬성'}]
+        assert journal.rows('B3') == [{'MEMBER_NO': '2', 'RESULT_VOTE_MOD': '반대'}]
+    with open(path, 'rb') as f:
+        assert len(f.read().splitlines()) == 3
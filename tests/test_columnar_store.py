@@ -0,0 +1,21 @@
+import pyarrow.parquet as pq
+import pytest
+
+from assembly.collection.columnar_store import StreamingParquetWriter, vote_writer
+
+
+def test_vote_writer_drops_unknown_columns(tmp_path, capsys):
+    path = str(tmp_path / 'votes.parquet')
+    with vote_writer(path) as writer:
+        writer.write_rows([{'BILL_ID': 'B1', 'MEMBER_NO': '1', 'RESULT_VOTE_MOD': '찬성', 'NEW_FIELD': 'x'}])
+        writer.write_rows([{'BILL_ID': 'B2', 'MEMBER_NO': '2', 'RESULT_VOTE_MOD': '반대', 'NEW_FIELD': 'y'}])
+    table = pq.read_table(path)
+    assert 'NEW_FIELD' not in table.column_names
+    assert table.column('VOTE_CODE').to_pylist() == [1, 2]
+    assert capsys.readouterr().out.count('NEW_FIELD') == 1
+
+
+def test_unknown_columns_raise_by_default(tmp_path):
+    writer = StreamingParquetWriter(str(tmp_path / 'rows.parquet'), columns=['A'])
+    with pytest.raises(ValueError):
+        writer.write_rows([{'A': '1', 'B': '2'}])
@@ -0,0 +1,13 @@
+import inspect
+import textwrap
+
+from assembly.pipeline import default_pipeline, module_closure
+
+
+def test_code_hash_covers_transitive_imports():
+    stage = default_pipeline().stages['scale']
+    source = textwrap.dedent(inspect.getsource(stage.func))
+    modules = module_closure(source, stage.func.__module__, stage.modules)
+    # scale 은 wnominate 만 명시하지만 wnominate 가 가져오는 행렬/의원 모듈도 해시에 들어가야 한다
+    assert {'assembly.analysis.vote_matrix', 'assembly.analysis.member_registry'} <= set(modules)
+    assert 'assembly.collection.get_voting_data' not in modules
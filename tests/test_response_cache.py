@@ -0,0 +1,57 @@
+import itertools
+
+import pytest
+
+from assembly.collection import response_cache
+from assembly.collection.response_cache import ResponseCache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """response_cache 의 time.time() 을 손으로 움직이는 시계로 바꾼다."""
+    now = {'t': 1000.0}
+    monkeypatch.setattr(response_cache.time, 'time', lambda: now['t'])
+    return now
+
+
+def test_ttl_expires_per_endpoint(tmp_path, clock):
+    cache = ResponseCache(str(tmp_path), ttls={'bills': 60}, default_ttl=None)
+    cache.put('bills', {'AGE': 21, 'KEY': 'a'}, b'bills')
+    cache.put('votes', {'BILL_ID': 'X'}, b'votes')
+
+    # 인증키는 캐시 키에 들어가지 않는다
+    assert cache.get('bills', {'AGE': '21', 'KEY': 'b'}) == b'bills'
+    clock['t'] += 61
+    assert cache.get('bills', {'AGE': 21}) is None
+    assert cache.get('bills', {'AGE': 21}, ignore_ttl=True) == b'bills'
+    # TTL 이 없는 엔드포인트는 만료되지 않는다
+    assert cache.get('votes', {'BILL_ID': 'X'}) == b'votes'
+    cache.close()
+
+
+def test_evicts_least_recently_used(tmp_path, clock):
+    ticks = itertools.count()
+
+    def clock_advance():
+        clock['t'] = 1000.0 + next(ticks)
+
+    probe = ResponseCache(str(tmp_path / 'probe'))
+    probe.put('votes', {'BILL_ID': 'A'}, b'x' * 100)
+    entry_size = probe.stats()['votes']['bytes']
+    probe.close()
+
+    # 항목 두 개까지만 들어가는 용량
+    cache = ResponseCache(str(tmp_path / 'cache'), max_bytes=entry_size * 2)
+    for bill_id in 'AB':
+        clock_advance()
+        cache.put('votes', {'BILL_ID': bill_id}, b'x' * 100)
+    clock_advance()
+    assert cache.get('votes', {'BILL_ID': 'A'}) is not None  # A 를 최근에 사용
+
+    clock_advance()
+    cache.put('votes', {'BILL_ID': 'C'}, b'x' * 100)
+    assert cache.get('votes', {'BILL_ID': 'B'}) is None
+    assert cache.get('votes', {'BILL_ID': 'A'}) is not None
+    assert cache.get('votes', {'BILL_ID': 'C'}) is not None
+    assert cache.stats()['votes']['entries'] == 2
+    cache.close()
@@ -0,0 +1,32 @@
+import numpy as np
+import pandas as pd
+
+from assembly.analysis.vote_matrix import ABSTAIN, NAY, YEA, VoteMatrix, build_vote_matrix
+
+
+def test_build_vote_matrix_dedup_and_order():
+    df = pd.DataFrame({
+        'BILL_NO': ['2100010', '2100002', '2100002', '2100010', None],
+        'MEMBER_NO': ['10', '9', '9', '9', '9'],
+        'RESULT_VOTE_MOD': ['찬성', '반대', '찬성', '기권', '찬성'],
+    })
+    matrix = build_vote_matrix(df)
+    # dcast 처럼 ID 는 숫자 기준 오름차순 ('9' < '10')
+    assert list(matrix.bill_ids) == ['2100002', '2100010']
+    assert list(matrix.member_ids) == ['9', '10']
+    # 중복된 (법안, 의원) 쌍은 처음 나온 표결, BILL_NO 가 없는 행은 버린다
+    assert matrix.votes.tolist() == [[NAY, 0], [ABSTAIN, YEA]]
+
+
+def test_filter_drops_lopsided_bills_then_sparse_members():
+    votes = np.array([
+        [YEA, YEA, YEA, YEA],     # 만장일치: lop 에 걸린다
+        [YEA, NAY, YEA, 0],
+        [NAY, YEA, ABSTAIN, 0],
+        [YEA, NAY, NAY, YEA],
+    ], dtype=np.int8)
+    matrix = VoteMatrix(votes, np.array(['b1', 'b2', 'b3', 'b4']), np.array(['m1', 'm2', 'm3', 'm4']))
+    filtered = matrix.filter(lop=0.025, minvotes=2)
+    assert list(filtered.bill_ids) == ['b2', 'b3', 'b4']
+    # m4 는 만장일치 법안을 빼면 1표뿐이라 빠진다
+    assert list(filtered.member_ids) == ['m1', 'm2', 'm3']
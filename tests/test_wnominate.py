@@ -0,0 +1,61 @@
+import os
+
+import numpy as np
+import pytest
+
+from assembly.analysis.vote_matrix import VoteMatrix
+from assembly.analysis.wnominate import REFERENCE_CSV, compare_with_reference, load_reference, wnominate
+from assembly.analysis.wnominate_windows import fit_windows
+from assembly.synthetic import generate
+
+ANALYSIS_DIR = os.path.join(os.path.dirname(__file__), '..', 'src', 'data', 'analysis')
+
+
+@pytest.fixture(scope='module')
+def small():
+    return generate(n_members=40, n_bills=120, seed=0)
+
+
+def test_empty_filter_raises_value_error(small):
+    mask = np.zeros(small.matrix.shape[0], dtype=bool)
+    mask[:2] = True
+    with pytest.raises(ValueError, match='법안'):
+        wnominate(small.matrix.subset(mask))
+
+
+def test_fit_windows_skips_small_windows(small, capsys):
+    _, summary, results = fit_windows(small.matrix, small.members, size=100, step=99, max_iter=5, verbose=False)
+    assert list(summary['WINDOW']) == [0]
+    assert len(results) == 1
+    assert '건너뜁니다' in capsys.readouterr().out
+
+
+def test_fit_recovers_synthetic_dimensions():
+    data = generate(n_members=300, n_bills=1500, seed=3)
+    result = wnominate(data.matrix)
+    x = result.params.ideal_points
+    truth = data.ideal_points[result.legislator_mask]
+    r = [abs(np.corrcoef(x[:, k], truth[:, k])[0, 1]) for k in range(2)]
+    assert r[0] > 0.97
+    assert r[1] > 0.75
+    assert result.params.weights[1] <= result.params.weights[0]
+    assert np.linalg.norm(x, axis=1).max() == pytest.approx(1.0)
+
+
+def test_fit_tracks_r_reference():
+    matrix_csv = os.path.join(ANALYSIS_DIR, 'vote_table_num.csv')
+    reference_csv = os.path.join(ANALYSIS_DIR, REFERENCE_CSV)
+    if not (os.path.exists(matrix_csv) and os.path.exists(reference_csv)):
+        pytest.skip("21대 투표 행렬/R 결과가 없습니다")
+    matrix = VoteMatrix.from_csv(matrix_csv)
+    result = wnominate(matrix)
+    table = result.legislator_table()
+    table.insert(0, 'MEMBER_NO', result.member_ids)
+    report = compare_with_reference(table, reference_csv, matrix.member_ids)
+    assert abs(report['coord1D']) > 0.95
+    assert abs(report['coord2D']) > 0.5
+    assert result.params.weights[1] <= result.params.weights[0]
+    # 첫 차원이 R 결과보다 원 안쪽으로 눌리지 않아야 한다
+    reference = load_reference(reference_csv, matrix.member_ids)
+    ratio = table['coord1D'].std() / reference['coord1D'].std()
+    assert 0.8 < ratio < 1.25